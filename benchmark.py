@@ -0,0 +1,232 @@
+"""
+Benchmark de reservas con varios procesos
+
+Crea una base temporal con clientes, canchas y años de reservas (ver
+database/generador_datos.py) y la somete a tráfico concurrente de crear_reserva, registrar_pago y
+verificar_disponibilidad desde varios procesos (cada uno con sus hilos).
+Informa en JSON latencias p50/p95/p99, throughput y tasa de conflictos por
+operación, para comparar versiones.
+
+Uso:
+    python benchmark.py --procesos 4 --hilos 2 --segundos 20 --anios 2
+    python benchmark.py --salida resultado.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time as reloj
+from datetime import date, time, timedelta
+
+from config import METODOS_PAGO
+from database.generador_datos import generar_base
+
+OPERACIONES = ('crear_reserva', 'registrar_pago', 'verificar_disponibilidad')
+
+
+# --- Trabajo de cada proceso ---
+
+def _turno_al_azar(azar, canchas, dias):
+    """Turno futuro de 60 o 90 minutos en los próximos `dias` días"""
+    fecha = date.today() + timedelta(days=azar.randint(1, dias))
+    inicio = azar.randrange(8 * 60, 22 * 60, 30)
+    fin = inicio + azar.choice((60, 90))
+    return (azar.randint(1, canchas), fecha,
+            time(inicio // 60, inicio % 60), time(fin // 60 % 24, fin % 60))
+
+
+def _trabajador(args):
+    """Corre los hilos de un proceso hasta el plazo y retorna sus mediciones"""
+    semilla, hilos, segundos, mezcla, clientes, canchas, dias = args
+    from business.reserva_service import ReservaService
+    from business.pago_service import PagoService
+    from dao.reserva_dao import ReservaDAO
+    from database.db_connection import release_db_connection
+
+    mediciones = {op: {'latencias': [], 'ok': 0, 'conflictos': 0, 'errores': 0} for op in OPERACIONES}
+    lock = threading.Lock()
+    barrera = threading.Barrier(hilos)
+
+    def hilo(n):
+        azar = random.Random(semilla * 1000 + n)
+        propias = []  # (id_reserva, saldo) creadas por este hilo
+        locales = {op: {'latencias': [], 'ok': 0, 'conflictos': 0, 'errores': 0} for op in OPERACIONES}
+        barrera.wait()
+        plazo = reloj.perf_counter() + segundos
+        try:
+            while reloj.perf_counter() < plazo:
+                op = azar.choices(OPERACIONES, weights=mezcla)[0]
+                if op == 'registrar_pago' and not propias:
+                    op = 'crear_reserva'
+                id_cancha, fecha, hora_inicio, hora_fin = _turno_al_azar(azar, canchas, dias)
+
+                t0 = reloj.perf_counter()
+                if op == 'crear_reserva':
+                    exito, msg, reserva = ReservaService.crear_reserva(
+                        azar.randint(1, clientes), id_cancha, fecha, hora_inicio, hora_fin, False, "benchmark"
+                    )
+                    resultado = 'ok' if exito else ('conflictos' if 'reservada' in msg else 'errores')
+                elif op == 'registrar_pago':
+                    i = azar.randrange(len(propias))
+                    id_reserva, saldo = propias[i]
+                    monto = saldo if azar.random() < 0.5 else round(saldo / 2, 2)
+                    exito, msg, _ = PagoService.registrar_pago(id_reserva, monto, azar.choice(METODOS_PAGO))
+                    resultado = 'ok' if exito else ('conflictos' if 'excede' in msg else 'errores')
+                else:
+                    ReservaDAO.verificar_disponibilidad(id_cancha, fecha, hora_inicio, hora_fin)
+                    resultado = 'ok'
+                locales[op]['latencias'].append(reloj.perf_counter() - t0)
+                locales[op][resultado] += 1
+
+                if op == 'crear_reserva' and resultado == 'ok':
+                    propias.append((reserva.id_reserva, reserva.monto_total))
+                elif op == 'registrar_pago' and resultado == 'ok':
+                    if monto >= saldo:
+                        propias.pop(i)
+                    else:
+                        propias[i] = (id_reserva, round(saldo - monto, 2))
+        finally:
+            release_db_connection()
+            with lock:
+                for op, datos in locales.items():
+                    mediciones[op]['latencias'].extend(datos['latencias'])
+                    for clave in ('ok', 'conflictos', 'errores'):
+                        mediciones[op][clave] += datos[clave]
+
+    # Los DAOs informan por consola; en el benchmark solo interesa el JSON
+    with contextlib.redirect_stdout(io.StringIO()):
+        trabajos = [threading.Thread(target=hilo, args=(n,)) for n in range(hilos)]
+        for t in trabajos:
+            t.start()
+        for t in trabajos:
+            t.join()
+    return mediciones
+
+
+# --- Resultados ---
+
+def _percentiles(latencias):
+    """p50, p95 y p99 en milisegundos (None si no hay mediciones)"""
+    if not latencias:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    if len(latencias) == 1:
+        cortes = latencias * 99
+    else:
+        cortes = statistics.quantiles(latencias, n=100, method='inclusive')
+    return {f'p{p}_ms': round(cortes[p - 1] * 1000, 3) for p in (50, 95, 99)}
+
+
+def resumir(resultados, duracion):
+    """Combina las mediciones de todos los procesos en un dict serializable"""
+    resumen = {}
+    total = 0
+    for op in OPERACIONES:
+        latencias = [l for r in resultados for l in r[op]['latencias']]
+        cantidad = len(latencias)
+        total += cantidad
+        conflictos = sum(r[op]['conflictos'] for r in resultados)
+        resumen[op] = {
+            'operaciones': cantidad,
+            'ok': sum(r[op]['ok'] for r in resultados),
+            'conflictos': conflictos,
+            'errores': sum(r[op]['errores'] for r in resultados),
+            'tasa_conflictos': round(conflictos / cantidad, 4) if cantidad else 0.0,
+            'throughput_ops_s': round(cantidad / duracion, 2),
+            **_percentiles(latencias)
+        }
+    resumen['total'] = {'operaciones': total, 'throughput_ops_s': round(total / duracion, 2)}
+    return resumen
+
+
+def ejecutar(opciones):
+    """Siembra la base, lanza los procesos y retorna el informe completo"""
+    directorio = None
+    ruta = opciones.db
+    if ruta is None:
+        directorio = tempfile.TemporaryDirectory(prefix="benchmark_reservas_")
+        ruta = os.path.join(directorio.name, "benchmark.db")
+    elif os.path.exists(ruta):
+        raise SystemExit(f"La base {ruta} ya existe; el benchmark necesita una base nueva")
+
+    try:
+        t0 = reloj.perf_counter()
+        # Las reservas ya tomadas cubren la misma ventana donde se piden las nuevas
+        filas = generar_base(ruta, semilla=opciones.semilla, clientes=opciones.clientes,
+                             canchas=opciones.canchas, anios=opciones.anios,
+                             dias_futuros=opciones.dias, ocupacion=opciones.ocupacion)
+        siembra = reloj.perf_counter() - t0
+
+        # Los procesos hijos abren la base vía config.DB_PATH
+        os.environ['RESERVAS_DB_PATH'] = ruta
+        mezcla = (opciones.peso_reservas, opciones.peso_pagos, opciones.peso_consultas)
+        args = [(opciones.semilla + p + 1, opciones.hilos, opciones.segundos, mezcla,
+                 opciones.clientes, opciones.canchas, opciones.dias)
+                for p in range(opciones.procesos)]
+
+        contexto = multiprocessing.get_context("spawn")
+        t0 = reloj.perf_counter()
+        with contexto.Pool(opciones.procesos) as pool:
+            resultados = pool.map(_trabajador, args)
+        duracion = reloj.perf_counter() - t0
+
+        return {
+            'configuracion': {k: v for k, v in vars(opciones).items() if k not in ('db', 'salida')},
+            'entorno': {
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'plataforma': platform.platform()
+            },
+            'base': {'filas': filas, 'segundos_siembra': round(siembra, 2)},
+            'duracion_s': round(duracion, 2),
+            # Todos los hilos generan tráfico durante la misma ventana
+            'resultados': resumir(resultados, opciones.segundos)
+        }
+    finally:
+        if directorio is not None:
+            directorio.cleanup()
+
+
+def _argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de reservas con varios procesos")
+    parser.add_argument('--procesos', type=int, default=4)
+    parser.add_argument('--hilos', type=int, default=2, help="Hilos por proceso")
+    parser.add_argument('--segundos', type=float, default=10, help="Duración del tráfico")
+    parser.add_argument('--clientes', type=int, default=1000)
+    parser.add_argument('--canchas', type=int, default=10)
+    parser.add_argument('--anios', type=int, default=1, help="Años de reservas pasadas")
+    parser.add_argument('--ocupacion', type=float, default=0.8,
+                        help="Escala de la demanda de la base generada (1 = hora pico casi llena)")
+    parser.add_argument('--dias', type=int, default=30,
+                        help="Días hacia adelante donde se piden turnos nuevos")
+    parser.add_argument('--peso-reservas', type=float, default=3)
+    parser.add_argument('--peso-pagos', type=float, default=1)
+    parser.add_argument('--peso-consultas', type=float, default=6)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--db', help="Archivo a crear (por defecto uno temporal que se borra al final)")
+    parser.add_argument('--salida', help="Archivo JSON de salida (por defecto la consola)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    opciones = _argumentos(argv)
+    informe = ejecutar(opciones)
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
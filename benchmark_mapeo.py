@@ -0,0 +1,196 @@
+"""
+Micro-benchmark de la conversión de filas a modelos
+
+Lee de una base generada (ver database/generador_datos.py) todas las
+reservas, torneos y pagos con SELECT * y mide cuánto tarda convertirlas con
+los Mapeador de los DAO (dao/mapeo.py) frente a la conversión anterior con
+datetime.strptime por campo, que se conserva acá como referencia. Los
+modelos convierten fechas y horas recién al leerlas (models/campos.py), así
+que ambos caminos leen cada campo de fecha y hora de cada objeto: el tiempo
+del Mapeador incluye esas conversiones diferidas. Informa en JSON filas por
+segundo de cada uno, la aceleración y los bytes por fila que retienen los
+objetos que arma el Mapeador (antes de leer sus fechas).
+
+Uso:
+    python benchmark_mapeo.py --canchas 30 --anios 1
+    python benchmark_mapeo.py --db grande.db --repeticiones 3
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time as reloj
+import tracemalloc
+from datetime import datetime
+from operator import attrgetter
+
+from database.generador_datos import generar_base
+from models import Reserva, Torneo, Pago
+
+
+# --- Conversión anterior (referencia) ---
+
+def _hora_strptime(valor):
+    if isinstance(valor, str):
+        try:
+            return datetime.strptime(valor, '%H:%M:%S').time()
+        except ValueError:
+            try:
+                return datetime.strptime(valor, '%H:%M').time()
+            except ValueError:
+                return None
+    return valor
+
+
+def _fecha_strptime(valor):
+    if isinstance(valor, str):
+        try:
+            return datetime.strptime(valor, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+    return valor
+
+
+def reserva_strptime(row):
+    creacion = row['fecha_creacion']
+    if isinstance(creacion, str):
+        try:
+            creacion = datetime.strptime(creacion, '%Y-%m-%d %H:%M:%S.%f')
+        except ValueError:
+            creacion = datetime.now()
+    return Reserva(
+        id_reserva=row['id_reserva'], id_cliente=row['id_cliente'], id_cancha=row['id_cancha'],
+        fecha_reserva=_fecha_strptime(row['fecha_reserva']),
+        hora_inicio=_hora_strptime(row['hora_inicio']), hora_fin=_hora_strptime(row['hora_fin']),
+        usa_iluminacion=bool(row['usa_iluminacion']), estado_reserva=row['estado_reserva'],
+        monto_total=row['monto_total'], fecha_creacion=creacion,
+        observaciones=row['observaciones'], id_torneo=row['id_torneo']
+    )
+
+
+def torneo_strptime(row):
+    return Torneo(
+        id_torneo=row['id_torneo'], nombre=row['nombre'], deporte=row['deporte'],
+        fecha=_fecha_strptime(row['fecha']),
+        hora_inicio=_hora_strptime(row['hora_inicio']), hora_fin=_hora_strptime(row['hora_fin']),
+        cantidad_canchas=row['cantidad_canchas'], precio_total=row['precio_total'],
+        estado=row['estado'], id_cliente=row['id_cliente']
+    )
+
+
+def pago_strptime(row):
+    return Pago(
+        id_pago=row['id_pago'], id_reserva=row['id_reserva'], id_torneo=row['id_torneo'],
+        monto=row['monto'], fecha_pago=_fecha_strptime(row['fecha_pago']),
+        metodo_pago=row['metodo_pago']
+    )
+
+
+# --- Medición ---
+
+def _mejor_tiempo(funcion, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        t0 = reloj.perf_counter()
+        funcion()
+        transcurrido = reloj.perf_counter() - t0
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    return mejor
+
+
+def _bytes_por_fila(conn, tabla, mapeador):
+    """
+    Memoria que retienen los objetos de un listado completo, por fila. La
+    consulta se repite dentro de la medición para contar también los valores
+    leídos de la base que los objetos conservan.
+    """
+    tracemalloc.start()
+    try:
+        objetos = mapeador.todos(conn.execute(f"SELECT * FROM {tabla}").fetchall())
+        ocupado = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return round(ocupado / len(objetos), 1) if objetos else 0.0
+
+
+def medir(conn, repeticiones):
+    """Filas por segundo de cada conversión, por tabla"""
+    from dao.reserva_dao import _MAPEO_RESERVA
+    from dao.torneo_dao import _MAPEO_TORNEO
+    from dao.pago_dao import _MAPEO_PAGO
+    from dao.mapeo import a_fecha, a_hora, compartido
+
+    # (tabla, conversión anterior, Mapeador, campos de fecha y hora del modelo)
+    casos = [('reserva', reserva_strptime, _MAPEO_RESERVA,
+              ('fecha_reserva', 'hora_inicio', 'hora_fin', 'fecha_creacion')),
+             ('torneo', torneo_strptime, _MAPEO_TORNEO, ('fecha', 'hora_inicio', 'hora_fin')),
+             ('pago', pago_strptime, _MAPEO_PAGO, ('fecha_pago',))]
+    resultados = {}
+    for tabla, anterior, mapeador, campos in casos:
+        filas = conn.execute(f"SELECT * FROM {tabla}").fetchall()
+        if not filas:
+            continue
+        leer_campos = attrgetter(*campos)
+
+        def con_strptime():
+            for objeto in [anterior(fila) for fila in filas]:
+                leer_campos(objeto)
+
+        # Las cachés de fechas, horas y textos arrancan vacías en cada repetición
+        def con_mapeador():
+            a_fecha.cache_clear()
+            a_hora.cache_clear()
+            compartido.cache_clear()
+            for objeto in mapeador.todos(filas):
+                leer_campos(objeto)
+        t_anterior = _mejor_tiempo(con_strptime, repeticiones)
+        t_mapeador = _mejor_tiempo(con_mapeador, repeticiones)
+        resultados[tabla] = {
+            'filas': len(filas),
+            'strptime_filas_s': round(len(filas) / t_anterior),
+            'mapeador_filas_s': round(len(filas) / t_mapeador),
+            'aceleracion': round(t_anterior / t_mapeador, 2),
+            'bytes_fila': _bytes_por_fila(conn, tabla, mapeador)
+        }
+    return resultados
+
+
+def _argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark de la conversión de filas a modelos")
+    parser.add_argument('--db', help="Base existente a leer (por defecto se genera una temporal)")
+    parser.add_argument('--clientes', type=int, default=2000)
+    parser.add_argument('--canchas', type=int, default=30)
+    parser.add_argument('--anios', type=int, default=1)
+    parser.add_argument('--repeticiones', type=int, default=5, help="Se informa la mejor")
+    parser.add_argument('--semilla', type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    opciones = _argumentos(argv)
+    directorio = None
+    ruta = opciones.db
+    if ruta is None:
+        directorio = tempfile.TemporaryDirectory(prefix="benchmark_mapeo_")
+        ruta = os.path.join(directorio.name, "mapeo.db")
+        generar_base(ruta, semilla=opciones.semilla, clientes=opciones.clientes,
+                     canchas=opciones.canchas, anios=opciones.anios)
+    try:
+        conn = sqlite3.connect(ruta)
+        conn.row_factory = sqlite3.Row
+        try:
+            resultados = medir(conn, opciones.repeticiones)
+        finally:
+            conn.close()
+        print(json.dumps({'python': sys.version.split()[0], 'resultados': resultados},
+                         indent=2, ensure_ascii=False))
+    finally:
+        if directorio is not None:
+            directorio.cleanup()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,12 +4,13 @@ Lógica de negocio para gestión de reservas.
 ACTUALIZADO: Regla de 24hs (Pago inmediato para reservas próximas y cancelación automática).
 """
 from datetime import datetime, timedelta, date, time
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Dict
 from models.reserva import Reserva
 from dao.reserva_dao import ReservaDAO
 from dao.cancha_dao import CanchaDAO
 from dao.cliente_dao import ClienteDAO
-from config import RECARGO_ILUMINACION
+from dao.disponibilidad import motor_disponibilidad, a_minutos
+from config import RECARGO_ILUMINACION, HORA_APERTURA, HORA_CIERRE
 
 class ReservaService:
     
@@ -38,8 +39,8 @@ class ReservaService:
         if cancha.estado != 'disponible' and cancha.estado != 'activa':
             return False, f"La cancha no está disponible (Estado: {cancha.estado})", None
 
-        # 4. Validar Disponibilidad (DAO)
-        if not ReservaDAO.verificar_disponibilidad(id_cancha, fecha_reserva, hora_inicio, hora_fin):
+        # 4. Validar Disponibilidad (motor en memoria)
+        if not motor_disponibilidad.esta_libre(id_cancha, fecha_reserva, hora_inicio, hora_fin):
             return False, "La cancha ya está reservada en ese horario", None
 
         # 5. Calcular Duración
@@ -77,12 +78,15 @@ class ReservaService:
             observaciones=observaciones
         )
 
-        # 8. Guardar
-        id_gen = ReservaDAO.insertar(nueva_reserva)
+        # 8. Guardar (vuelve a verificar con el bloqueo de escritura tomado:
+        # otra terminal pudo reservar el turno desde el paso 4)
+        id_gen = ReservaDAO.insertar_si_disponible(nueva_reserva)
         if id_gen:
             nueva_reserva.id_reserva = id_gen
             return True, "Reserva creada exitosamente", nueva_reserva
         
+        if not motor_disponibilidad.esta_libre(id_cancha, fecha_reserva, hora_inicio, hora_fin):
+            return False, "La cancha ya está reservada en ese horario", None
         return False, "Error al guardar en base de datos", None
 
     @staticmethod
@@ -109,9 +113,82 @@ class ReservaService:
         return False, "Error al cancelar reserva"
         
     @staticmethod
-    def eliminar_fisicamente(id_reserva: int) -> bool:
-        """Elimina el registro de la BD (usado para rollbacks de reservas urgentes no pagadas)"""
-        return ReservaDAO.eliminar(id_reserva)
+    def eliminar_fisicamente(id_reserva: int) -> Tuple[bool, str]:
+        """
+        Elimina el registro de la BD (usado para rollbacks de reservas urgentes no pagadas).
+        Una reserva con pagos o partidos no se elimina: esos registros la
+        referencian y deben conservarse, así que corresponde cancelarla.
+        """
+        dependientes = ReservaDAO.contar_dependientes(id_reserva)
+        if dependientes is None:
+            return False, "Error al eliminar la reserva"
+        if dependientes['pagos']:
+            return False, "La reserva tiene pagos registrados: debe cancelarse, no eliminarse"
+        if dependientes['partidos']:
+            return False, "La reserva tiene partidos asignados: debe cancelarse, no eliminarse"
+        if ReservaDAO.eliminar(id_reserva):
+            return True, "Reserva eliminada"
+        return False, "Error al eliminar la reserva"
+
+    @staticmethod
+    def buscar_horarios_libres(fecha_desde: date, fecha_hasta: date, duracion_minima: int = 60,
+                               tipo_deporte: Optional[str] = None) -> List[Dict]:
+        """
+        Busca todos los huecos reservables de al menos `duracion_minima` minutos
+        entre HORA_APERTURA y HORA_CIERRE, en las canchas disponibles (opcionalmente
+        de un deporte) y para cada día del rango.
+
+        Los turnos ocupados de todo el rango se obtienen de una vez y cada
+        cancha/día se resuelve con un único recorrido de sus turnos ordenados.
+        Para el día de hoy solo se consideran los horarios que aún no pasaron.
+
+        Returns:
+            List[Dict]: Huecos ordenados por fecha, cancha y hora, con las claves
+            fecha, id_cancha, cancha, tipo_deporte, hora_inicio, hora_fin y minutos
+        """
+        hoy = date.today()
+        fecha_desde = max(fecha_desde, hoy)
+        if duracion_minima <= 0 or fecha_desde > fecha_hasta:
+            return []
+
+        canchas = [c for c in CanchaDAO.obtener_disponibles()
+                   if tipo_deporte is None or c.tipo_deporte == tipo_deporte]
+        if not canchas:
+            return []
+
+        fechas = [fecha_desde + timedelta(days=i) for i in range((fecha_hasta - fecha_desde).days + 1)]
+        ocupados = motor_disponibilidad.turnos_ocupados([c.id_cancha for c in canchas], fechas)
+
+        apertura = a_minutos(HORA_APERTURA)
+        cierre = a_minutos(HORA_CIERRE)
+        ahora = datetime.now()
+        # Minuto siguiente al actual: un hueco de hoy no puede empezar en el pasado
+        ahora_min = ahora.hour * 60 + ahora.minute + (1 if ahora.second or ahora.microsecond else 0)
+
+        def a_hora(minutos):
+            return time(minutos // 60, minutos % 60)
+
+        huecos = []
+        for fecha in fechas:
+            desde = max(apertura, ahora_min) if fecha == hoy else apertura
+            for cancha in canchas:
+                cursor = desde
+                for inicio, fin in ocupados[(fecha.isoformat(), cancha.id_cancha)] + [(cierre, cierre)]:
+                    limite = min(inicio, cierre)
+                    if limite - cursor >= duracion_minima:
+                        huecos.append({
+                            'fecha': fecha,
+                            'id_cancha': cancha.id_cancha,
+                            'cancha': cancha.nombre,
+                            'tipo_deporte': cancha.tipo_deporte,
+                            'hora_inicio': a_hora(cursor),
+                            'hora_fin': a_hora(limite),
+                            'minutos': limite - cursor
+                        })
+                    cursor = max(cursor, fin)
+                    if cursor >= cierre:
+                        break
+        return huecos
 
     # --- NUEVA FUNCIONALIDAD: REGLA DE 24 HORAS ---
 
@@ -134,21 +211,9 @@ class ReservaService:
         y las cancela automáticamente.
         Retorna la cantidad de reservas canceladas.
         """
-        reservas = ReservaDAO.obtener_por_estado('pendiente')
-        canceladas = 0
-        ahora = datetime.now()
-        limite_urgencia = timedelta(hours=24)
-
-        for r in reservas:
-            # Construir fecha/hora inicio
-            inicio_reserva = datetime.combine(r.fecha_reserva, r.hora_inicio)
-            tiempo_restante = inicio_reserva - ahora
-            
-            # Si falta menos de 24hs (o ya pasó) y sigue pendiente, se cancela
-            if tiempo_restante < limite_urgencia:
-                r.estado_reserva = 'cancelada'
-                r.observaciones = (r.observaciones or "") + " [Cancelada por sistema: Falta de pago 24hs antes]"
-                ReservaDAO.actualizar(r)
-                canceladas += 1
-        
-        return canceladas
\ No newline at end of file
+        # Si falta menos de 24hs (o ya pasó) y sigue pendiente, se cancela
+        limite = datetime.now() + timedelta(hours=24)
+        canceladas = ReservaDAO.cancelar_pendientes_antes_de(
+            limite, " [Cancelada por sistema: Falta de pago 24hs antes]"
+        )
+        return len(canceladas)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import sqlite3
 from typing import List, Tuple, Optional
 from datetime import date, time
 from models.torneo import Torneo
@@ -5,6 +6,13 @@ from models.reserva import Reserva
 from dao.torneo_dao import TorneoDAO
 from dao.cancha_dao import CanchaDAO
 from dao.reserva_dao import ReservaDAO
+from dao.disponibilidad import motor_disponibilidad
+from database.db_connection import transaccion
+
+
+class ErrorTorneo(Exception):
+    """Motivo por el que se revierte la creación o cancelación de un torneo"""
+
 
 class TorneoService:
     
@@ -24,16 +32,6 @@ class TorneoService:
         if len(canchas_deporte) < cantidad_canchas:
             return False, f"Solo hay {len(canchas_deporte)} canchas de {deporte} disponibles.", None
 
-        # 2. Verificar disponibilidad
-        canchas_libres = []
-        for c in canchas_deporte:
-            if ReservaDAO.verificar_disponibilidad(c.id_cancha, fecha, hora_inicio, hora_fin):
-                canchas_libres.append(c)
-        
-        if len(canchas_libres) < cantidad_canchas:
-            return False, f"No hay suficientes canchas libres en ese horario. Disponibles: {len(canchas_libres)}", None
-
-        # 3. Crear Torneo
         nuevo_torneo = Torneo(
             nombre=nombre,
             deporte=deporte,
@@ -45,30 +43,50 @@ class TorneoService:
             estado="confirmado",
             id_cliente=id_cliente
         )
-        
-        id_torneo = TorneoDAO.insertar(nuevo_torneo)
-        if not id_torneo:
-            return False, "Error al guardar torneo", None
-            
-        nuevo_torneo.id_torneo = id_torneo
 
-        # 4. Generar Reservas Masivas (Confirmadas y Costo 0)
-        canchas_a_reservar = canchas_libres[:cantidad_canchas]
-        
-        for c in canchas_a_reservar:
-            reserva = Reserva(
-                id_cliente=id_cliente,
-                id_cancha=c.id_cancha,
-                fecha_reserva=fecha,
-                hora_inicio=hora_inicio,
-                hora_fin=hora_fin,
-                usa_iluminacion=False,
-                estado_reserva="confirmada", # Se confirman al crear el torneo
-                monto_total=0.0,             # Precio incluido en el torneo
-                observaciones=f"Bloqueada por Torneo: {nombre}",
-                id_torneo=id_torneo
-            )
-            ReservaDAO.insertar(reserva)
+        # 2 a 4 en una sola transacción con el bloqueo de escritura tomado:
+        # nadie puede ocupar las canchas entre la verificación y las reservas,
+        # y si algo falla no queda un torneo a medio reservar
+        try:
+            with transaccion():
+                # 2. Verificar disponibilidad (una consulta para todas las canchas)
+                ids_libres = set(motor_disponibilidad.canchas_libres(
+                    [c.id_cancha for c in canchas_deporte], fecha, hora_inicio, hora_fin))
+                canchas_libres = [c for c in canchas_deporte if c.id_cancha in ids_libres]
+                
+                if len(canchas_libres) < cantidad_canchas:
+                    raise ErrorTorneo(f"No hay suficientes canchas libres en ese horario. Disponibles: {len(canchas_libres)}")
+
+                # 3. Crear Torneo
+                id_torneo = TorneoDAO.insertar(nuevo_torneo)
+                if not id_torneo:
+                    raise ErrorTorneo("Error al guardar torneo")
+                nuevo_torneo.id_torneo = id_torneo
+
+                # 4. Generar Reservas Masivas (Confirmadas y Costo 0)
+                reservas = [
+                    Reserva(
+                        id_cliente=id_cliente,
+                        id_cancha=c.id_cancha,
+                        fecha_reserva=fecha,
+                        hora_inicio=hora_inicio,
+                        hora_fin=hora_fin,
+                        usa_iluminacion=False,
+                        estado_reserva="confirmada", # Se confirman al crear el torneo
+                        monto_total=0.0,             # Precio incluido en el torneo
+                        observaciones=f"Bloqueada por Torneo: {nombre}",
+                        id_torneo=id_torneo
+                    )
+                    for c in canchas_libres[:cantidad_canchas]
+                ]
+                if len(ReservaDAO.insertar_lote(reservas)) != len(reservas):
+                    raise ErrorTorneo("Error al reservar las canchas del torneo")
+        except ErrorTorneo as e:
+            nuevo_torneo.id_torneo = None
+            return False, str(e), None
+        except sqlite3.Error as e:
+            nuevo_torneo.id_torneo = None
+            return False, f"Error al crear torneo: {e}", None
 
         return True, "Torneo creado exitosamente. Proceda al pago.", nuevo_torneo
 
@@ -78,10 +96,15 @@ class TorneoService:
 
     @staticmethod
     def eliminar_torneo(id_torneo: int) -> Tuple[bool, str]:
-        if TorneoDAO.eliminar(id_torneo):
-            reservas = ReservaDAO.obtener_todas()
-            for r in reservas:
-                if r.id_torneo == id_torneo:
-                    ReservaDAO.cambiar_estado(r.id_reserva, 'cancelada')
-            return True, "Torneo cancelado y canchas liberadas."
-        return False, "Error al eliminar torneo"
\ No newline at end of file
+        # El torneo y sus reservas se cancelan juntos o no se cancela nada
+        try:
+            with transaccion():
+                if not TorneoDAO.eliminar(id_torneo):
+                    raise ErrorTorneo("Error al eliminar torneo")
+                if ReservaDAO.cancelar_por_torneo(id_torneo) is None:
+                    raise ErrorTorneo("Error al liberar las canchas del torneo")
+        except ErrorTorneo as e:
+            return False, str(e)
+        except sqlite3.Error as e:
+            return False, f"Error al eliminar torneo: {e}"
+        return True, "Torneo cancelado y canchas liberadas."
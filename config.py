@@ -7,13 +7,38 @@ import os
 # Ruta base del proyecto
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Configuración de la base de datos
-DB_PATH = os.path.join(BASE_DIR, 'database', 'reservas_canchas.db')
+# Configuración de la base de datos (RESERVAS_DB_PATH permite usar otro archivo,
+# ej: en pruebas o benchmarks)
+DB_PATH = os.environ.get('RESERVAS_DB_PATH') or os.path.join(BASE_DIR, 'database', 'reservas_canchas.db')
+
+# Pool de conexiones (una conexión por hilo)
+DB_POOL_SIZE = 8  # Máximo de conexiones abiertas simultáneamente
+DB_POOL_TIMEOUT = 10.0  # Segundos de espera si todas las conexiones están en uso
+DB_CACHED_STATEMENTS = 256  # Sentencias preparadas que conserva cada conexión (ver dao/sql.py)
+
+# Perfil de rendimiento de SQLite (se aplica a cada conexión nueva, en este orden)
+DB_PRAGMAS = {
+    'journal_mode': 'WAL',       # Lectores y escritores no se bloquean entre sí
+    'synchronous': 'NORMAL',     # Seguro con WAL y evita un fsync por cada commit
+    'cache_size': -20000,        # Negativo = KiB (~20 MB de caché de páginas)
+    'mmap_size': 268435456,      # 256 MB de lectura mapeada en memoria
+    'temp_store': 'MEMORY',      # Tablas e índices temporales en memoria
+    'busy_timeout': 5000,        # ms de espera ante un bloqueo antes de fallar
+    'foreign_keys': 'ON',        # Integridad referencial
+}
+
+# Instrumentación de consultas (ver database/monitoreo.py)
+DB_MONITOREO = True              # Registrar cantidad, tiempo y filas de cada sentencia
+DB_UMBRAL_LENTA_MS = 50.0        # Desde cuántos ms una ejecución va al registro de lentas
+DB_MAX_CONSULTAS_LENTAS = 200    # Consultas lentas que se conservan (las más recientes)
 
 # Configuración de horarios del complejo
 HORA_APERTURA = "08:00"
 HORA_CIERRE = "23:00"
 
+# Cada cuánto se cancelan en segundo plano las reservas pendientes vencidas (ms)
+INTERVALO_LIMPIEZA_MS = 5 * 60 * 1000
+
 # Configuración de precios (ejemplo)
 PRECIO_BASE_DIA = 5000.0  # Precio base por hora en horario diurno
 PRECIO_BASE_NOCHE = 7000.0  # Precio base por hora en horario nocturno (después de las 18:00)
@@ -10,6 +10,7 @@ from .pago_dao import PagoDAO
 from .torneo_dao import TorneoDAO
 from .equipo_dao import EquipoDAO
 from .partido_dao import PartidoDAO
+from .reportes_dao import ReportesDAO
 
 __all__ = [
     'ClienteDAO',
@@ -18,5 +19,6 @@ __all__ = [
     'PagoDAO',
     'TorneoDAO',
     'EquipoDAO',
-    'PartidoDAO'
+    'PartidoDAO',
+    'ReportesDAO'
 ]
\ No newline at end of file
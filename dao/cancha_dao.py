@@ -6,6 +6,7 @@ import sqlite3
 from typing import List, Optional
 from models.cancha import Cancha
 from database.db_connection import get_db_connection
+from dao.sql import ejecutar
 
 class CanchaDAO:
     
@@ -13,14 +14,7 @@ class CanchaDAO:
     def insertar(cancha: Cancha) -> Optional[int]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO cancha (nombre, tipo_deporte, tipo_superficie, techada, 
-                                    iluminacion, capacidad_jugadores, 
-                                    precio_hora_dia, precio_hora_noche, estado)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor.execute(query, (
+            cursor = ejecutar(conn, 'cancha.insertar', (
                 cancha.nombre, 
                 cancha.tipo_deporte,
                 cancha.tipo_superficie,
@@ -41,9 +35,7 @@ class CanchaDAO:
     def obtener_todos() -> List[Cancha]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cancha WHERE estado != 'no_disponible' AND estado != 'inactiva' ORDER BY nombre")
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'cancha.obtener_todos').fetchall()
             return [CanchaDAO._row_to_cancha(row) for row in rows]
         except sqlite3.Error as e:
             print(f"Error al obtener canchas: {e}")
@@ -53,9 +45,7 @@ class CanchaDAO:
     def obtener_disponibles() -> List[Cancha]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cancha WHERE estado = 'disponible' ORDER BY nombre")
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'cancha.obtener_disponibles').fetchall()
             return [CanchaDAO._row_to_cancha(row) for row in rows]
         except sqlite3.Error:
             return []
@@ -64,9 +54,7 @@ class CanchaDAO:
     def obtener_por_id(id_cancha: int) -> Optional[Cancha]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cancha WHERE id_cancha = ?", (id_cancha,))
-            row = cursor.fetchone()
+            row = ejecutar(conn, 'cancha.obtener_por_id', (id_cancha,)).fetchone()
             return CanchaDAO._row_to_cancha(row) if row else None
         except sqlite3.Error:
             return None
@@ -75,15 +63,7 @@ class CanchaDAO:
     def actualizar(cancha: Cancha) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                UPDATE cancha 
-                SET nombre=?, tipo_deporte=?, tipo_superficie=?, techada=?, 
-                    iluminacion=?, capacidad_jugadores=?, precio_hora_dia=?, 
-                    precio_hora_noche=?, estado=?
-                WHERE id_cancha=?
-            """
-            cursor.execute(query, (
+            cursor = ejecutar(conn, 'cancha.actualizar', (
                 cancha.nombre, cancha.tipo_deporte, cancha.tipo_superficie,
                 int(cancha.techada), int(cancha.iluminacion),
                 cancha.capacidad_jugadores,
@@ -100,9 +80,7 @@ class CanchaDAO:
     def eliminar(id_cancha: int) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = "UPDATE cancha SET estado = 'no_disponible' WHERE id_cancha = ?"
-            cursor.execute(query, (id_cancha,))
+            cursor = ejecutar(conn, 'cancha.eliminar', (id_cancha,))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -113,9 +91,7 @@ class CanchaDAO:
     def contar_total() -> int:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM cancha WHERE estado='disponible'")
-            return cursor.fetchone()[0]
+            return ejecutar(conn, 'cancha.contar').fetchone()[0]
         except sqlite3.Error:
             return 0
 
@@ -123,52 +99,17 @@ class CanchaDAO:
     def _row_to_cancha(row) -> Cancha:
         """
         Mapea la fila de BD al objeto Cancha.
-        Maneja la compatibilidad de nombres de columnas viejas y nuevas.
+        Las columnas de esquemas viejos se normalizan en las migraciones.
         """
-        # Intentar leer precios nuevos, fallback a viejos
-        p_dia = 0.0
-        p_noche = 0.0
-        
-        try:
-            p_dia = row['precio_hora_dia']
-            p_noche = row['precio_hora_noche']
-        except IndexError:
-            # Si no existen las columnas nuevas, buscamos las viejas
-            try:
-                val = row['precio']
-            except IndexError:
-                try:
-                    val = row['precio_hora']
-                except IndexError:
-                    val = 0.0
-            p_dia = val
-            p_noche = val
-
-        # Datos opcionales con defaults
-        superficie = 'Sintético'
-        capacidad = 5
-        try:
-            superficie = row['tipo_superficie']
-            capacidad = row['capacidad_jugadores']
-        except IndexError:
-            pass
-
-        # Estado
-        try:
-            estado = row['estado']
-            if not estado: estado = 'disponible'
-        except IndexError:
-            estado = 'disponible'
-
         return Cancha(
             id_cancha=row['id_cancha'],
             nombre=row['nombre'],
             tipo_deporte=row['tipo_deporte'],
-            tipo_superficie=superficie,
+            tipo_superficie=row['tipo_superficie'],
             techada=bool(row['techada']),
             iluminacion=bool(row['iluminacion']),
-            capacidad_jugadores=capacidad,
-            precio_hora_dia=p_dia,
-            precio_hora_noche=p_noche,
-            estado=estado
+            capacidad_jugadores=row['capacidad_jugadores'],
+            precio_hora_dia=row['precio_hora_dia'],
+            precio_hora_noche=row['precio_hora_noche'],
+            estado=row['estado'] or 'disponible'
         )
\ No newline at end of file
@@ -5,6 +5,7 @@ import sqlite3
 from typing import List, Optional
 from models.cliente import Cliente
 from database.db_connection import get_db_connection
+from dao.sql import ejecutar, CLAVE_MIN, CLAVE_MAX
 
 class ClienteDAO:
     
@@ -12,12 +13,7 @@ class ClienteDAO:
     def insertar(cliente: Cliente) -> Optional[int]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO cliente (nombre, apellido, dni, telefono, email, estado)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            cursor.execute(query, (cliente.nombre, cliente.apellido, cliente.dni, cliente.telefono, cliente.email, cliente.estado))
+            cursor = ejecutar(conn, 'cliente.insertar', (cliente.nombre, cliente.apellido, cliente.dni, cliente.telefono, cliente.email, cliente.estado))
             conn.commit()
             return cursor.lastrowid
         except sqlite3.IntegrityError:
@@ -30,11 +26,9 @@ class ClienteDAO:
     def obtener_todos() -> List[Cliente]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
             # Solo mostramos activos por defecto o todos y filtramos en UI? 
             # Generalmente el DAO trae todo y el Service/UI filtra, o traemos ordenado.
-            cursor.execute("SELECT * FROM cliente WHERE estado = 'activo' ORDER BY apellido, nombre")
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'cliente.obtener_todos').fetchall()
             return [ClienteDAO._row_to_cliente(row) for row in rows]
         except sqlite3.Error:
             return []
@@ -43,9 +37,7 @@ class ClienteDAO:
     def obtener_por_id(id_cliente: int) -> Optional[Cliente]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cliente WHERE id_cliente = ?", (id_cliente,))
-            row = cursor.fetchone()
+            row = ejecutar(conn, 'cliente.obtener_por_id', (id_cliente,)).fetchone()
             return ClienteDAO._row_to_cliente(row) if row else None
         except sqlite3.Error:
             return None
@@ -55,30 +47,46 @@ class ClienteDAO:
         """Busca por nombre, apellido, DNI o Email (incluyendo inactivos si es necesario buscar historial)"""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
             termino_like = f"%{termino}%"
-            query = """
-                SELECT * FROM cliente 
-                WHERE (nombre LIKE ? OR apellido LIKE ? OR dni LIKE ? OR email LIKE ?)
-                AND estado = 'activo'
-                ORDER BY apellido
-            """
-            cursor.execute(query, (termino_like, termino_like, termino_like, termino_like))
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'cliente.buscar', (termino_like,) * 4).fetchall()
             return [ClienteDAO._row_to_cliente(row) for row in rows]
         except sqlite3.Error:
             return []
 
+    @staticmethod
+    def obtener_pagina(cursor_pagina: Optional[tuple] = None, hacia_atras: bool = False,
+                       limite: int = 100, termino: Optional[str] = None) -> List[Cliente]:
+        """
+        Obtiene una página de clientes activos ordenados por apellido y nombre,
+        por keyset sobre (apellido, nombre, id_cliente). Con `termino` filtra
+        igual que buscar().
+        """
+        try:
+            conn = get_db_connection()
+            # Sin término el LIKE acepta todo (nombre nunca es NULL); sin
+            # cursor la clave de partida queda antes (o después) de todas
+            termino_like = f"%{termino}%" if termino else "%"
+            if cursor_pagina is None:
+                cursor_pagina = CLAVE_MAX if hacia_atras else CLAVE_MIN
+            nombre = 'cliente.pagina_atras' if hacia_atras else 'cliente.pagina'
+            rows = ejecutar(conn, nombre, (termino_like,) * 4 + tuple(cursor_pagina) + (limite,)).fetchall()
+            clientes = [ClienteDAO._row_to_cliente(row) for row in rows]
+            if hacia_atras:
+                clientes.reverse()
+            return clientes
+        except sqlite3.Error:
+            return []
+
+    @staticmethod
+    def clave_pagina(cliente: Cliente) -> tuple:
+        """Clave keyset de un cliente de obtener_pagina"""
+        return (cliente.apellido, cliente.nombre, cliente.id_cliente)
+
     @staticmethod
     def actualizar(cliente: Cliente) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                UPDATE cliente SET nombre=?, apellido=?, dni=?, telefono=?, email=?, estado=?
-                WHERE id_cliente=?
-            """
-            cursor.execute(query, (cliente.nombre, cliente.apellido, cliente.dni, cliente.telefono, cliente.email, cliente.estado, cliente.id_cliente))
+            cursor = ejecutar(conn, 'cliente.actualizar', (cliente.nombre, cliente.apellido, cliente.dni, cliente.telefono, cliente.email, cliente.estado, cliente.id_cliente))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.Error:
@@ -91,9 +99,7 @@ class ClienteDAO:
         """
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = "UPDATE cliente SET estado = 'inactivo' WHERE id_cliente = ?"
-            cursor.execute(query, (id_cliente,))
+            cursor = ejecutar(conn, 'cliente.eliminar', (id_cliente,))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -104,9 +110,7 @@ class ClienteDAO:
     def contar_total() -> int:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM cliente WHERE estado='activo'")
-            return cursor.fetchone()[0]
+            return ejecutar(conn, 'cliente.contar').fetchone()[0]
         except sqlite3.Error:
             return 0
 
@@ -0,0 +1,230 @@
+"""
+Motor de disponibilidad de canchas en memoria.
+
+Mantiene, por día y por cancha, los turnos ocupados (reservas no canceladas)
+ordenados por hora de inicio junto con el máximo acumulado de las horas de
+fin. Con eso una consulta de solapamiento se resuelve con una búsqueda
+binaria: hay conflicto si alguno de los turnos que empiezan antes del fin
+pedido termina después del inicio pedido.
+
+Los días se cargan bajo demanda con una sola consulta para todas las
+canchas. ReservaDAO avisa al motor de cada alta, modificación, cambio de
+estado y baja; los cambios hechos por otras conexiones (otro proceso, otro
+hilo) se detectan con PRAGMA data_version y vacían la caché.
+"""
+
+import json
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import date, time
+from typing import Dict, Iterable, List, Optional, Tuple
+from database.db_connection import get_db_connection, ConexionMonitoreada
+from dao.sql import ejecutar
+
+
+def a_minutos(hora) -> int:
+    """Convierte un time o un texto 'HH:MM[:SS]' en minutos desde la medianoche"""
+    if isinstance(hora, time):
+        return hora.hour * 60 + hora.minute
+    h, m = str(hora).split(':')[:2]
+    return int(h) * 60 + int(m)
+
+
+def _clave_fecha(fecha) -> str:
+    """Normaliza la fecha al formato con el que se guarda en la base"""
+    return fecha.isoformat() if isinstance(fecha, date) else str(fecha)
+
+
+class AgendaCancha:
+    """Turnos ocupados de una cancha en un día"""
+
+    __slots__ = ('turnos', 'inicios', 'max_fin')
+
+    def __init__(self):
+        self.turnos = []   # (inicio_min, fin_min, id_reserva) ordenados
+        self.inicios = []
+        self.max_fin = []  # max_fin[i] = mayor fin entre turnos[0..i]
+
+    def _reindexar(self):
+        self.inicios = [t[0] for t in self.turnos]
+        self.max_fin = []
+        mayor = -1
+        for _, fin, _ in self.turnos:
+            mayor = max(mayor, fin)
+            self.max_fin.append(mayor)
+
+    def agregar(self, inicio: int, fin: int, id_reserva: int):
+        insort(self.turnos, (inicio, fin, id_reserva))
+        self._reindexar()
+
+    def quitar(self, id_reserva: int) -> bool:
+        for i, turno in enumerate(self.turnos):
+            if turno[2] == id_reserva:
+                del self.turnos[i]
+                self._reindexar()
+                return True
+        return False
+
+    def hay_conflicto(self, inicio: int, fin: int, excluir: Optional[int] = None) -> bool:
+        # Turnos que empiezan antes de `fin`: turnos[0..n-1]
+        n = bisect_left(self.inicios, fin)
+        if n == 0 or self.max_fin[n - 1] <= inicio:
+            return False
+        if excluir is None:
+            return True
+        # El máximo puede venir del turno excluido: revisar los candidatos
+        return any(t[1] > inicio and t[2] != excluir for t in self.turnos[:n])
+
+
+class MotorDisponibilidad:
+    """Caché de agendas por día con invalidación por data_version"""
+
+    MAX_DIAS = 90
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._dias: "OrderedDict[str, Dict[int, AgendaCancha]]" = OrderedDict()
+        self._ubicacion: Dict[int, Tuple[str, int]] = {}  # id_reserva -> (fecha, cancha)
+        self._local = threading.local()
+        self._reversiones = ConexionMonitoreada.reversiones
+
+    # --- Coherencia con la base ---
+
+    def _verificar_cambios_externos(self, conn):
+        """
+        Vacía la caché si otra conexión confirmó cambios desde la última
+        consulta de este hilo. data_version no cambia con los commits propios,
+        que ya llegan al motor a través de ReservaDAO; sí se vacía tras
+        revertirse un bloque transaccion(), cuyos avisos ya se aplicaron.
+        """
+        version = ejecutar(conn, 'disponibilidad.data_version').fetchone()[0]
+        if getattr(self._local, 'conn', None) is not conn or self._local.version != version:
+            # Conexión nueva para este hilo o cambios ajenos: no hay forma de
+            # saber qué cambió
+            self.invalidar()
+            self._local.conn = conn
+            self._local.version = version
+        if ConexionMonitoreada.reversiones != self._reversiones:
+            # Una transacción revertida pudo dejar avisos de filas que no existen
+            self.invalidar()
+            self._reversiones = ConexionMonitoreada.reversiones
+
+    def invalidar(self):
+        """Descarta todas las agendas cargadas"""
+        with self._lock:
+            self._dias.clear()
+            self._ubicacion.clear()
+
+    def _cargar_dias(self, conn, fechas: List[str]):
+        """Carga con una sola consulta los días pedidos que no estén en caché"""
+        faltantes = [f for f in fechas if f not in self._dias]
+        if not faltantes:
+            return
+        rows = ejecutar(conn, 'disponibilidad.cargar_dias', (json.dumps(faltantes),)).fetchall()
+
+        for fecha in faltantes:
+            self._dias[fecha] = {}
+        for row in rows:
+            agenda = self._dias[row['fecha_reserva']].setdefault(row['id_cancha'], AgendaCancha())
+            agenda.turnos.append((row['inicio_min'], row['fin_min'], row['id_reserva']))
+            self._ubicacion[row['id_reserva']] = (row['fecha_reserva'], row['id_cancha'])
+        for fecha in faltantes:
+            for agenda in self._dias[fecha].values():
+                agenda.turnos.sort()
+                agenda._reindexar()
+
+    def _dias_cargados(self, fechas: Iterable) -> List[Dict[int, AgendaCancha]]:
+        """
+        Asegura que los días estén en caché y retorna sus agendas.
+        La carga se hace con el lock tomado: un aviso de ReservaDAO posterior
+        a su commit espera a que termine y se aplica sobre el día ya cargado.
+        """
+        claves = [_clave_fecha(f) for f in fechas]
+        conn = get_db_connection()
+        with self._lock:
+            self._verificar_cambios_externos(conn)
+            self._cargar_dias(conn, claves)
+            resultado = []
+            for clave in claves:
+                self._dias.move_to_end(clave)
+                resultado.append(self._dias[clave])
+            self._descartar_excedentes()
+            return resultado
+
+    def _descartar_excedentes(self):
+        """Descarta los días usados hace más tiempo si se supera MAX_DIAS"""
+        while len(self._dias) > self.MAX_DIAS:
+            fecha, canchas = self._dias.popitem(last=False)
+            for agenda in canchas.values():
+                for turno in agenda.turnos:
+                    self._ubicacion.pop(turno[2], None)
+
+    # --- Avisos de ReservaDAO ---
+
+    def registrar(self, id_reserva: int, id_cancha: int, fecha, hora_inicio, hora_fin,
+                  estado: str):
+        """Refleja el estado actual de una reserva (alta o modificación)"""
+        with self._lock:
+            self.quitar(id_reserva)
+            clave = _clave_fecha(fecha)
+            if estado == 'cancelada' or clave not in self._dias:
+                return
+            agenda = self._dias[clave].setdefault(id_cancha, AgendaCancha())
+            agenda.agregar(a_minutos(hora_inicio), a_minutos(hora_fin), id_reserva)
+            self._ubicacion[id_reserva] = (clave, id_cancha)
+
+    def quitar(self, id_reserva: int):
+        """Quita una reserva de la caché (baja o cancelación)"""
+        with self._lock:
+            ubicacion = self._ubicacion.pop(id_reserva, None)
+            if ubicacion is None:
+                return
+            fecha, id_cancha = ubicacion
+            agenda = self._dias.get(fecha, {}).get(id_cancha)
+            if agenda is not None:
+                agenda.quitar(id_reserva)
+
+    # --- Consultas ---
+
+    def esta_libre(self, id_cancha: int, fecha, hora_inicio, hora_fin,
+                   id_reserva_excluir: Optional[int] = None) -> bool:
+        """Indica si la cancha no tiene turnos que se solapen con el horario"""
+        dia, = self._dias_cargados([fecha])
+        with self._lock:
+            agenda = dia.get(id_cancha)
+            if agenda is None:
+                return True
+            return not agenda.hay_conflicto(a_minutos(hora_inicio), a_minutos(hora_fin),
+                                            id_reserva_excluir)
+
+    def canchas_libres(self, ids_canchas: Iterable[int], fecha, hora_inicio,
+                       hora_fin) -> List[int]:
+        """Retorna, de las canchas indicadas, las que están libres en el horario"""
+        dia, = self._dias_cargados([fecha])
+        inicio, fin = a_minutos(hora_inicio), a_minutos(hora_fin)
+        with self._lock:
+            return [
+                id_cancha for id_cancha in ids_canchas
+                if id_cancha not in dia or not dia[id_cancha].hay_conflicto(inicio, fin)
+            ]
+
+    def turnos_ocupados(self, ids_canchas: Iterable[int],
+                        fechas: Iterable) -> Dict[Tuple[str, int], List[Tuple[int, int]]]:
+        """
+        Retorna los turnos ocupados (inicio_min, fin_min), ordenados, de cada
+        (fecha, cancha) pedida. Los días faltantes se cargan en una sola consulta.
+        """
+        fechas = list(fechas)
+        dias = self._dias_cargados(fechas)
+        with self._lock:
+            return {
+                (_clave_fecha(fecha), id_cancha): [
+                    (t[0], t[1]) for t in dia[id_cancha].turnos
+                ] if id_cancha in dia else []
+                for fecha, dia in zip(fechas, dias)
+                for id_cancha in ids_canchas
+            }
+
+
+motor_disponibilidad = MotorDisponibilidad()
@@ -6,6 +6,7 @@ import sqlite3
 from typing import List, Optional
 from models.equipo import Equipo
 from database.db_connection import get_db_connection
+from dao.sql import ejecutar
 
 
 class EquipoDAO:
@@ -16,13 +17,7 @@ class EquipoDAO:
         """Inserta un nuevo equipo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO equipo (id_torneo, nombre_equipo, capitan, 
-                                    telefono_contacto, fecha_inscripcion)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            cursor.execute(query, (
+            cursor = ejecutar(conn, 'equipo.insertar', (
                 equipo.id_torneo, equipo.nombre_equipo, equipo.capitan,
                 equipo.telefono_contacto, equipo.fecha_inscripcion
             ))
@@ -38,9 +33,7 @@ class EquipoDAO:
         """Obtiene un equipo por su ID."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM equipo WHERE id_equipo = ?", (id_equipo,))
-            row = cursor.fetchone()
+            row = ejecutar(conn, 'equipo.obtener_por_id', (id_equipo,)).fetchone()
             return Equipo.from_dict(dict(row)) if row else None
         except sqlite3.Error as e:
             print(f"Error al obtener equipo: {e}")
@@ -51,10 +44,7 @@ class EquipoDAO:
         """Obtiene todos los equipos de un torneo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = "SELECT * FROM equipo WHERE id_torneo = ? ORDER BY nombre_equipo"
-            cursor.execute(query, (id_torneo,))
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'equipo.obtener_por_torneo', (id_torneo,)).fetchall()
             return [Equipo.from_dict(dict(row)) for row in rows]
         except sqlite3.Error as e:
             print(f"Error al obtener equipos del torneo: {e}")
@@ -65,9 +55,7 @@ class EquipoDAO:
         """Obtiene todos los equipos."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM equipo ORDER BY id_torneo, nombre_equipo")
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'equipo.obtener_todos').fetchall()
             return [Equipo.from_dict(dict(row)) for row in rows]
         except sqlite3.Error as e:
             print(f"Error al obtener todos los equipos: {e}")
@@ -78,10 +66,7 @@ class EquipoDAO:
         """Cuenta los equipos inscritos en un torneo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = "SELECT COUNT(*) as total FROM equipo WHERE id_torneo = ?"
-            cursor.execute(query, (id_torneo,))
-            return cursor.fetchone()['total']
+            return ejecutar(conn, 'equipo.contar_por_torneo', (id_torneo,)).fetchone()['total']
         except sqlite3.Error as e:
             print(f"Error al contar equipos: {e}")
             return 0
@@ -91,14 +76,7 @@ class EquipoDAO:
         """Actualiza un equipo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                UPDATE equipo 
-                SET id_torneo = ?, nombre_equipo = ?, capitan = ?,
-                    telefono_contacto = ?, fecha_inscripcion = ?
-                WHERE id_equipo = ?
-            """
-            cursor.execute(query, (
+            cursor = ejecutar(conn, 'equipo.actualizar', (
                 equipo.id_torneo, equipo.nombre_equipo, equipo.capitan,
                 equipo.telefono_contacto, equipo.fecha_inscripcion,
                 equipo.id_equipo
@@ -114,8 +92,7 @@ class EquipoDAO:
         """Elimina un equipo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM equipo WHERE id_equipo = ?", (id_equipo,))
+            cursor = ejecutar(conn, 'equipo.eliminar', (id_equipo,))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.IntegrityError:
@@ -0,0 +1,94 @@
+"""
+Conversión de filas de la base a objetos del modelo.
+
+Un Mapeador se arma una vez por modelo con los conversores de sus campos
+(booleanos, textos repetidos). Para cada disposición de columnas que recibe
+(la de SELECT * o la de cualquier otra consulta) compila una función que
+toma los valores por posición y arma el objeto con argumentos posicionales;
+la compilación se guarda y se reutiliza en las filas siguientes.
+
+Las fechas y horas no se convierten acá: los modelos las guardan como
+texto y las convierten al leerlas (ver models/campos.py, de donde se
+reexportan a_fecha, a_hora y a_fecha_hora). Los textos repetidos se pasan
+por `compartido` para que las filas iguales compartan un único objeto.
+"""
+
+import inspect
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, List, Tuple
+
+from models.campos import a_fecha, a_hora, a_fecha_hora
+
+
+@lru_cache(maxsize=8192)
+def compartido(valor):
+    """
+    El mismo objeto para valores iguales: los textos que se repiten en
+    muchas filas (estados, métodos de pago, fechas y horas sin convertir)
+    ocupan memoria una sola vez en un listado grande.
+    """
+    return valor
+
+
+class Mapeador:
+    """
+    Convierte filas (sqlite3.Row) en instancias de `modelo`.
+
+    Los parámetros del constructor del modelo se llenan con la columna del
+    mismo nombre, pasada por su conversor si tiene uno; los que no vienen en
+    la consulta toman su valor por defecto y las columnas sobrantes se ignoran.
+    """
+
+    def __init__(self, modelo: type, **conversores: Callable):
+        self.modelo = modelo
+        parametros = list(inspect.signature(modelo).parameters.values())
+        self._parametros = [(p.name, p.default, conversores.get(p.name)) for p in parametros]
+        self._compilados: Dict[Tuple[str, ...], Callable] = {}
+
+    def compilar(self, columnas: Tuple[str, ...]) -> Callable:
+        """Función fila -> objeto para una disposición de columnas (se compila una vez)"""
+        funcion = self._compilados.get(columnas)
+        if funcion is None:
+            funcion = self._compilados[columnas] = self._armar(columnas)
+        return funcion
+
+    def _armar(self, columnas):
+        posicion = {nombre: i for i, nombre in enumerate(columnas)}
+        indices = []
+        fijos = []         # (posición del argumento, valor por defecto)
+        conversiones = []  # (posición del argumento, conversor)
+        for n, (nombre, defecto, conversor) in enumerate(self._parametros):
+            if nombre not in posicion:
+                fijos.append((n, defecto))
+                continue
+            indices.append(posicion[nombre])
+            if conversor is not None:
+                conversiones.append((n - len(fijos), conversor))
+        modelo = self.modelo
+
+        if not indices:
+            return lambda fila: modelo()
+        leer = itemgetter(*indices) if len(indices) > 1 else (lambda fila, i=indices[0]: (fila[i],))
+
+        def mapear(fila):
+            valores = list(leer(fila))
+            for i, conversor in conversiones:
+                valores[i] = conversor(valores[i])
+            for n, defecto in fijos:
+                valores.insert(n, defecto)
+            return modelo(*valores)
+        return mapear
+
+    def uno(self, fila):
+        """Objeto de una fila (None si no hay fila)"""
+        if fila is None:
+            return None
+        return self.compilar(tuple(fila.keys()))(fila)
+
+    def todos(self, filas) -> List:
+        """Objetos de un resultado completo: todas sus filas comparten columnas"""
+        if not filas:
+            return []
+        mapear = self.compilar(tuple(filas[0].keys()))
+        return [mapear(fila) for fila in filas]
@@ -1,31 +1,33 @@
 import sqlite3
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import date
 from models.pago import Pago
-from database.db_connection import get_db_connection
+from database.db_connection import get_db_connection, transaccion
+from dao.sql import ejecutar, ID_MAX
+from dao.mapeo import Mapeador, compartido
+
+# fecha_pago queda como texto: Pago la convierte al leerla (ilegible: la fecha de hoy)
+_MAPEO_PAGO = Mapeador(Pago, fecha_pago=compartido, metodo_pago=compartido)
 
 class PagoDAO:
     
     @staticmethod
     def insertar(pago: Pago) -> Optional[int]:
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            query = """
-                INSERT INTO pago (id_reserva, id_torneo, monto, fecha_pago, metodo_pago)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            
-            cursor.execute(query, (
-                pago.id_reserva, # Puede ser None
-                pago.id_torneo,  # Puede ser None
-                pago.monto,
-                pago.fecha_pago,
-                pago.metodo_pago
-            ))
+            # El pago y el total pagado se graban juntos
+            with transaccion() as conn:
+                cursor = ejecutar(conn, 'pago.insertar', (
+                    pago.id_reserva, # Puede ser None
+                    pago.id_torneo,  # Puede ser None
+                    pago.monto,
+                    pago.fecha_pago,
+                    pago.metodo_pago
+                ))
+                if pago.id_reserva is not None:
+                    ejecutar(conn, 'pago.sumar_a_reserva', (pago.monto, pago.id_reserva))
+                if pago.id_torneo is not None:
+                    ejecutar(conn, 'pago.sumar_a_torneo', (pago.monto, pago.id_torneo))
             
-            conn.commit()
             return cursor.lastrowid
             
         except sqlite3.Error as e:
@@ -36,9 +38,7 @@ class PagoDAO:
     def obtener_por_id(id_pago: int) -> Optional[Pago]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM pago WHERE id_pago = ?", (id_pago,))
-            row = cursor.fetchone()
+            row = ejecutar(conn, 'pago.obtener_por_id', (id_pago,)).fetchone()
             return PagoDAO._row_to_pago(row) if row else None
         except sqlite3.Error:
             return None
@@ -47,21 +47,54 @@ class PagoDAO:
     def obtener_todos() -> List[Pago]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM pago ORDER BY fecha_pago DESC")
-            rows = cursor.fetchall()
-            return [PagoDAO._row_to_pago(row) for row in rows]
+            rows = ejecutar(conn, 'pago.obtener_todos').fetchall()
+            return _MAPEO_PAGO.todos(rows)
         except sqlite3.Error:
             return []
     
+    @staticmethod
+    def obtener_pagina(cursor_pagina: Optional[int] = None, hacia_atras: bool = False,
+                       limite: int = 100, fecha_desde: Optional[date] = None,
+                       fecha_hasta: Optional[date] = None) -> List[dict]:
+        """
+        Obtiene una página del historial (más recientes primero) por keyset
+        sobre id_pago, con la referencia y el cliente resueltos por JOIN.
+
+        Args:
+            cursor_pagina: id_pago de la última fila vista (o de la primera si
+                hacia_atras), None para la primera página
+            hacia_atras: Si es True trae las filas anteriores al cursor
+            limite: Cantidad máxima de filas
+        """
+        try:
+            conn = get_db_connection()
+            if cursor_pagina is None:
+                cursor_pagina = 0 if hacia_atras else ID_MAX
+            # Una fecha vacía es "sin filtro", igual que None (? IS NULL)
+            fecha_desde = fecha_desde or None
+            fecha_hasta = fecha_hasta or None
+            nombre = 'pago.pagina_atras' if hacia_atras else 'pago.pagina'
+            rows = ejecutar(conn, nombre, (fecha_desde, fecha_desde, fecha_hasta, fecha_hasta,
+                                           cursor_pagina, limite)).fetchall()
+            filas = [dict(row) for row in rows]
+            if hacia_atras:
+                filas.reverse()
+            return filas
+        except sqlite3.Error as e:
+            print(f"Error al obtener página de pagos: {e}")
+            return []
+
+    @staticmethod
+    def clave_pagina(fila: dict) -> int:
+        """Clave keyset de una fila de obtener_pagina"""
+        return fila['id_pago']
+    
     @staticmethod
     def obtener_por_reserva(id_reserva: int) -> List[Pago]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM pago WHERE id_reserva = ?", (id_reserva,))
-            rows = cursor.fetchall()
-            return [PagoDAO._row_to_pago(row) for row in rows]
+            rows = ejecutar(conn, 'pago.obtener_por_reserva', (id_reserva,)).fetchall()
+            return _MAPEO_PAGO.todos(rows)
         except sqlite3.Error:
             return []
 
@@ -70,32 +103,43 @@ class PagoDAO:
         """Obtiene pagos asociados a un torneo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM pago WHERE id_torneo = ?", (id_torneo,))
-            rows = cursor.fetchall()
-            return [PagoDAO._row_to_pago(row) for row in rows]
+            rows = ejecutar(conn, 'pago.obtener_por_torneo', (id_torneo,)).fetchall()
+            return _MAPEO_PAGO.todos(rows)
         except sqlite3.Error:
             return []
     
     @staticmethod
-    def _row_to_pago(row) -> Pago:
-        fecha_pago = row['fecha_pago']
-        if isinstance(fecha_pago, str):
-            try:
-                fecha_pago = datetime.strptime(fecha_pago, '%Y-%m-%d').date()
-            except ValueError:
-                fecha_pago = date.today()
-                
-        # Manejo seguro de columnas nuevas/viejas
-        id_torneo = None
-        try: id_torneo = row['id_torneo']
-        except: pass
+    def total_por_reserva(id_reserva: int) -> float:
+        """Suma de los pagos de una reserva"""
+        try:
+            conn = get_db_connection()
+            return ejecutar(conn, 'pago.total_por_reserva', (id_reserva,)).fetchone()[0]
+        except sqlite3.Error:
+            return 0.0
+
+    @staticmethod
+    def total_por_torneo(id_torneo: int) -> float:
+        """Suma de los pagos de un torneo"""
+        try:
+            conn = get_db_connection()
+            return ejecutar(conn, 'pago.total_por_torneo', (id_torneo,)).fetchone()[0]
+        except sqlite3.Error:
+            return 0.0
 
-        return Pago(
-            id_pago=row['id_pago'],
-            id_reserva=row['id_reserva'],
-            id_torneo=id_torneo,
-            monto=row['monto'],
-            fecha_pago=fecha_pago,
-            metodo_pago=row['metodo_pago']
-        )
\ No newline at end of file
+    @staticmethod
+    def obtener_saldos_pendientes(tolerancia: float = 0.1) -> List[dict]:
+        """
+        Reservas no canceladas con saldo por pagar mayor a `tolerancia`, en una
+        sola consulta sobre monto_pagado (índice idx_reserva_con_saldo)
+        """
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'pago.saldos_pendientes', (tolerancia,)).fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error al obtener saldos pendientes: {e}")
+            return []
+
+    @staticmethod
+    def _row_to_pago(row) -> Pago:
+        return _MAPEO_PAGO.uno(row)
@@ -6,6 +6,7 @@ from typing import List, Optional
 from datetime import time
 from models.partido import Partido
 from database.db_connection import get_db_connection
+from dao.sql import ejecutar
 
 
 class PartidoDAO:
@@ -16,7 +17,6 @@ class PartidoDAO:
         """Inserta un nuevo partido."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
             
             # Convertir time a string para SQLite
             hora_inicio_str = None
@@ -26,13 +26,7 @@ class PartidoDAO:
                 else:
                     hora_inicio_str = partido.hora_inicio
             
-            query = """
-                INSERT INTO partido (id_torneo, id_equipo_local, id_equipo_visitante,
-                                     id_reserva, fecha_partido, hora_inicio,
-                                     resultado_local, resultado_visitante, estado_partido)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor.execute(query, (
+            cursor = ejecutar(conn, 'partido.insertar', (
                 partido.id_torneo, partido.id_equipo_local, partido.id_equipo_visitante,
                 partido.id_reserva, partido.fecha_partido, hora_inicio_str,
                 partido.resultado_local, partido.resultado_visitante, partido.estado_partido
@@ -49,9 +43,7 @@ class PartidoDAO:
         """Obtiene un partido por su ID."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM partido WHERE id_partido = ?", (id_partido,))
-            row = cursor.fetchone()
+            row = ejecutar(conn, 'partido.obtener_por_id', (id_partido,)).fetchone()
             return Partido.from_dict(dict(row)) if row else None
         except sqlite3.Error as e:
             print(f"Error al obtener partido: {e}")
@@ -62,14 +54,7 @@ class PartidoDAO:
         """Obtiene todos los partidos de un torneo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                SELECT * FROM partido 
-                WHERE id_torneo = ? 
-                ORDER BY fecha_partido, hora_inicio
-            """
-            cursor.execute(query, (id_torneo,))
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'partido.obtener_por_torneo', (id_torneo,)).fetchall()
             return [Partido.from_dict(dict(row)) for row in rows]
         except sqlite3.Error as e:
             print(f"Error al obtener partidos del torneo: {e}")
@@ -80,14 +65,7 @@ class PartidoDAO:
         """Obtiene todos los partidos de un equipo."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                SELECT * FROM partido 
-                WHERE id_equipo_local = ? OR id_equipo_visitante = ?
-                ORDER BY fecha_partido, hora_inicio
-            """
-            cursor.execute(query, (id_equipo, id_equipo))
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'partido.obtener_por_equipo', (id_equipo, id_equipo)).fetchall()
             return [Partido.from_dict(dict(row)) for row in rows]
         except sqlite3.Error as e:
             print(f"Error al obtener partidos del equipo: {e}")
@@ -98,9 +76,7 @@ class PartidoDAO:
         """Obtiene todos los partidos."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM partido ORDER BY fecha_partido DESC, hora_inicio")
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'partido.obtener_todos').fetchall()
             return [Partido.from_dict(dict(row)) for row in rows]
         except sqlite3.Error as e:
             print(f"Error al obtener todos los partidos: {e}")
@@ -111,7 +87,6 @@ class PartidoDAO:
         """Actualiza un partido."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
             
             # Convertir time a string para SQLite
             hora_inicio_str = None
@@ -121,14 +96,7 @@ class PartidoDAO:
                 else:
                     hora_inicio_str = partido.hora_inicio
             
-            query = """
-                UPDATE partido 
-                SET id_torneo = ?, id_equipo_local = ?, id_equipo_visitante = ?,
-                    id_reserva = ?, fecha_partido = ?, hora_inicio = ?,
-                    resultado_local = ?, resultado_visitante = ?, estado_partido = ?
-                WHERE id_partido = ?
-            """
-            cursor.execute(query, (
+            cursor = ejecutar(conn, 'partido.actualizar', (
                 partido.id_torneo, partido.id_equipo_local, partido.id_equipo_visitante,
                 partido.id_reserva, partido.fecha_partido, hora_inicio_str,
                 partido.resultado_local, partido.resultado_visitante, partido.estado_partido,
@@ -146,13 +114,8 @@ class PartidoDAO:
         """Registra el resultado de un partido."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            query = """
-                UPDATE partido 
-                SET resultado_local = ?, resultado_visitante = ?, estado_partido = 'jugado'
-                WHERE id_partido = ?
-            """
-            cursor.execute(query, (resultado_local, resultado_visitante, id_partido))
+            cursor = ejecutar(conn, 'partido.registrar_resultado',
+                              (resultado_local, resultado_visitante, id_partido))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -164,8 +127,7 @@ class PartidoDAO:
         """Elimina un partido."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM partido WHERE id_partido = ?", (id_partido,))
+            cursor = ejecutar(conn, 'partido.eliminar', (id_partido,))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.Error as e:
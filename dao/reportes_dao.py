@@ -0,0 +1,113 @@
+import sqlite3
+from typing import Dict, List
+from datetime import date
+from database.db_connection import get_db_connection
+from database.migraciones import reconstruir_resumen_diario
+from dao.sql import ejecutar, FECHA_MIN, FECHA_MAX
+
+
+class ReportesDAO:
+    """
+    Consultas agregadas para reportes: la base agrupa y suma, y solo viajan
+    las filas de resumen (una por cliente, cancha, mes o estado).
+    """
+
+    @staticmethod
+    def totales_por_cliente(fecha_inicio: date = None, fecha_fin: date = None) -> List[Dict]:
+        """Reservas no canceladas y su monto por cliente activo, de mayor a menor monto"""
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'reportes.totales_por_cliente',
+                            ReportesDAO._rango_fechas(fecha_inicio, fecha_fin)).fetchall()
+            return [{
+                'cliente': f"{row['nombre']} {row['apellido']}",
+                'dni': row['dni'],
+                'cantidad': row['cantidad'],
+                'monto': float(row['monto'])
+            } for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error al totalizar reservas por cliente: {e}")
+            return []
+
+    @staticmethod
+    def totales_por_cancha(fecha_inicio: date = None, fecha_fin: date = None) -> Dict[int, Dict]:
+        """
+        Reservas no canceladas por cancha: cantidad, minutos reservados y
+        monto. Las reservas de torneo valen su parte del precio del torneo
+        (precio_total / cantidad_canchas), resuelta en la misma consulta.
+        """
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'reportes.totales_por_cancha',
+                            ReportesDAO._rango_fechas(fecha_inicio, fecha_fin)).fetchall()
+            return {row['id_cancha']: {
+                'cantidad': row['cantidad'],
+                'minutos': row['minutos'] or 0,
+                'monto': float(row['monto'])
+            } for row in rows}
+        except sqlite3.Error as e:
+            print(f"Error al totalizar reservas por cancha: {e}")
+            return {}
+
+    # --- Sobre resumen_diario (mantenido por triggers) ---
+
+    @staticmethod
+    def conteo_por_estado(fecha_inicio: date, fecha_fin: date) -> Dict[str, int]:
+        """Cantidad de reservas de cada estado entre dos fechas inclusive"""
+        try:
+            conn = get_db_connection()
+            row = ejecutar(conn, 'reportes.conteo_por_estado', (fecha_inicio, fecha_fin)).fetchone()
+            estados = ('pendiente', 'confirmada', 'cancelada', 'completada')
+            return {estado: cantidad or 0 for estado, cantidad in zip(estados, row)}
+        except sqlite3.Error as e:
+            print(f"Error al contar reservas por estado: {e}")
+            return {}
+
+    @staticmethod
+    def ingresos_por_mes(anio: int) -> Dict[int, float]:
+        """
+        Ingresos de cada mes del año: reservas confirmadas o completadas
+        (sin torneo) más el precio de los torneos no cancelados
+        """
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'reportes.ingresos_por_mes',
+                            (date(anio, 1, 1), date(anio, 12, 31))).fetchall()
+            return {row[0]: row[1] for row in rows}
+        except sqlite3.Error as e:
+            print(f"Error al totalizar ingresos por mes: {e}")
+            return {}
+
+    @staticmethod
+    def ranking_canchas(fecha_inicio: date, fecha_fin: date, limite: int) -> List[Dict]:
+        """
+        Canchas activas con reservas no canceladas entre dos fechas, de más
+        a menos reservas, con su monto (torneos prorrateados)
+        """
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'reportes.ranking_canchas', (fecha_inicio, fecha_fin, limite)).fetchall()
+            return [{'nombre': row['nombre'], 'reservas': row['reservas'], 'monto': row['monto']}
+                    for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error al obtener ranking de canchas: {e}")
+            return []
+
+    @staticmethod
+    def reconstruir_resumen_diario() -> bool:
+        """Recalcula resumen_diario desde cero (ej: tras cargas masivas o ediciones manuales)"""
+        conn = get_db_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            reconstruir_resumen_diario(conn)
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error al reconstruir el resumen diario: {e}")
+            return False
+
+    @staticmethod
+    def _rango_fechas(fecha_inicio: date = None, fecha_fin: date = None):
+        """Límites del filtro sobre r.fecha_reserva (sin fechas el rango queda abierto)"""
+        return (fecha_inicio or FECHA_MIN, fecha_fin or FECHA_MAX)
@@ -7,45 +7,53 @@ import sqlite3
 from typing import List, Optional
 from datetime import date, time, datetime
 from models.reserva import Reserva
-from database.db_connection import get_db_connection
+from database.db_connection import get_db_connection, transaccion
+from dao.disponibilidad import motor_disponibilidad, a_minutos
+from dao.sql import SQL, ejecutar, FECHA_MIN, FECHA_MAX, CLAVE_MIN, CLAVE_MAX
+from dao.mapeo import Mapeador, compartido
+
+# Fechas y horas quedan como texto: Reserva las convierte al leerlas (ver models/campos.py)
+_MAPEO_RESERVA = Mapeador(Reserva, fecha_reserva=compartido, hora_inicio=compartido,
+                          hora_fin=compartido, usa_iluminacion=bool, estado_reserva=compartido)
 
 
 class ReservaDAO:
     """Data Access Object para Reserva"""
     
+    @staticmethod
+    def _parametros_insertar(reserva: Reserva) -> tuple:
+        # Convertir time a string para SQLite
+        hora_inicio_str = reserva.hora_inicio.strftime('%H:%M:%S') if isinstance(reserva.hora_inicio, time) else reserva.hora_inicio
+        hora_fin_str = reserva.hora_fin.strftime('%H:%M:%S') if isinstance(reserva.hora_fin, time) else reserva.hora_fin
+        return (
+            reserva.id_cliente,
+            reserva.id_cancha,
+            reserva.fecha_reserva,
+            hora_inicio_str,
+            hora_fin_str,
+            int(reserva.usa_iluminacion),
+            reserva.estado_reserva,
+            reserva.monto_total,
+            reserva.fecha_creacion,
+            reserva.observaciones,
+            reserva.id_torneo,
+            a_minutos(reserva.hora_inicio),
+            a_minutos(reserva.hora_fin)
+        )
+
+    @staticmethod
+    def _avisar_motor(reserva: Reserva):
+        motor_disponibilidad.registrar(reserva.id_reserva, reserva.id_cancha, reserva.fecha_reserva,
+                                       reserva.hora_inicio, reserva.hora_fin, reserva.estado_reserva)
+
     @staticmethod
     def insertar(reserva: Reserva) -> Optional[int]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Convertir time a string para SQLite
-            hora_inicio_str = reserva.hora_inicio.strftime('%H:%M:%S') if isinstance(reserva.hora_inicio, time) else reserva.hora_inicio
-            hora_fin_str = reserva.hora_fin.strftime('%H:%M:%S') if isinstance(reserva.hora_fin, time) else reserva.hora_fin
-            
-            query = """
-                INSERT INTO reserva (id_cliente, id_cancha, fecha_reserva, hora_inicio, 
-                                     hora_fin, usa_iluminacion, estado_reserva, monto_total, 
-                                     fecha_creacion, observaciones, id_torneo)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            cursor.execute(query, (
-                reserva.id_cliente,
-                reserva.id_cancha,
-                reserva.fecha_reserva,
-                hora_inicio_str,
-                hora_fin_str,
-                int(reserva.usa_iluminacion),
-                reserva.estado_reserva,
-                reserva.monto_total,
-                reserva.fecha_creacion,
-                reserva.observaciones,
-                reserva.id_torneo
-            ))
-            
+            cursor = ejecutar(conn, 'reserva.insertar', ReservaDAO._parametros_insertar(reserva))
             conn.commit()
             reserva.id_reserva = cursor.lastrowid
+            ReservaDAO._avisar_motor(reserva)
             return cursor.lastrowid
             
         except sqlite3.IntegrityError as e:
@@ -54,14 +62,61 @@ class ReservaDAO:
         except sqlite3.Error as e:
             print(f"Error al insertar reserva: {e}")
             return None
+
+    @staticmethod
+    def insertar_si_disponible(reserva: Reserva) -> Optional[int]:
+        """
+        Verifica la disponibilidad e inserta con el bloqueo de escritura
+        tomado (BEGIN IMMEDIATE): ninguna otra conexión puede reservar el
+        mismo turno entre la verificación y el insert. Los triggers de
+        solapamiento rechazan además cualquier insert que se cuele.
+
+        Returns:
+            Optional[int]: ID de la reserva, o None si el horario está
+            ocupado o hubo un error
+        """
+        try:
+            with transaccion():
+                if not motor_disponibilidad.esta_libre(reserva.id_cancha, reserva.fecha_reserva,
+                                                       reserva.hora_inicio, reserva.hora_fin):
+                    return None
+                return ReservaDAO.insertar(reserva)
+        except sqlite3.Error as e:
+            print(f"Error al insertar reserva: {e}")
+            return None
+
+    @staticmethod
+    def insertar_lote(reservas: List[Reserva]) -> List[int]:
+        """
+        Inserta varias reservas con un solo executemany, todas o ninguna.
+        Dentro de un transaccion() externo participa de esa transacción.
+
+        Returns:
+            List[int]: IDs asignados, en el orden recibido (vacía si falla)
+        """
+        if not reservas:
+            return []
+        try:
+            with transaccion() as conn:
+                conn.executemany(SQL['reserva.insertar'],
+                                 [ReservaDAO._parametros_insertar(r) for r in reservas])
+                # Con el bloqueo de escritura tomado nadie más inserta: los
+                # ids (AUTOINCREMENT) del lote son consecutivos
+                ultimo = ejecutar(conn, 'reserva.ultimo_id').fetchone()[0]
+            ids = list(range(ultimo - len(reservas) + 1, ultimo + 1))
+            for reserva, id_reserva in zip(reservas, ids):
+                reserva.id_reserva = id_reserva
+                ReservaDAO._avisar_motor(reserva)
+            return ids
+        except sqlite3.Error as e:
+            print(f"Error al insertar lote de reservas: {e}")
+            return []
     
     @staticmethod
     def obtener_por_id(id_reserva: int) -> Optional[Reserva]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva WHERE id_reserva = ?", (id_reserva,))
-            row = cursor.fetchone()
+            row = ejecutar(conn, 'reserva.obtener_por_id', (id_reserva,)).fetchone()
             return ReservaDAO._row_to_reserva(row) if row else None
         except sqlite3.Error as e:
             print(f"Error al obtener reserva: {e}")
@@ -71,10 +126,8 @@ class ReservaDAO:
     def obtener_todas() -> List[Reserva]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva ORDER BY fecha_reserva DESC, hora_inicio DESC")
-            rows = cursor.fetchall()
-            return [ReservaDAO._row_to_reserva(row) for row in rows]
+            rows = ejecutar(conn, 'reserva.obtener_todas').fetchall()
+            return _MAPEO_RESERVA.todos(rows)
         except sqlite3.Error as e:
             print(f"Error al obtener todas las reservas: {e}")
             return []
@@ -82,14 +135,61 @@ class ReservaDAO:
     # ALIAS para evitar errores de compatibilidad
     obtener_todos = obtener_todas
     
+    @staticmethod
+    def _filtros_listado(estado, fecha_desde, fecha_hasta):
+        """
+        Parámetros de estado y rango de fechas de una página, y el sufijo del
+        nombre de la sentencia: sin fechas el rango queda abierto, y el
+        filtro por estado es otra sentencia (la resuelve otro índice)
+        """
+        params = (fecha_desde or FECHA_MIN, fecha_hasta or FECHA_MAX)
+        if estado:
+            return '_estado', (estado,) + params
+        return '', params
+
+    @staticmethod
+    def obtener_pagina(cursor_pagina: Optional[tuple] = None, hacia_atras: bool = False,
+                       limite: int = 100, estado: Optional[str] = None,
+                       fecha_desde: Optional[date] = None,
+                       fecha_hasta: Optional[date] = None) -> List[dict]:
+        """
+        Obtiene una página del listado (más recientes primero) por keyset sobre
+        (fecha_reserva, hora_inicio, id_reserva), sin OFFSET.
+
+        Args:
+            cursor_pagina: Clave de la última fila vista (o de la primera si
+                hacia_atras), None para la primera página
+            hacia_atras: Si es True trae las filas anteriores al cursor
+            limite: Cantidad máxima de filas
+        """
+        try:
+            conn = get_db_connection()
+            sufijo, params = ReservaDAO._filtros_listado(estado, fecha_desde, fecha_hasta)
+            if cursor_pagina is None:
+                cursor_pagina = CLAVE_MIN if hacia_atras else CLAVE_MAX
+            if hacia_atras:
+                sufijo += '_atras'
+            rows = ejecutar(conn, 'reserva.pagina' + sufijo,
+                            params + tuple(cursor_pagina) + (limite,)).fetchall()
+            filas = [dict(row) for row in rows]
+            if hacia_atras:
+                filas.reverse()
+            return filas
+        except sqlite3.Error as e:
+            print(f"Error al obtener página de reservas: {e}")
+            return []
+
+    @staticmethod
+    def clave_pagina(fila: dict) -> tuple:
+        """Clave keyset de una fila de obtener_pagina"""
+        return (fila['fecha_reserva'], fila['hora_inicio'], fila['id_reserva'])
+    
     @staticmethod
     def obtener_por_cliente(id_cliente: int) -> List[Reserva]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva WHERE id_cliente = ? ORDER BY fecha_reserva DESC", (id_cliente,))
-            rows = cursor.fetchall()
-            return [ReservaDAO._row_to_reserva(row) for row in rows]
+            rows = ejecutar(conn, 'reserva.obtener_por_cliente', (id_cliente,)).fetchall()
+            return _MAPEO_RESERVA.todos(rows)
         except sqlite3.Error as e:
             print(f"Error al obtener reservas del cliente: {e}")
             return []
@@ -98,10 +198,8 @@ class ReservaDAO:
     def obtener_por_cancha(id_cancha: int) -> List[Reserva]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva WHERE id_cancha = ? ORDER BY fecha_reserva DESC", (id_cancha,))
-            rows = cursor.fetchall()
-            return [ReservaDAO._row_to_reserva(row) for row in rows]
+            rows = ejecutar(conn, 'reserva.obtener_por_cancha', (id_cancha,)).fetchall()
+            return _MAPEO_RESERVA.todos(rows)
         except sqlite3.Error as e:
             print(f"Error al obtener reservas de la cancha: {e}")
             return []
@@ -111,10 +209,8 @@ class ReservaDAO:
         """Obtiene todas las reservas de una fecha específica."""
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva WHERE fecha_reserva = ? ORDER BY hora_inicio", (fecha,))
-            rows = cursor.fetchall()
-            return [ReservaDAO._row_to_reserva(row) for row in rows]
+            rows = ejecutar(conn, 'reserva.obtener_por_fecha', (fecha,)).fetchall()
+            return _MAPEO_RESERVA.todos(rows)
         except sqlite3.Error as e:
             print(f"Error al obtener reservas por fecha: {e}")
             return []
@@ -123,10 +219,8 @@ class ReservaDAO:
     def obtener_por_rango_fechas(fecha_inicio: date, fecha_fin: date) -> List[Reserva]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva WHERE fecha_reserva BETWEEN ? AND ? ORDER BY fecha_reserva", (fecha_inicio, fecha_fin))
-            rows = cursor.fetchall()
-            return [ReservaDAO._row_to_reserva(row) for row in rows]
+            rows = ejecutar(conn, 'reserva.obtener_por_rango_fechas', (fecha_inicio, fecha_fin)).fetchall()
+            return _MAPEO_RESERVA.todos(rows)
         except sqlite3.Error as e:
             print(f"Error al obtener reservas por rango: {e}")
             return []
@@ -135,10 +229,8 @@ class ReservaDAO:
     def obtener_por_estado(estado: str) -> List[Reserva]:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM reserva WHERE estado_reserva = ?", (estado,))
-            rows = cursor.fetchall()
-            return [ReservaDAO._row_to_reserva(row) for row in rows]
+            rows = ejecutar(conn, 'reserva.obtener_por_estado', (estado,)).fetchall()
+            return _MAPEO_RESERVA.todos(rows)
         except sqlite3.Error:
             return []
 
@@ -147,24 +239,12 @@ class ReservaDAO:
                                   hora_fin: time, id_reserva_excluir: int = None) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            hora_inicio_str = hora_inicio.strftime('%H:%M:%S') if isinstance(hora_inicio, time) else hora_inicio
-            hora_fin_str = hora_fin.strftime('%H:%M:%S') if isinstance(hora_fin, time) else hora_fin
-            
-            sql = """
-                SELECT COUNT(*) as conflictos FROM reserva
-                WHERE id_cancha = ? AND fecha_reserva = ? AND estado_reserva != 'cancelada'
-                AND ((hora_inicio < ? AND hora_fin > ?) OR (hora_inicio < ? AND hora_fin > ?) OR (hora_inicio >= ? AND hora_inicio < ?) OR (hora_fin > ? AND hora_fin <= ?))
-            """
-            params = [id_cancha, fecha, hora_fin_str, hora_inicio_str, hora_fin_str, hora_inicio_str, hora_inicio_str, hora_fin_str, hora_inicio_str, hora_fin_str]
-            
-            if id_reserva_excluir:
-                sql += " AND id_reserva != ?"
-                params.append(id_reserva_excluir)
-            
-            cursor.execute(sql, params)
-            return cursor.fetchone()['conflictos'] == 0
+            # Texto fijo: sin reserva a excluir se pasa NULL (id_reserva IS NOT NULL)
+            row = ejecutar(conn, 'reserva.verificar_disponibilidad', (
+                id_cancha, fecha, a_minutos(hora_fin), a_minutos(hora_inicio),
+                id_reserva_excluir or None
+            )).fetchone()
+            return row['conflicto'] == 0
         except sqlite3.Error:
             return False
 
@@ -172,22 +252,21 @@ class ReservaDAO:
     def actualizar(reserva: Reserva) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
             hora_inicio_str = reserva.hora_inicio.strftime('%H:%M:%S') if isinstance(reserva.hora_inicio, time) else reserva.hora_inicio
             hora_fin_str = reserva.hora_fin.strftime('%H:%M:%S') if isinstance(reserva.hora_fin, time) else reserva.hora_fin
             
-            query = """
-                UPDATE reserva SET id_cliente = ?, id_cancha = ?, fecha_reserva = ?, 
-                    hora_inicio = ?, hora_fin = ?, usa_iluminacion = ?,
-                    estado_reserva = ?, monto_total = ?, observaciones = ?, id_torneo = ?
-                WHERE id_reserva = ?
-            """
-            cursor.execute(query, (reserva.id_cliente, reserva.id_cancha, reserva.fecha_reserva, 
-                                   hora_inicio_str, hora_fin_str, int(reserva.usa_iluminacion), 
-                                   reserva.estado_reserva, reserva.monto_total, reserva.observaciones, 
-                                   reserva.id_torneo, reserva.id_reserva))
+            cursor = ejecutar(conn, 'reserva.actualizar', (
+                reserva.id_cliente, reserva.id_cancha, reserva.fecha_reserva,
+                hora_inicio_str, hora_fin_str, int(reserva.usa_iluminacion),
+                reserva.estado_reserva, reserva.monto_total, reserva.observaciones,
+                reserva.id_torneo, reserva.id_reserva
+            ))
             conn.commit()
-            return cursor.rowcount > 0
+            if cursor.rowcount > 0:
+                motor_disponibilidad.registrar(reserva.id_reserva, reserva.id_cancha, reserva.fecha_reserva,
+                                               reserva.hora_inicio, reserva.hora_fin, reserva.estado_reserva)
+                return True
+            return False
         except sqlite3.Error:
             return False
 
@@ -195,89 +274,118 @@ class ReservaDAO:
     def cambiar_estado(id_reserva: int, nuevo_estado: str) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE reserva SET estado_reserva = ? WHERE id_reserva = ?", (nuevo_estado, id_reserva))
+            row = ejecutar(conn, 'reserva.cambiar_estado', (nuevo_estado, id_reserva)).fetchone()
             conn.commit()
-            return cursor.rowcount > 0
+            if row is None:
+                return False
+            motor_disponibilidad.registrar(id_reserva, row['id_cancha'], row['fecha_reserva'],
+                                           row['hora_inicio'], row['hora_fin'], nuevo_estado)
+            return True
         except sqlite3.Error:
             return False
 
+    @staticmethod
+    def cancelar_pendientes_antes_de(limite: datetime, nota: str) -> List[int]:
+        """
+        Cancela en una sola sentencia las reservas pendientes que empiezan
+        antes de `limite`, agregando `nota` a sus observaciones.
+        Recorre idx_reserva_estado_fecha (estado, fecha, hora) solo en el
+        tramo de pendientes anteriores al límite.
+
+        Returns:
+            List[int]: IDs de las reservas canceladas
+        """
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'reserva.cancelar_pendientes_antes_de', (
+                nota, limite.date().isoformat(), limite.time().strftime('%H:%M:%S')
+            )).fetchall()
+            ids = [row[0] for row in rows]
+            conn.commit()
+            for id_reserva in ids:
+                motor_disponibilidad.quitar(id_reserva)
+            return ids
+        except sqlite3.Error as e:
+            print(f"Error al cancelar reservas pendientes: {e}")
+            return []
+
+    @staticmethod
+    def cancelar_por_torneo(id_torneo: int) -> Optional[List[int]]:
+        """
+        Cancela en una sola sentencia (por idx_reserva_torneo) las reservas
+        no canceladas de un torneo.
+
+        Returns:
+            List[int]: IDs de las reservas canceladas, o None si hubo un error
+        """
+        try:
+            conn = get_db_connection()
+            rows = ejecutar(conn, 'reserva.cancelar_por_torneo', (id_torneo,)).fetchall()
+            ids = [row[0] for row in rows]
+            conn.commit()
+            for id_reserva in ids:
+                motor_disponibilidad.quitar(id_reserva)
+            return ids
+        except sqlite3.Error as e:
+            print(f"Error al cancelar reservas del torneo: {e}")
+            return None
+
     @staticmethod
     def eliminar(id_reserva: int) -> bool:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM reserva WHERE id_reserva = ?", (id_reserva,))
+            cursor = ejecutar(conn, 'reserva.eliminar', (id_reserva,))
             conn.commit()
+            motor_disponibilidad.quitar(id_reserva)
             return cursor.rowcount > 0
         except sqlite3.Error:
             return False
 
+    @staticmethod
+    def contar_dependientes(id_reserva: int) -> Optional[dict]:
+        """
+        Pagos y partidos que referencian la reserva (con foreign_keys
+        activas impiden eliminarla). None si hubo un error.
+        """
+        try:
+            conn = get_db_connection()
+            row = ejecutar(conn, 'reserva.contar_dependientes', (id_reserva, id_reserva)).fetchone()
+            return {'pagos': row['pagos'], 'partidos': row['partidos']}
+        except sqlite3.Error as e:
+            print(f"Error al contar dependientes de la reserva: {e}")
+            return None
+
     @staticmethod
     def contar_total() -> int:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM reserva")
-            return cursor.fetchone()[0]
+            return ejecutar(conn, 'reserva.contar').fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    @staticmethod
+    def contar_por_rango_fechas(fecha_inicio: date, fecha_fin: date) -> int:
+        """Cantidad de reservas (de cualquier estado) entre dos fechas inclusive"""
+        try:
+            conn = get_db_connection()
+            return ejecutar(conn, 'reserva.contar_por_rango_fechas', (fecha_inicio, fecha_fin)).fetchone()[0]
         except sqlite3.Error:
             return 0
 
+    @staticmethod
+    def contar_por_fecha(fecha: date) -> int:
+        """Cantidad de reservas (de cualquier estado) de una fecha"""
+        return ReservaDAO.contar_por_rango_fechas(fecha, fecha)
+
     @staticmethod
     def contar_por_estado() -> dict:
         try:
             conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT estado_reserva, COUNT(*) as cantidad FROM reserva GROUP BY estado_reserva")
-            rows = cursor.fetchall()
+            rows = ejecutar(conn, 'reserva.contar_por_estado').fetchall()
             return {row['estado_reserva']: row['cantidad'] for row in rows}
         except sqlite3.Error:
             return {}
 
     @staticmethod
     def _row_to_reserva(row) -> Reserva:
-        # Parsear fecha
-        fecha = row['fecha_reserva']
-        if isinstance(fecha, str):
-            try: fecha = datetime.strptime(fecha, '%Y-%m-%d').date()
-            except: fecha = None
-            
-        # Parsear horas
-        def parse_h(h_str):
-            if isinstance(h_str, str):
-                try: return datetime.strptime(h_str, '%H:%M:%S').time()
-                except: 
-                    try: return datetime.strptime(h_str, '%H:%M').time()
-                    except: return None
-            return h_str
-
-        hora_ini = parse_h(row['hora_inicio'])
-        hora_fin = parse_h(row['hora_fin'])
-        
-        # Parsear fecha creación
-        creacion = row['fecha_creacion']
-        if isinstance(creacion, str):
-            try: creacion = datetime.strptime(creacion, '%Y-%m-%d %H:%M:%S.%f')
-            except: creacion = datetime.now()
-
-        # Manejo seguro de id_torneo
-        id_torneo = None
-        try:
-            id_torneo = row['id_torneo']
-        except IndexError:
-            pass # La columna podría no existir si no se migró bien, pero el script debió arreglarlo.
-
-        return Reserva(
-            id_reserva=row['id_reserva'],
-            id_cliente=row['id_cliente'],
-            id_cancha=row['id_cancha'],
-            fecha_reserva=fecha,
-            hora_inicio=hora_ini,
-            hora_fin=hora_fin,
-            usa_iluminacion=bool(row['usa_iluminacion']),
-            estado_reserva=row['estado_reserva'],
-            monto_total=row['monto_total'],
-            fecha_creacion=creacion,
-            observaciones=row['observaciones'],
-            id_torneo=id_torneo
-        )
\ No newline at end of file
+        return _MAPEO_RESERVA.uno(row)
@@ -0,0 +1,375 @@
+"""
+Registro de las sentencias SQL de los DAO.
+
+Cada sentencia tiene un nombre ('entidad.operacion') y un texto fijo. Los
+filtros opcionales no se agregan concatenando condiciones: se pasan como
+parámetros (rangos con valores extremos, `? IS NULL OR ...`), así un mismo
+nombre es siempre la misma sentencia para la caché de sentencias preparadas
+de sqlite3 (DB_CACHED_STATEMENTS) y para monitor_consultas. Las variantes
+que cambian el plan (sentido del ORDER BY de una página, filtro por estado
+que se resuelve con otro índice) son sentencias distintas con su nombre.
+
+ejecutar() corre la sentencia en un cursor de la conexión reservado para
+ese nombre y reutilizado entre llamadas, por lo que sus filas deben leerse
+(fetchone de una fila, fetchall) antes de volver a ejecutar el mismo nombre.
+"""
+
+import sqlite3
+
+# Extremos para los rangos de fechas no pedidos (las fechas se guardan como 'AAAA-MM-DD')
+FECHA_MIN = '0000-01-01'
+FECHA_MAX = '9999-12-31'
+# Claves keyset anteriores / posteriores a cualquier fila, para la primera página
+CLAVE_MIN = ('', '', 0)
+CLAVE_MAX = ('\U0010ffff', '', 0)
+ID_MAX = 2 ** 63 - 1
+
+# Duración en minutos de una reserva (si termina pasada la medianoche se suma un día)
+_MINUTOS_RESERVA = "(CASE WHEN r.fin_min < r.inicio_min THEN r.fin_min + 1440 ELSE r.fin_min END - r.inicio_min)"
+
+# Columnas de las filas de reserva listas para mostrar (páginas del listado)
+_SELECT_LISTADO_RESERVAS = """
+    SELECT r.id_reserva, r.fecha_reserva, r.hora_inicio,
+           COALESCE(cl.nombre || ' ' || cl.apellido, 'N/A') AS cliente,
+           COALESCE(ca.nombre, 'N/A') AS cancha,
+           strftime('%d/%m/%Y', r.fecha_reserva) AS fecha,
+           substr(r.hora_inicio, 1, 5) || ' - ' || substr(r.hora_fin, 1, 5) AS horario,
+           r.monto_total,
+           r.estado_reserva
+    FROM reserva r
+    LEFT JOIN cliente cl ON cl.id_cliente = r.id_cliente
+    LEFT JOIN cancha ca ON ca.id_cancha = r.id_cancha
+"""
+
+
+def _pagina_reservas(por_estado, hacia_atras):
+    estado = "r.estado_reserva = ? AND" if por_estado else ""
+    operador, orden = (">", "ASC") if hacia_atras else ("<", "DESC")
+    return f"""
+        {_SELECT_LISTADO_RESERVAS}
+        WHERE {estado} r.fecha_reserva >= ? AND r.fecha_reserva <= ?
+          AND (r.fecha_reserva, r.hora_inicio, r.id_reserva) {operador} (?, ?, ?)
+        ORDER BY r.fecha_reserva {orden}, r.hora_inicio {orden}, r.id_reserva {orden}
+        LIMIT ?
+    """
+
+
+def _pagina_clientes(hacia_atras):
+    operador, orden = ("<", "DESC") if hacia_atras else (">", "ASC")
+    return f"""
+        SELECT * FROM cliente
+        WHERE estado = 'activo'
+          AND (nombre LIKE ? OR apellido LIKE ? OR dni LIKE ? OR email LIKE ?)
+          AND (apellido, nombre, id_cliente) {operador} (?, ?, ?)
+        ORDER BY apellido {orden}, nombre {orden}, id_cliente {orden}
+        LIMIT ?
+    """
+
+
+def _pagina_pagos(hacia_atras):
+    operador, orden = (">", "ASC") if hacia_atras else ("<", "DESC")
+    return f"""
+        SELECT p.id_pago,
+               CASE WHEN p.id_reserva IS NOT NULL THEN 'Res #' || p.id_reserva
+                    WHEN p.id_torneo IS NOT NULL THEN 'Tor #' || p.id_torneo
+                    ELSE 'N/A' END AS referencia,
+               COALESCE(c.nombre || ' ' || c.apellido, 'N/A') AS cliente,
+               p.monto, p.fecha_pago, p.metodo_pago
+        FROM pago p
+        LEFT JOIN reserva r ON r.id_reserva = p.id_reserva
+        LEFT JOIN torneo t ON t.id_torneo = p.id_torneo AND p.id_reserva IS NULL
+        LEFT JOIN cliente c ON c.id_cliente = COALESCE(r.id_cliente, t.id_cliente)
+        WHERE (? IS NULL OR p.fecha_pago >= ?) AND (? IS NULL OR p.fecha_pago <= ?)
+          AND p.id_pago {operador} ?
+        ORDER BY p.id_pago {orden}
+        LIMIT ?
+    """
+
+
+SQL = {
+    # --- Cliente ---
+    'cliente.insertar': """
+        INSERT INTO cliente (nombre, apellido, dni, telefono, email, estado)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    'cliente.obtener_todos': "SELECT * FROM cliente WHERE estado = 'activo' ORDER BY apellido, nombre",
+    'cliente.obtener_por_id': "SELECT * FROM cliente WHERE id_cliente = ?",
+    'cliente.buscar': """
+        SELECT * FROM cliente
+        WHERE (nombre LIKE ? OR apellido LIKE ? OR dni LIKE ? OR email LIKE ?)
+        AND estado = 'activo'
+        ORDER BY apellido
+    """,
+    'cliente.pagina': _pagina_clientes(hacia_atras=False),
+    'cliente.pagina_atras': _pagina_clientes(hacia_atras=True),
+    'cliente.actualizar': """
+        UPDATE cliente SET nombre=?, apellido=?, dni=?, telefono=?, email=?, estado=?
+        WHERE id_cliente=?
+    """,
+    'cliente.eliminar': "UPDATE cliente SET estado = 'inactivo' WHERE id_cliente = ?",
+    'cliente.contar': "SELECT COUNT(*) FROM cliente WHERE estado='activo'",
+
+    # --- Cancha ---
+    'cancha.insertar': """
+        INSERT INTO cancha (nombre, tipo_deporte, tipo_superficie, techada,
+                            iluminacion, capacidad_jugadores,
+                            precio_hora_dia, precio_hora_noche, estado)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'cancha.obtener_todos': "SELECT * FROM cancha WHERE estado != 'no_disponible' AND estado != 'inactiva' ORDER BY nombre",
+    'cancha.obtener_disponibles': "SELECT * FROM cancha WHERE estado = 'disponible' ORDER BY nombre",
+    'cancha.obtener_por_id': "SELECT * FROM cancha WHERE id_cancha = ?",
+    'cancha.actualizar': """
+        UPDATE cancha
+        SET nombre=?, tipo_deporte=?, tipo_superficie=?, techada=?,
+            iluminacion=?, capacidad_jugadores=?, precio_hora_dia=?,
+            precio_hora_noche=?, estado=?
+        WHERE id_cancha=?
+    """,
+    'cancha.eliminar': "UPDATE cancha SET estado = 'no_disponible' WHERE id_cancha = ?",
+    'cancha.contar': "SELECT COUNT(*) FROM cancha WHERE estado='disponible'",
+
+    # --- Reserva ---
+    'reserva.insertar': """
+        INSERT INTO reserva (id_cliente, id_cancha, fecha_reserva, hora_inicio,
+                             hora_fin, usa_iluminacion, estado_reserva, monto_total,
+                             fecha_creacion, observaciones, id_torneo,
+                             inicio_min, fin_min)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'reserva.ultimo_id': "SELECT last_insert_rowid()",
+    'reserva.obtener_por_id': "SELECT * FROM reserva WHERE id_reserva = ?",
+    'reserva.obtener_todas': "SELECT * FROM reserva ORDER BY fecha_reserva DESC, hora_inicio DESC",
+    'reserva.pagina': _pagina_reservas(por_estado=False, hacia_atras=False),
+    'reserva.pagina_atras': _pagina_reservas(por_estado=False, hacia_atras=True),
+    'reserva.pagina_estado': _pagina_reservas(por_estado=True, hacia_atras=False),
+    'reserva.pagina_estado_atras': _pagina_reservas(por_estado=True, hacia_atras=True),
+    'reserva.obtener_por_cliente': "SELECT * FROM reserva WHERE id_cliente = ? ORDER BY fecha_reserva DESC",
+    'reserva.obtener_por_cancha': "SELECT * FROM reserva WHERE id_cancha = ? ORDER BY fecha_reserva DESC",
+    'reserva.obtener_por_fecha': "SELECT * FROM reserva WHERE fecha_reserva = ? ORDER BY hora_inicio",
+    'reserva.obtener_por_rango_fechas': "SELECT * FROM reserva WHERE fecha_reserva BETWEEN ? AND ? ORDER BY fecha_reserva",
+    'reserva.obtener_por_estado': "SELECT * FROM reserva WHERE estado_reserva = ?",
+    # Solapamiento: empieza antes de que termine el nuevo turno y termina
+    # después de que empiece. Se resuelve con una búsqueda por rango sobre
+    # idx_reserva_disponibilidad; con NULL no se excluye ninguna reserva.
+    'reserva.verificar_disponibilidad': """
+        SELECT EXISTS (
+            SELECT 1 FROM reserva
+            WHERE id_cancha = ? AND fecha_reserva = ? AND estado_reserva != 'cancelada'
+            AND inicio_min < ? AND fin_min > ? AND id_reserva IS NOT ?
+        ) AS conflicto
+    """,
+    'reserva.actualizar': """
+        UPDATE reserva SET id_cliente = ?, id_cancha = ?, fecha_reserva = ?,
+            hora_inicio = ?, hora_fin = ?, usa_iluminacion = ?,
+            estado_reserva = ?, monto_total = ?, observaciones = ?, id_torneo = ?
+        WHERE id_reserva = ?
+    """,
+    'reserva.cambiar_estado': """
+        UPDATE reserva SET estado_reserva = ? WHERE id_reserva = ?
+        RETURNING id_cancha, fecha_reserva, hora_inicio, hora_fin
+    """,
+    'reserva.cancelar_pendientes_antes_de': """
+        UPDATE reserva
+        SET estado_reserva = 'cancelada',
+            observaciones = COALESCE(observaciones, '') || ?
+        WHERE estado_reserva = 'pendiente'
+          AND (fecha_reserva, hora_inicio) < (?, ?)
+        RETURNING id_reserva
+    """,
+    'reserva.cancelar_por_torneo': """
+        UPDATE reserva SET estado_reserva = 'cancelada'
+        WHERE id_torneo = ? AND estado_reserva != 'cancelada'
+        RETURNING id_reserva
+    """,
+    'reserva.eliminar': "DELETE FROM reserva WHERE id_reserva = ?",
+    'reserva.contar_dependientes': """
+        SELECT (SELECT COUNT(*) FROM pago WHERE id_reserva = ?) AS pagos,
+               (SELECT COUNT(*) FROM partido WHERE id_reserva = ?) AS partidos
+    """,
+    'reserva.contar': "SELECT COUNT(*) FROM reserva",
+    'reserva.contar_por_rango_fechas': "SELECT COUNT(*) FROM reserva WHERE fecha_reserva BETWEEN ? AND ?",
+    'reserva.contar_por_estado': "SELECT estado_reserva, COUNT(*) as cantidad FROM reserva GROUP BY estado_reserva",
+
+    # --- Disponibilidad (motor en memoria) ---
+    'disponibilidad.data_version': "PRAGMA data_version",
+    # Las fechas llegan como un arreglo JSON: un solo texto para cualquier cantidad de días
+    'disponibilidad.cargar_dias': """
+        SELECT id_reserva, id_cancha, fecha_reserva, inicio_min, fin_min
+        FROM reserva
+        WHERE fecha_reserva IN (SELECT value FROM json_each(?)) AND estado_reserva != 'cancelada'
+        ORDER BY fecha_reserva, id_cancha, inicio_min
+    """,
+
+    # --- Pago ---
+    'pago.insertar': """
+        INSERT INTO pago (id_reserva, id_torneo, monto, fecha_pago, metodo_pago)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'pago.sumar_a_reserva': "UPDATE reserva SET monto_pagado = monto_pagado + ? WHERE id_reserva = ?",
+    'pago.sumar_a_torneo': "UPDATE torneo SET monto_pagado = monto_pagado + ? WHERE id_torneo = ?",
+    'pago.obtener_por_id': "SELECT * FROM pago WHERE id_pago = ?",
+    'pago.obtener_todos': "SELECT * FROM pago ORDER BY fecha_pago DESC",
+    'pago.pagina': _pagina_pagos(hacia_atras=False),
+    'pago.pagina_atras': _pagina_pagos(hacia_atras=True),
+    'pago.obtener_por_reserva': "SELECT * FROM pago WHERE id_reserva = ?",
+    'pago.obtener_por_torneo': "SELECT * FROM pago WHERE id_torneo = ?",
+    'pago.total_por_reserva': "SELECT COALESCE(SUM(monto), 0) FROM pago WHERE id_reserva = ?",
+    'pago.total_por_torneo': "SELECT COALESCE(SUM(monto), 0) FROM pago WHERE id_torneo = ?",
+    'pago.saldos_pendientes': """
+        SELECT r.id_reserva, r.fecha_reserva, r.hora_inicio,
+               COALESCE(cl.nombre || ' ' || cl.apellido, 'N/A') AS cliente,
+               COALESCE(ca.nombre, 'N/A') AS cancha,
+               r.monto_total, r.monto_pagado,
+               r.monto_total - r.monto_pagado AS saldo
+        FROM reserva r
+        LEFT JOIN cliente cl ON cl.id_cliente = r.id_cliente
+        LEFT JOIN cancha ca ON ca.id_cancha = r.id_cancha
+        WHERE r.monto_total > r.monto_pagado AND r.estado_reserva != 'cancelada'
+          AND r.monto_total - r.monto_pagado > ?
+        ORDER BY r.fecha_reserva, r.hora_inicio
+    """,
+
+    # --- Torneo ---
+    'torneo.insertar': """
+        INSERT INTO torneo (nombre, deporte, fecha, hora_inicio, hora_fin,
+                            cantidad_canchas, precio_total, estado, id_cliente)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'torneo.obtener_todos': "SELECT * FROM torneo WHERE estado != 'cancelado' ORDER BY fecha DESC",
+    'torneo.obtener_por_id': "SELECT * FROM torneo WHERE id_torneo = ?",
+    'torneo.eliminar': "UPDATE torneo SET estado = 'cancelado' WHERE id_torneo = ?",
+
+    # --- Equipo ---
+    'equipo.insertar': """
+        INSERT INTO equipo (id_torneo, nombre_equipo, capitan,
+                            telefono_contacto, fecha_inscripcion)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'equipo.obtener_por_id': "SELECT * FROM equipo WHERE id_equipo = ?",
+    'equipo.obtener_por_torneo': "SELECT * FROM equipo WHERE id_torneo = ? ORDER BY nombre_equipo",
+    'equipo.obtener_todos': "SELECT * FROM equipo ORDER BY id_torneo, nombre_equipo",
+    'equipo.contar_por_torneo': "SELECT COUNT(*) as total FROM equipo WHERE id_torneo = ?",
+    'equipo.actualizar': """
+        UPDATE equipo
+        SET id_torneo = ?, nombre_equipo = ?, capitan = ?,
+            telefono_contacto = ?, fecha_inscripcion = ?
+        WHERE id_equipo = ?
+    """,
+    'equipo.eliminar': "DELETE FROM equipo WHERE id_equipo = ?",
+
+    # --- Partido ---
+    'partido.insertar': """
+        INSERT INTO partido (id_torneo, id_equipo_local, id_equipo_visitante,
+                             id_reserva, fecha_partido, hora_inicio,
+                             resultado_local, resultado_visitante, estado_partido)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'partido.obtener_por_id': "SELECT * FROM partido WHERE id_partido = ?",
+    'partido.obtener_por_torneo': """
+        SELECT * FROM partido
+        WHERE id_torneo = ?
+        ORDER BY fecha_partido, hora_inicio
+    """,
+    'partido.obtener_por_equipo': """
+        SELECT * FROM partido
+        WHERE id_equipo_local = ? OR id_equipo_visitante = ?
+        ORDER BY fecha_partido, hora_inicio
+    """,
+    'partido.obtener_todos': "SELECT * FROM partido ORDER BY fecha_partido DESC, hora_inicio",
+    'partido.actualizar': """
+        UPDATE partido
+        SET id_torneo = ?, id_equipo_local = ?, id_equipo_visitante = ?,
+            id_reserva = ?, fecha_partido = ?, hora_inicio = ?,
+            resultado_local = ?, resultado_visitante = ?, estado_partido = ?
+        WHERE id_partido = ?
+    """,
+    'partido.registrar_resultado': """
+        UPDATE partido
+        SET resultado_local = ?, resultado_visitante = ?, estado_partido = 'jugado'
+        WHERE id_partido = ?
+    """,
+    'partido.eliminar': "DELETE FROM partido WHERE id_partido = ?",
+
+    # --- Reportes ---
+    # Empates de monto: primero el cliente cuya primera reserva es más antigua
+    # y, el mismo día, la de menor id (fecha 'AAAA-MM-DD' + id con ancho fijo)
+    'reportes.totales_por_cliente': """
+        SELECT c.nombre, c.apellido, c.dni,
+               COUNT(*) AS cantidad, SUM(r.monto_total) AS monto
+        FROM reserva r
+        JOIN cliente c ON c.id_cliente = r.id_cliente
+        WHERE r.estado_reserva != 'cancelada' AND c.estado = 'activo'
+          AND r.fecha_reserva >= ? AND r.fecha_reserva <= ?
+        GROUP BY r.id_cliente
+        ORDER BY monto DESC, MIN(r.fecha_reserva || printf('%019d', r.id_reserva))
+    """,
+    # Las reservas de torneo valen su parte del precio del torneo
+    'reportes.totales_por_cancha': f"""
+        SELECT r.id_cancha,
+               COUNT(*) AS cantidad,
+               SUM({_MINUTOS_RESERVA}) AS minutos,
+               SUM(CASE
+                       WHEN COALESCE(r.id_torneo, 0) = 0 THEN r.monto_total
+                       WHEN t.cantidad_canchas > 0 THEN t.precio_total * 1.0 / t.cantidad_canchas
+                       ELSE 0
+                   END) AS monto
+        FROM reserva r
+        LEFT JOIN torneo t ON t.id_torneo = r.id_torneo
+        WHERE r.estado_reserva != 'cancelada'
+          AND r.fecha_reserva >= ? AND r.fecha_reserva <= ?
+        GROUP BY r.id_cancha
+    """,
+    'reportes.conteo_por_estado': """
+        SELECT SUM(pendientes), SUM(confirmadas), SUM(canceladas), SUM(completadas)
+        FROM resumen_diario
+        WHERE fecha BETWEEN ? AND ?
+    """,
+    'reportes.ingresos_por_mes': """
+        SELECT CAST(substr(fecha, 6, 2) AS INTEGER) AS mes, SUM(ingresos)
+        FROM resumen_diario
+        WHERE fecha BETWEEN ? AND ?
+        GROUP BY mes
+    """,
+    # Empates: primero la cancha cuya primera reserva no cancelada es más
+    # antigua (por fecha y, el mismo día, por id), como el reporte original.
+    # Los días con solo canceladas no cuentan para ese primer día
+    'reportes.ranking_canchas': """
+        WITH ranking AS (
+            SELECT rd.id_cancha, c.nombre,
+                   SUM(rd.pendientes + rd.confirmadas + rd.completadas) AS reservas,
+                   SUM(rd.monto_reservas) AS monto,
+                   MIN(CASE WHEN rd.pendientes + rd.confirmadas + rd.completadas > 0
+                            THEN rd.fecha END) AS primer_dia
+            FROM resumen_diario rd
+            JOIN cancha c ON c.id_cancha = rd.id_cancha
+            WHERE rd.fecha BETWEEN ? AND ?
+              AND c.estado != 'no_disponible' AND c.estado != 'inactiva'
+            GROUP BY rd.id_cancha
+            HAVING reservas > 0
+        )
+        SELECT nombre, reservas, monto
+        FROM ranking
+        ORDER BY reservas DESC, primer_dia,
+                 (SELECT MIN(r.id_reserva) FROM reserva r
+                  WHERE r.id_cancha = ranking.id_cancha AND r.fecha_reserva = ranking.primer_dia
+                    AND r.estado_reserva != 'cancelada')
+        LIMIT ?
+    """,
+}
+
+
+def ejecutar(conn, nombre: str, params=()):
+    """
+    Ejecuta la sentencia registrada `nombre` en el cursor que la conexión
+    reserva para ella y retorna ese cursor (filas, lastrowid, rowcount).
+
+    Si la sentencia falla fuera de un bloque transaccion() se revierte la
+    transacción implícita que haya abierto el DAO: la conexión es del hilo
+    y vive tanto como él, y no debe quedarse con el bloqueo de escritura.
+    """
+    try:
+        return conn.cursor_sentencia(nombre).execute(SQL[nombre], params)
+    except sqlite3.Error:
+        conn.rollback()  # Dentro de transaccion() lo decide el bloque
+        raise
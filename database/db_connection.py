@@ -4,103 +4,410 @@ Módulo para gestionar la conexión a la base de datos SQLite
 
 import sqlite3
 import os
-from config import DB_PATH
+import threading
+import time
+from contextlib import contextmanager
+from config import DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_PRAGMAS, DB_CACHED_STATEMENTS
+from database.migraciones import aplicar_migraciones, VERSION_ACTUAL
+from database.monitoreo import CursorMonitoreado
+
+
+class ConexionMonitoreada(sqlite3.Connection):
+    """
+    Conexión que cuenta los commits con cambios hechos por el proceso.
+    Junto con PRAGMA data_version (commits de otras conexiones) permite
+    saber si los datos cambiaron sin volver a consultarlos.
+
+    Sus cursores registran cada sentencia en monitor_consultas (ver
+    database/monitoreo.py), también las de conn.execute(). Las sentencias
+    del registro de los DAO (dao/sql.py) usan además un cursor propio cada
+    una, creado la primera vez y reutilizado en las siguientes.
+    """
+
+    generacion = 0
+    reversiones = 0  # Transacciones explícitas revertidas (ver transaccion())
+    _lock_generacion = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.data_version_visto = None  # Último PRAGMA data_version leído
+        self.profundidad = 0  # Bloques transaccion() abiertos en esta conexión
+        self.cursores = {}  # Nombre de sentencia -> cursor reutilizable
+
+    def cursor(self, factory=CursorMonitoreado):
+        return super().cursor(factory)
+
+    def cursor_sentencia(self, nombre):
+        """Cursor reservado para la sentencia `nombre` (se crea una sola vez)"""
+        cursor = self.cursores.get(nombre)
+        if cursor is None:
+            cursor = self.cursores[nombre] = self.cursor()
+        return cursor
+
+    # Los atajos de Connection crean su cursor sin pasar por cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+    def commit(self):
+        if self.profundidad:
+            return  # Lo confirma el transaccion() más externo
+        habia_cambios = self.in_transaction
+        try:
+            super().commit()
+        except sqlite3.Error:
+            # No queda abierta para el próximo uso de la conexión del hilo
+            super().rollback()
+            raise
+        if habia_cambios:
+            ConexionMonitoreada.avanzar_generacion()
+
+    def rollback(self):
+        if self.profundidad:
+            return  # Lo decide transaccion() según termine el bloque
+        super().rollback()
+
+    @staticmethod
+    def avanzar_generacion():
+        with ConexionMonitoreada._lock_generacion:
+            ConexionMonitoreada.generacion += 1
+
+    @staticmethod
+    def registrar_reversion():
+        with ConexionMonitoreada._lock_generacion:
+            ConexionMonitoreada.reversiones += 1
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones SQLite.
+
+    Cada hilo obtiene su propia conexión (checkout) y la conserva hasta
+    devolverla (return) o hasta que el hilo termina; las conexiones de hilos
+    muertos se recuperan automáticamente cuando el pool se agota.
+    """
+
+    def __init__(self, db_path, max_conexiones=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 pragmas=None):
+        self.db_path = db_path
+        self.max_conexiones = max_conexiones
+        self.timeout = timeout
+        self.pragmas = DB_PRAGMAS if pragmas is None else pragmas
+        self._condicion = threading.Condition()
+        self._libres = []
+        self._en_uso = {}  # id(conexión) -> (conexión, hilo dueño)
+        self._creadas = 0
+        self._local = threading.local()
+
+    def _crear_conexion(self):
+        """Abre una nueva conexión con la configuración estándar"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=ConexionMonitoreada,
+                               cached_statements=DB_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row  # Permite acceder a columnas por nombre
+        self._aplicar_pragmas(conn)
+        return conn
+
+    def _aplicar_pragmas(self, conn):
+        """Aplica el perfil de rendimiento configurado en DB_PRAGMAS"""
+        for nombre, valor in self.pragmas.items():
+            conn.execute(f"PRAGMA {nombre} = {valor}")
+
+    def configuracion_efectiva(self):
+        """
+        Consulta a SQLite el valor vigente de cada PRAGMA del perfil.
+        Puede diferir de lo configurado (ej: journal_mode en una BD en memoria).
+        """
+        with self.connection() as conn:
+            return {
+                nombre: conn.execute(f"PRAGMA {nombre}").fetchone()[0]
+                for nombre in self.pragmas
+            }
+
+    def _recuperar_huerfanas(self):
+        """Devuelve al pool las conexiones cuyos hilos dueños ya terminaron"""
+        for clave, (conn, hilo) in list(self._en_uso.items()):
+            if not hilo.is_alive():
+                del self._en_uso[clave]
+                conn.profundidad = 0
+                if conn.in_transaction:
+                    conn.rollback()
+                self._libres.append(conn)
+
+    def acquire(self):
+        """
+        Retira una conexión del pool (checkout).
+        Bloquea hasta `timeout` segundos si todas están en uso.
+        """
+        limite = time.monotonic() + self.timeout
+        with self._condicion:
+            while True:
+                if not self._libres:
+                    self._recuperar_huerfanas()
+
+                if self._libres:
+                    conn = self._libres.pop()
+                elif self._creadas < self.max_conexiones:
+                    conn = self._crear_conexion()
+                    self._creadas += 1
+                else:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise sqlite3.OperationalError(
+                            f"Pool de conexiones agotado ({self.max_conexiones} en uso)"
+                        )
+                    self._condicion.wait(restante)
+                    continue
+
+                self._en_uso[id(conn)] = (conn, threading.current_thread())
+                return conn
+
+    def release(self, conn):
+        """Devuelve una conexión al pool (return), descartando lo no confirmado"""
+        with self._condicion:
+            if self._en_uso.pop(id(conn), None) is None:
+                return
+            conn.profundidad = 0
+            if conn.in_transaction:
+                conn.rollback()
+            self._libres.append(conn)
+            self._condicion.notify()
+
+    @contextmanager
+    def connection(self):
+        """Checkout temporal: `with pool.connection() as conn: ...`"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def get_thread_connection(self):
+        """Retorna la conexión asignada al hilo actual, retirándola si no tiene"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.acquire()
+            self._local.conn = conn
+        return conn
+
+    def release_thread_connection(self):
+        """Devuelve al pool la conexión asignada al hilo actual"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            self.release(conn)
+
+    def close_all(self):
+        """Cierra todas las conexiones, libres y en uso"""
+        with self._condicion:
+            conexiones = self._libres + [conn for conn, _ in self._en_uso.values()]
+            self._libres = []
+            self._en_uso = {}
+            self._creadas = 0
+            self._local = threading.local()
+            for conn in conexiones:
+                conn.close()
+            self._condicion.notify_all()
+
+    def estadisticas(self):
+        """Retorna el estado actual del pool"""
+        with self._condicion:
+            return {
+                'max_conexiones': self.max_conexiones,
+                'creadas': self._creadas,
+                'en_uso': len(self._en_uso),
+                'libres': len(self._libres)
+            }
 
 
 class DatabaseConnection:
     """
-    Clase singleton para gestionar la conexión a la base de datos.
-    Garantiza que solo exista una instancia de conexión.
+    Clase singleton para gestionar el acceso a la base de datos.
+    Mantiene un único pool de conexiones (una por hilo) para todo el proceso.
     """
     
     _instance = None
-    _connection = None
+    _pool = None
+    _lock = threading.Lock()
     
     def __new__(cls):
         """Implementación del patrón Singleton"""
-        if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
-        """Inicializa la conexión si no existe"""
+        """Inicializa el pool si no existe"""
         self.db_path = DB_PATH
-        if self._connection is None:
-            self._connect()
+        self._asegurar_pool()
+    
+    def _asegurar_pool(self):
+        """Crea el pool una única vez aunque varios hilos lo pidan a la vez"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._connect()
     
     def _connect(self):
-        """Establece la conexión con la base de datos"""
+        """Crea el pool de conexiones con la base de datos"""
         try:
             # Crear el directorio database si no existe
             db_dir = os.path.dirname(DB_PATH)
             if not os.path.exists(db_dir):
                 os.makedirs(db_dir)
             
-            # Conectar a la base de datos
-            self._connection = sqlite3.connect(DB_PATH, check_same_thread=False)
-            self._connection.row_factory = sqlite3.Row  # Permite acceder a columnas por nombre
+            pool = ConnectionPool(DB_PATH)
             print(f"✓ Conexión establecida con la base de datos: {DB_PATH}")
             
+            configuracion = pool.configuracion_efectiva()
+            resumen = ", ".join(f"{k}={v}" for k, v in configuracion.items())
+            print(f"✓ Perfil SQLite: {resumen}")
+            
             # Inicializar el schema si es necesario
-            self._initialize_schema()
+            with pool.connection() as conn:
+                self._initialize_schema(conn)
+            
+            self._pool = pool
             
         except sqlite3.Error as e:
             print(f"✗ Error al conectar con la base de datos: {e}")
             raise
     
-    def _initialize_schema(self):
-        """Inicializa el schema de la base de datos si no existe"""
+    def _initialize_schema(self, conn):
+        """Aplica las migraciones de esquema pendientes (ninguna en un arranque en caliente)"""
         try:
-            schema_path = os.path.join(os.path.dirname(DB_PATH), 'schema.sql')
-            
-            if os.path.exists(schema_path):
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    schema_sql = f.read()
-                
-                cursor = self._connection.cursor()
-                cursor.executescript(schema_sql)
-                self._connection.commit()
-                print("✓ Schema de base de datos inicializado correctamente")
+            aplicadas = aplicar_migraciones(conn)
+            if aplicadas:
+                print(f"✓ Schema actualizado a la versión {VERSION_ACTUAL} ({aplicadas} migraciones aplicadas)")
             else:
-                print(f"⚠ Advertencia: No se encontró el archivo schema.sql en {schema_path}")
+                print(f"✓ Schema al día (versión {VERSION_ACTUAL})")
                 
         except Exception as e:
             print(f"✗ Error al inicializar el schema: {e}")
             raise
     
+    @property
+    def pool(self):
+        """Pool de conexiones activo"""
+        self._asegurar_pool()
+        return self._pool
+    
+    def obtener_configuracion(self):
+        """Retorna los PRAGMAs efectivos de las conexiones del pool"""
+        return self.pool.configuracion_efectiva()
+    
     def get_connection(self):
-        """Retorna la conexión activa"""
-        if self._connection is None:
-            self._connect()
-        return self._connection
+        """Retorna la conexión del hilo actual"""
+        return self.pool.get_thread_connection()
+    
+    def release_connection(self):
+        """Devuelve al pool la conexión del hilo actual"""
+        if self._pool is not None:
+            self._pool.release_thread_connection()
     
     def close(self):
-        """Cierra la conexión a la base de datos"""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Cierra todas las conexiones a la base de datos"""
+        if self._pool:
+            self._pool.close_all()
+            self._pool = None
             print("✓ Conexión cerrada")
     
     def commit(self):
-        """Realiza commit de las transacciones pendientes"""
-        if self._connection:
-            self._connection.commit()
+        """Realiza commit de las transacciones pendientes del hilo actual"""
+        if self._pool:
+            self.get_connection().commit()
     
     def rollback(self):
-        """Realiza rollback de las transacciones pendientes"""
-        if self._connection:
-            self._connection.rollback()
+        """Realiza rollback de las transacciones pendientes del hilo actual"""
+        if self._pool:
+            self.get_connection().rollback()
 
 
 def get_db_connection():
     """
     Función auxiliar para obtener la conexión a la base de datos.
-    Retorna la conexión singleton.
+    Retorna la conexión asignada al hilo actual dentro del pool.
     """
     db = DatabaseConnection()
     return db.get_connection()
 
 
+def release_db_connection():
+    """
+    Función auxiliar para devolver al pool la conexión del hilo actual.
+    Útil al finalizar trabajos en hilos de fondo.
+    """
+    db = DatabaseConnection()
+    db.release_connection()
+
+
+def obtener_generacion_datos():
+    """
+    Retorna un número que cambia cada vez que se confirman cambios en la base,
+    ya sea desde este proceso o desde otro, y que es el mismo en todos los
+    hilos. Es barato de consultar (no lee tablas), por lo que sirve para
+    decidir si vale la pena refrescar datos o descartar una caché.
+    """
+    conn = get_db_connection()
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    # data_version es propio de cada conexión: lo que cambia es que el
+    # número avance desde la última lectura en esa misma conexión. Una
+    # conexión que lo lee por primera vez no sabe qué cambió antes de que
+    # existiera (ej: otro proceso escribió y este hilo es nuevo), así que
+    # también cuenta como cambio
+    if data_version != conn.data_version_visto:
+        ConexionMonitoreada.avanzar_generacion()
+    conn.data_version_visto = data_version
+    return ConexionMonitoreada.generacion
+
+
+@contextmanager
+def transaccion():
+    """
+    Agrupa varias operaciones de los DAO en una sola transacción:
+    `with transaccion(): ...`
+
+    Empieza con BEGIN IMMEDIATE, que toma el bloqueo de escritura de
+    entrada: lo que se lea dentro del bloque no puede cambiar antes del
+    commit (ej: verificar disponibilidad y luego insertar). Los commit() que
+    hagan los DAO dentro del bloque se difieren hasta el final; si el bloque
+    termina con una excepción se revierte todo. Los bloques anidados usan
+    SAVEPOINT y solo revierten su parte.
+
+    Si al abrir el bloque más externo la conexión del hilo sigue dentro de
+    una transacción implícita (la dejó abierta una sentencia que falló
+    fuera de un bloque), esa transacción se revierte: no pertenece a nadie
+    y no debe confirmarse junto con el bloque.
+    """
+    conn = get_db_connection()
+    nivel = conn.profundidad
+    if nivel == 0 and conn.in_transaction:
+        conn.rollback()
+    conn.execute("BEGIN IMMEDIATE" if nivel == 0 else f"SAVEPOINT nivel_{nivel}")
+    conn.profundidad += 1
+    try:
+        yield conn
+    except BaseException:
+        conn.profundidad = nivel
+        if nivel == 0:
+            conn.rollback()
+        else:
+            conn.execute(f"ROLLBACK TO nivel_{nivel}")
+            conn.execute(f"RELEASE nivel_{nivel}")
+        # Quien haya cacheado lo escrito en el bloque (ej: el motor de
+        # disponibilidad) debe descartarlo
+        ConexionMonitoreada.registrar_reversion()
+        raise
+    else:
+        conn.profundidad = nivel
+        if nivel == 0:
+            conn.commit()
+        else:
+            conn.execute(f"RELEASE nivel_{nivel}")
+
+
 def close_db_connection():
     """
     Función auxiliar para cerrar la conexión a la base de datos.
@@ -0,0 +1,479 @@
+"""
+Generador de datos sintéticos para pruebas de escala.
+
+Llena una base nueva con volúmenes realistas y reproducibles (misma semilla,
+mismos datos): clientes, canchas, años de reservas con la demanda típica de
+un complejo (más turnos de noche y en fin de semana, pocos clientes muy
+frecuentes), pagos totales y parciales, y torneos con equipos y partidos.
+
+La carga es masiva: las filas se insertan con executemany en transacciones
+de muchos miles de filas, desde un hilo escritor que inserta un lote
+mientras se genera el siguiente (sqlite3 libera el GIL al ejecutar). Mientras tanto se quitan los índices y triggers de
+las tablas cargadas (el generador ya produce turnos sin solapamientos y el
+total pagado de cada reserva); al final se recrean tal como estaban, se
+reconstruye resumen_diario y se corre ANALYZE.
+
+Uso:
+    python -m database.generador_datos --db grande.db --clientes 50000 --canchas 300 --anios 5
+"""
+
+import argparse
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time as reloj
+from datetime import date, timedelta
+
+from config import METODOS_PAGO
+from database.migraciones import aplicar_migraciones, reconstruir_resumen_diario
+
+NOMBRES = ('Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Lucía', 'Martín', 'Sofía', 'Diego', 'Valentina',
+           'Javier', 'Camila', 'Facundo', 'Florencia', 'Matías', 'Agustina', 'Nicolás', 'Julieta',
+           'Santiago', 'Paula', 'Tomás', 'Micaela', 'Franco', 'Carolina', 'Lautaro', 'Romina')
+APELLIDOS = ('Pérez', 'González', 'López', 'Martínez', 'Rodríguez', 'Fernández', 'García', 'Sánchez',
+             'Romero', 'Díaz', 'Álvarez', 'Torres', 'Ruiz', 'Gómez', 'Sosa', 'Benítez', 'Acosta',
+             'Medina', 'Herrera', 'Suárez', 'Aguirre', 'Giménez', 'Molina', 'Castro', 'Ortiz')
+
+# deporte: (peso, superficies, capacidad, precio por hora de día)
+DEPORTES = {
+    'Fútbol 5': (40, ('Césped sintético',), 10, 6000),
+    'Fútbol 7': (10, ('Césped sintético', 'Césped natural'), 14, 8000),
+    'Paddle': (25, ('Cemento', 'Césped sintético'), 4, 4000),
+    'Tenis': (15, ('Polvo de ladrillo', 'Cemento'), 2, 4500),
+    'Básquet': (5, ('Parquet', 'Cemento'), 10, 5500),
+    'Vóley': (5, ('Parquet',), 12, 5000),
+}
+
+APERTURA, CIERRE = 8 * 60, 23 * 60  # Minutos desde la medianoche
+HORA_NOCHE = 19                      # Desde esta hora rige el precio de noche (ver ReservaService)
+RECARGO_ILUMINACION = 1000.0
+
+# Probabilidad relativa de que un turno libre se reserve, por hora y por día
+# de la semana (lunes a domingo): la demanda se concentra a la noche y el fin de semana
+DEMANDA_HORA = {8: 0.25, 9: 0.3, 10: 0.35, 11: 0.35, 12: 0.3, 13: 0.25, 14: 0.3, 15: 0.35,
+                16: 0.45, 17: 0.6, 18: 0.8, 19: 0.95, 20: 1.0, 21: 0.9, 22: 0.6}
+DEMANDA_DIA = (0.7, 0.7, 0.75, 0.8, 0.95, 1.0, 0.85)
+# Duración de los turnos en minutos: 70% de una hora, 25% de hora y media, 5% de dos
+DURACIONES = ((0.70, 60), (0.95, 90), (1.0, 120))
+ANTICIPACION_MAXIMA = 14  # Días entre que se toma una reserva y se juega
+
+# Horas en texto, indexadas por minuto // 30
+_HORAS = [f"{m // 60:02d}:{m % 60:02d}:00" for m in range(0, 24 * 60 + 1, 30)]
+# Horas de creación posibles (un minuto cualquiera del horario de atención)
+_HORAS_CREACION = [f"{h:02d}:{m:02d}:00" for h in range(8, 23) for m in range(60)]
+
+# Tablas que se cargan en masa, en orden de claves foráneas (sus índices y
+# triggers se quitan durante la carga)
+_TABLAS = ('cliente', 'cancha', 'torneo', 'reserva', 'pago', 'equipo', 'partido')
+
+_INSERTAR = {
+    'cliente': "INSERT INTO cliente (id_cliente, nombre, apellido, dni, telefono, email, estado) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    'cancha': "INSERT INTO cancha (id_cancha, nombre, tipo_deporte, tipo_superficie, techada, "
+              "iluminacion, capacidad_jugadores, precio_hora_dia, precio_hora_noche, estado) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    'torneo': "INSERT INTO torneo (id_torneo, nombre, deporte, fecha, hora_inicio, hora_fin, "
+              "cantidad_canchas, precio_total, estado, id_cliente, monto_pagado) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    'reserva': "INSERT INTO reserva (id_reserva, id_cliente, id_cancha, fecha_reserva, hora_inicio, "
+               "hora_fin, usa_iluminacion, estado_reserva, monto_total, fecha_creacion, observaciones, "
+               "id_torneo, inicio_min, fin_min, monto_pagado) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    'pago': "INSERT INTO pago (id_reserva, id_torneo, monto, fecha_pago, metodo_pago) VALUES (?, ?, ?, ?, ?)",
+    'equipo': "INSERT INTO equipo (id_equipo, id_torneo, nombre_equipo, capitan, telefono_contacto, "
+              "fecha_inscripcion) VALUES (?, ?, ?, ?, ?, ?)",
+    'partido': "INSERT INTO partido (id_torneo, id_equipo_local, id_equipo_visitante, id_reserva, "
+               "fecha_partido, hora_inicio, resultado_local, resultado_visitante, estado_partido) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+}
+
+
+class GeneradorDatos:
+    """Genera y carga los datos sobre una conexión a una base vacía"""
+
+    def __init__(self, conn, semilla=42, clientes=20000, canchas=200, anios=3, dias_futuros=30,
+                 ocupacion=0.8, torneos_por_mes=4, lote=250000, hoy=None):
+        """
+        Args:
+            conn: Conexión a una base migrada y sin datos, en modo autocommit
+                (isolation_level=None) y usable desde otro hilo (check_same_thread=False)
+            semilla: Semilla del generador (misma semilla, mismos datos)
+            clientes, canchas: Cantidades a crear
+            anios: Años de historia hacia atrás desde hoy
+            dias_futuros: Días hacia adelante con reservas ya tomadas
+            ocupacion: Escala de la demanda (1 = la hora pico se llena casi siempre)
+            torneos_por_mes: Promedio de torneos por mes
+            lote: Reservas por transacción
+            hoy: Fecha de referencia (por defecto la actual); fijarla hace que
+                la misma semilla dé los mismos datos cualquier día
+        """
+        self.conn = conn
+        self.semilla = semilla
+        self.azar = random.Random(semilla)
+        self.cantidad_clientes = clientes
+        self.cantidad_canchas = canchas
+        self.anios = anios
+        self.dias_futuros = dias_futuros
+        self.ocupacion = ocupacion
+        self.torneos_por_mes = torneos_por_mes
+        self.lote = lote
+        self.hoy = hoy or date.today()
+
+        self.canchas = []  # (id, deporte, iluminacion, precio_dia, precio_noche)
+        self.conteo = dict.fromkeys(_TABLAS, 0)
+        self._pendientes = {tabla: [] for tabla in _TABLAS}
+        self._lotes = queue.Queue(maxsize=2)  # Lotes listos para el hilo escritor
+        self._error = None
+        self._id_reserva = 0
+        self._id_torneo = 0
+        self._id_equipo = 0
+
+    # --- Carga ---
+
+    def generar(self) -> dict:
+        """Genera todo y retorna la cantidad de filas por tabla"""
+        if self.conn.execute("SELECT EXISTS (SELECT 1 FROM cliente)").fetchone()[0]:
+            raise ValueError("La base ya tiene datos: el generador necesita una base vacía")
+
+        recrear = self._quitar_indices_y_triggers()
+        escritor = threading.Thread(target=self._escribir, name="generador-escritor")
+        escritor.start()
+        try:
+            self._generar_clientes()
+            self._generar_canchas()
+            self._generar_agenda()
+        finally:
+            self._lotes.put(None)
+            escritor.join()
+        if self._error:
+            raise self._error
+        self._generar_pagos_reservas()
+
+        self.conn.execute("BEGIN")
+        for sql in recrear:
+            self.conn.execute(sql)
+        reconstruir_resumen_diario(self.conn)
+        self.conn.commit()
+        self.conn.execute("ANALYZE")
+        return dict(self.conteo)
+
+    def _quitar_indices_y_triggers(self):
+        """Elimina índices y triggers de las tablas a cargar y retorna su SQL para recrearlos"""
+        marcas = ",".join("?" * len(_TABLAS))
+        objetos = self.conn.execute(f"""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({marcas})
+            ORDER BY type, name
+        """, _TABLAS).fetchall()
+        self.conn.execute("BEGIN")
+        for tipo, nombre, _ in objetos:
+            self.conn.execute(f"DROP {tipo.upper()} {nombre}")
+        self.conn.commit()
+        return [sql for _, _, sql in objetos]
+
+    def _volcar(self):
+        """Entrega lo acumulado al hilo escritor y empieza un lote nuevo"""
+        if self._error:
+            raise self._error
+        self._lotes.put(self._pendientes)
+        self._pendientes = {tabla: [] for tabla in _TABLAS}
+
+    def _escribir(self):
+        """Hilo escritor: inserta cada lote en una transacción"""
+        while True:
+            lote = self._lotes.get()
+            if lote is None:
+                return
+            if self._error:
+                continue  # Solo se vacía la cola para no bloquear al generador
+            try:
+                self.conn.execute("BEGIN")
+                for tabla in _TABLAS:
+                    if lote[tabla]:
+                        self.conn.executemany(_INSERTAR[tabla], lote[tabla])
+                        self.conteo[tabla] += len(lote[tabla])
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self._error = e
+
+    # --- Clientes y canchas ---
+
+    def _generar_clientes(self):
+        azar = self.azar
+        dnis = azar.sample(range(10_000_000, 46_000_000), self.cantidad_clientes)
+        filas = self._pendientes['cliente']
+        for i, dni in enumerate(dnis, start=1):
+            nombre, apellido = azar.choice(NOMBRES), azar.choice(APELLIDOS)
+            filas.append((
+                i, nombre, apellido, str(dni), f"351-{azar.randint(1000000, 9999999)}",
+                f"cliente{i}@correo.com", 'inactivo' if azar.random() < 0.05 else 'activo'
+            ))
+        self._volcar()
+
+    def _generar_canchas(self):
+        azar = self.azar
+        deportes = list(DEPORTES)
+        pesos = [DEPORTES[d][0] for d in deportes]
+        filas = self._pendientes['cancha']
+        for i in range(1, self.cantidad_canchas + 1):
+            deporte = azar.choices(deportes, pesos)[0]
+            _, superficies, capacidad, precio = DEPORTES[deporte]
+            precio_dia = round(precio * azar.uniform(0.8, 1.25) / 500) * 500
+            precio_noche = round(precio_dia * 1.3 / 500) * 500
+            iluminacion = 1 if azar.random() < 0.85 else 0
+            estado = azar.choices(('disponible', 'mantenimiento', 'no_disponible'), (95, 3, 2))[0]
+            filas.append((i, f"Cancha {i}", deporte, azar.choice(superficies),
+                          1 if azar.random() < 0.3 else 0, iluminacion, capacidad,
+                          float(precio_dia), float(precio_noche), estado))
+            self.canchas.append((i, deporte, iluminacion, float(precio_dia), float(precio_noche)))
+
+    def _cliente(self):
+        """Cliente al azar con sesgo: pocos clientes concentran muchas reservas"""
+        return 1 + int(self.cantidad_clientes * self.azar.random() ** 3)
+
+    # --- Reservas, pagos y torneos ---
+
+    def _generar_agenda(self):
+        """Recorre los días en orden; vuelca a la base cada `lote` reservas"""
+        dia = self.hoy - timedelta(days=365 * self.anios)
+        fin = self.hoy + timedelta(days=self.dias_futuros)
+        while dia <= fin:
+            bloqueos = self._generar_torneos(dia)
+            self._generar_dia(dia, bloqueos)
+            if len(self._pendientes['reserva']) >= self.lote:
+                self._volcar()
+            dia += timedelta(days=1)
+        self._volcar()
+
+    def _generar_dia(self, dia, bloqueos):
+        """Turnos de todas las canchas en un día, sin solapamientos por construcción"""
+        # Es el camino caliente: se usa random() directo en lugar de
+        # randint/choice, que cuestan varias veces más por llamada
+        aleatorio = self.azar.random
+        fecha = dia.isoformat()
+        pasado = dia < self.hoy
+        escala = self.ocupacion * DEMANDA_DIA[dia.weekday()]
+        demanda = {h: p * escala for h, p in DEMANDA_HORA.items()}
+        creaciones = [(dia - timedelta(days=d)).isoformat() for d in range(ANTICIPACION_MAXIMA + 1)]
+        reservas = self._pendientes['reserva']
+
+        for id_cancha, _, iluminacion, precio_dia, precio_noche in self.canchas:
+            bloqueo = bloqueos.get(id_cancha)
+            minuto = APERTURA
+            while minuto < CIERRE:
+                if bloqueo and bloqueo[0] <= minuto < bloqueo[1]:
+                    minuto = bloqueo[1]
+                    continue
+                hora = minuto // 60
+                if aleatorio() >= demanda[hora]:
+                    minuto += 30
+                    continue
+
+                r = aleatorio()
+                duracion = next(d for limite, d in DURACIONES if r < limite)
+                fin = min(minuto + duracion, CIERRE)
+                if bloqueo and minuto < bloqueo[0] < fin:
+                    fin = bloqueo[0]
+                if fin - minuto < 60:
+                    minuto += 30
+                    continue
+
+                horas = (fin - minuto) / 60
+                noche = hora >= HORA_NOCHE
+                usa_iluminacion = 1 if noche and iluminacion else 0
+                monto = (precio_noche if noche else precio_dia) * horas
+                if usa_iluminacion:
+                    monto += RECARGO_ILUMINACION * horas
+
+                self._id_reserva += 1
+                creacion = creaciones[int(aleatorio() * len(creaciones))]
+                estado = self._estado_reserva(pasado)
+                pagado = self._monto_pagado(estado, monto)
+                reservas.append((
+                    self._id_reserva, self._cliente(), id_cancha, fecha, _HORAS[minuto // 30],
+                    _HORAS[fin // 30], usa_iluminacion, estado, monto,
+                    f"{creacion} {_HORAS_CREACION[int(aleatorio() * len(_HORAS_CREACION))]}",
+                    None, None, minuto, fin, pagado
+                ))
+                minuto = fin
+
+    def _estado_reserva(self, pasado):
+        r = self.azar.random()
+        if pasado:
+            return 'completada' if r < 0.88 else 'cancelada'
+        if r < 0.45:
+            return 'pendiente'
+        return 'confirmada' if r < 0.9 else 'cancelada'
+
+    def _monto_pagado(self, estado, monto):
+        """
+        Total pagado de una reserva según su estado: las completadas y
+        confirmadas están saldadas, algunas pendientes y canceladas dejaron
+        una seña. Los pagos en sí los arma _generar_pagos_reservas.
+        """
+        aleatorio = self.azar.random
+        if estado in ('completada', 'confirmada'):
+            return monto
+        if aleatorio() < (0.35 if estado == 'pendiente' else 0.2):
+            return round(monto * (0.3 if aleatorio() < 0.5 else 0.5), 2)
+        return 0.0
+
+    def _generar_pagos_reservas(self):
+        """
+        Inserta los pagos de las reservas desde la propia base, a partir de
+        monto_pagado: una seña o un saldo total es un pago al reservar; en el
+        30% de las completadas, seña del 50% al reservar y el resto el día
+        del turno. La partición y el método salen de un hash de
+        id_reserva y la semilla, así que también son reproducibles. Es varias
+        veces más rápido que generar y enlazar millones de filas en Python.
+        """
+        mezcla = "((r.id_reserva + :semilla) * 2654435761 % 1000)"
+        en_dos = f"(r.estado_reserva = 'completada' AND {mezcla} < 300)"
+        metodos = " ".join(f"WHEN {i} THEN '{m}'" for i, m in enumerate(METODOS_PAGO))
+        self.conn.execute("BEGIN")
+        cursor = self.conn.execute(f"""
+            INSERT INTO pago (id_reserva, monto, fecha_pago, metodo_pago)
+            WITH cuota(n) AS (VALUES (1), (2))
+            SELECT r.id_reserva,
+                   CASE WHEN NOT {en_dos} THEN r.monto_pagado
+                        WHEN c.n = 1 THEN round(r.monto_pagado * 0.5, 2)
+                        ELSE r.monto_pagado - round(r.monto_pagado * 0.5, 2)
+                   END,
+                   CASE c.n WHEN 1 THEN substr(r.fecha_creacion, 1, 10) ELSE r.fecha_reserva END,
+                   CASE ({mezcla} + c.n) % {len(METODOS_PAGO)} {metodos} END
+            FROM reserva r CROSS JOIN cuota c
+            WHERE r.monto_pagado > 0 AND (c.n = 1 OR {en_dos})
+        """, {'semilla': self.semilla})
+        self.conteo['pago'] += cursor.rowcount
+        self.conn.commit()
+
+    def _metodo_pago(self):
+        return METODOS_PAGO[int(self.azar.random() * len(METODOS_PAGO))]
+
+    def _generar_torneos(self, dia):
+        """
+        Torneos del día (sobre todo en fin de semana) con sus reservas de
+        cancha, equipos y partidos. Retorna {id_cancha: (inicio, fin)} con
+        las franjas que ocupan.
+        """
+        azar = self.azar
+        probabilidad = self.torneos_por_mes / 30 * (2.5 if dia.weekday() >= 5 else 0.4)
+        bloqueos = {}
+        while azar.random() < probabilidad and len(bloqueos) < len(self.canchas):
+            probabilidad /= 2
+            deporte = azar.choice(self.canchas)[1]
+            libres = [c for c in self.canchas if c[1] == deporte and c[0] not in bloqueos]
+            if len(libres) < 2:
+                continue
+            elegidas = azar.sample(libres, min(len(libres), azar.randint(2, 4)))
+            inicio = azar.choice((9, 10, 14, 15)) * 60
+            fin = inicio + azar.choice((3, 4)) * 60
+            for cancha in elegidas:
+                bloqueos[cancha[0]] = (inicio, fin)
+            self._agregar_torneo(dia, deporte, elegidas, inicio, fin)
+        return bloqueos
+
+    def _agregar_torneo(self, dia, deporte, canchas, inicio, fin):
+        azar = self.azar
+        fecha = dia.isoformat()
+        pasado = dia < self.hoy
+        self._id_torneo += 1
+        id_torneo = self._id_torneo
+        horas = (fin - inicio) // 60
+        precio = round(sum(c[3] for c in canchas) * horas * 0.9, 2)
+        cancelado = azar.random() < 0.05
+        estado = 'cancelado' if cancelado else ('finalizado' if pasado else 'confirmado')
+
+        pagado = 0.0
+        if not cancelado and (pasado or azar.random() < 0.5):
+            pagado = precio if pasado else round(precio * 0.5, 2)
+            self._pendientes['pago'].append((None, id_torneo, pagado, fecha, self._metodo_pago()))
+        self._pendientes['torneo'].append((
+            id_torneo, f"Torneo {deporte} #{id_torneo}", deporte, fecha, _HORAS[inicio // 30],
+            _HORAS[fin // 30], len(canchas), precio, estado, self._cliente(), pagado
+        ))
+
+        # Una reserva de bloqueo por cancha (el precio va en el torneo)
+        reservas = []
+        for cancha in canchas:
+            self._id_reserva += 1
+            reservas.append(self._id_reserva)
+            self._pendientes['reserva'].append((
+                self._id_reserva, self._cliente(), cancha[0], fecha, _HORAS[inicio // 30],
+                _HORAS[fin // 30], 0, 'cancelada' if cancelado else 'confirmada', 0.0,
+                f"{(dia - timedelta(days=20)).isoformat()} 12:00:00",
+                f"Bloqueada por Torneo: Torneo {deporte} #{id_torneo}", id_torneo, inicio, fin, 0.0
+            ))
+
+        # Equipos y un partido por hora y cancha, todos contra todos
+        equipos = []
+        for n in range(1, azar.choice((4, 6, 8)) + 1):
+            self._id_equipo += 1
+            equipos.append(self._id_equipo)
+            self._pendientes['equipo'].append((
+                self._id_equipo, id_torneo, f"Equipo {n}", f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}",
+                f"351-{azar.randint(1000000, 9999999)}", (dia - timedelta(days=azar.randint(7, 30))).isoformat()
+            ))
+        cruces = [(a, b) for i, a in enumerate(equipos) for b in equipos[i + 1:]]
+        azar.shuffle(cruces)
+        for turno, (local, visitante) in enumerate(cruces[:horas * len(canchas)]):
+            hora, indice_cancha = divmod(turno, len(canchas))
+            jugado = pasado and not cancelado
+            self._pendientes['partido'].append((
+                id_torneo, local, visitante, reservas[indice_cancha], fecha,
+                _HORAS[(inicio + hora * 60) // 30],
+                azar.randint(0, 5) if jugado else None, azar.randint(0, 5) if jugado else None,
+                'jugado' if jugado else ('suspendido' if cancelado else 'programado')
+            ))
+
+
+def generar_base(ruta, **opciones) -> dict:
+    """
+    Crea (o completa, si está vacía) la base en `ruta`, la migra y la llena.
+    Las opciones son las de GeneradorDatos. Retorna la cantidad de filas por tabla.
+    """
+    conn = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+    try:
+        aplicar_migraciones(conn)
+        # Base nueva: sin journal durante la carga; si falla se vuelve a generar
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-200000")
+        conteo = GeneradorDatos(conn, **opciones).generar()
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conteo
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una base con datos sintéticos")
+    parser.add_argument('--db', required=True, help="Archivo de base de datos a crear")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--clientes', type=int, default=20000)
+    parser.add_argument('--canchas', type=int, default=200)
+    parser.add_argument('--anios', type=int, default=3)
+    parser.add_argument('--dias-futuros', type=int, default=30)
+    parser.add_argument('--ocupacion', type=float, default=0.8)
+    parser.add_argument('--torneos-por-mes', type=float, default=4)
+    parser.add_argument('--hoy', type=date.fromisoformat, help="Fecha de referencia AAAA-MM-DD (por defecto hoy)")
+    opciones = vars(parser.parse_args(argv))
+    ruta = opciones.pop('db')
+
+    if os.path.exists(ruta):
+        print(f"✗ {ruta} ya existe; elija un archivo nuevo")
+        return 1
+    inicio = reloj.perf_counter()
+    conteo = generar_base(ruta, **opciones)
+    print(f"✓ Base generada en {reloj.perf_counter() - inicio:.1f} s: {ruta}")
+    for tabla, cantidad in conteo.items():
+        print(f"   {tabla}: {cantidad:,}")
+    print(f"   total: {sum(conteo.values()):,} filas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
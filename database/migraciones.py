@@ -0,0 +1,446 @@
+"""
+Migraciones versionadas del esquema de base de datos.
+
+La versión aplicada se guarda en PRAGMA user_version. Al iniciar solo se
+ejecutan las migraciones con número mayor a esa versión, todas dentro de
+una única transacción; si la base ya está al día no se ejecuta nada.
+
+Para cambiar el esquema se agrega una migración nueva al final de
+MIGRACIONES (nunca se modifica una ya publicada).
+"""
+
+import os
+import sqlite3
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+
+
+def _ejecutar_script(conn, script):
+    """
+    Ejecuta un script SQL sentencia por sentencia.
+    A diferencia de executescript(), no hace commit implícito, por lo que
+    el script participa de la transacción en curso.
+    """
+    sentencia = ""
+    for linea in script.splitlines(keepends=True):
+        sentencia += linea
+        if sqlite3.complete_statement(sentencia):
+            conn.execute(sentencia)
+            sentencia = ""
+    if sentencia.strip():
+        conn.execute(sentencia)
+
+
+def _columnas(conn, tabla):
+    """Retorna el conjunto de columnas de una tabla"""
+    return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({tabla})")}
+
+
+def _esquema_inicial(conn):
+    """Crea las tablas e índices base definidos en schema.sql"""
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        _ejecutar_script(conn, f.read())
+
+
+def _columnas_agregadas(conn):
+    """
+    Agrega las columnas que se incorporaron después de las primeras
+    versiones del esquema, para bases creadas antes de que existieran.
+    """
+    columnas_reserva = _columnas(conn, 'reserva')
+    if 'id_torneo' not in columnas_reserva:
+        conn.execute("ALTER TABLE reserva ADD COLUMN id_torneo INTEGER REFERENCES torneo(id_torneo)")
+
+    if 'id_cliente' not in _columnas(conn, 'torneo'):
+        conn.execute("ALTER TABLE torneo ADD COLUMN id_cliente INTEGER REFERENCES cliente(id_cliente)")
+
+    if 'id_torneo' not in _columnas(conn, 'pago'):
+        conn.execute("ALTER TABLE pago ADD COLUMN id_torneo INTEGER REFERENCES torneo(id_torneo)")
+
+    columnas_cancha = _columnas(conn, 'cancha')
+    if 'tipo_superficie' not in columnas_cancha:
+        conn.execute("ALTER TABLE cancha ADD COLUMN tipo_superficie TEXT DEFAULT 'Sintético'")
+    if 'capacidad_jugadores' not in columnas_cancha:
+        conn.execute("ALTER TABLE cancha ADD COLUMN capacidad_jugadores INTEGER DEFAULT 5")
+    if 'estado' not in columnas_cancha:
+        conn.execute("ALTER TABLE cancha ADD COLUMN estado TEXT DEFAULT 'disponible'")
+    if 'precio_hora_dia' not in columnas_cancha:
+        conn.execute("ALTER TABLE cancha ADD COLUMN precio_hora_dia REAL DEFAULT 0")
+        conn.execute("ALTER TABLE cancha ADD COLUMN precio_hora_noche REAL DEFAULT 0")
+        # Los esquemas viejos tenían un único precio por hora
+        for viejo in ('precio_hora', 'precio'):
+            if viejo in columnas_cancha:
+                conn.execute(f"UPDATE cancha SET precio_hora_dia = {viejo}, precio_hora_noche = {viejo}")
+                break
+
+
+def _minutos(columna):
+    """Expresión SQL que convierte 'HH:MM[:SS]' en minutos desde la medianoche"""
+    return (f"CAST(substr({columna}, 1, 2) AS INTEGER) * 60 + "
+            f"CAST(substr({columna}, 4, 2) AS INTEGER)")
+
+
+_MINUTOS_RESERVA = f"""
+ALTER TABLE reserva ADD COLUMN inicio_min INTEGER;
+ALTER TABLE reserva ADD COLUMN fin_min INTEGER;
+
+UPDATE reserva SET inicio_min = {_minutos('hora_inicio')}, fin_min = {_minutos('hora_fin')};
+
+-- El DAO escribe los minutos junto al texto; estos triggers cubren a
+-- cualquier otro escritor y a las modificaciones de horario.
+CREATE TRIGGER trg_reserva_minutos_ins AFTER INSERT ON reserva
+WHEN NEW.inicio_min IS NULL OR NEW.fin_min IS NULL
+BEGIN
+    UPDATE reserva
+    SET inicio_min = {_minutos('NEW.hora_inicio')}, fin_min = {_minutos('NEW.hora_fin')}
+    WHERE id_reserva = NEW.id_reserva;
+END;
+
+CREATE TRIGGER trg_reserva_minutos_upd AFTER UPDATE OF hora_inicio, hora_fin ON reserva
+BEGIN
+    UPDATE reserva
+    SET inicio_min = {_minutos('NEW.hora_inicio')}, fin_min = {_minutos('NEW.hora_fin')}
+    WHERE id_reserva = NEW.id_reserva;
+END;
+
+-- Índice de disponibilidad: una sola búsqueda por rango para detectar
+-- solapamientos. estado_reserva va al final solo para que el índice
+-- cubra la consulta completa (SQLite no lo deduce del filtro parcial).
+CREATE INDEX IF NOT EXISTS idx_reserva_disponibilidad
+ON reserva(id_cancha, fecha_reserva, inicio_min, fin_min, estado_reserva)
+WHERE estado_reserva != 'cancelada';
+"""
+
+
+# Cada índice sigue el orden de su listado; id_reserva e id_cliente (rowid)
+# completan la clave implícitamente. idx_reserva_fecha queda cubierto por
+# idx_reserva_fecha_hora.
+_INDICES_PAGINACION = """
+CREATE INDEX IF NOT EXISTS idx_reserva_fecha_hora ON reserva(fecha_reserva, hora_inicio);
+DROP INDEX IF EXISTS idx_reserva_fecha;
+CREATE INDEX IF NOT EXISTS idx_cliente_activo_apellido ON cliente(estado, apellido, nombre);
+"""
+
+
+# --- Resumen diario ---
+# Una fila por (fecha, cancha) con lo que necesitan los reportes. id_cancha 0
+# agrupa lo que no pertenece a una cancha: el precio de los torneos (en su
+# fecha) y los pagos que no son de una reserva. Los triggers suman y restan
+# el aporte de cada fila de reserva, torneo y pago; reconstruir_resumen_diario
+# lo recalcula desde cero con las mismas expresiones.
+
+_COLUMNAS_RESUMEN = ('pendientes', 'confirmadas', 'canceladas', 'completadas',
+                     'minutos', 'monto_reservas', 'ingresos', 'cobrado')
+
+
+def _parte_torneo(torneo):
+    """Parte del precio de un torneo que corresponde a cada una de sus reservas"""
+    return (f"CASE WHEN {torneo}.cantidad_canchas > 0 "
+            f"THEN {torneo}.precio_total * 1.0 / {torneo}.cantidad_canchas ELSE 0 END")
+
+
+def _aporte_reserva(r, parte_torneo):
+    """
+    Valores de _COLUMNAS_RESUMEN que aporta una reserva. Las reservas de
+    torneo valen su parte del precio del torneo (`parte_torneo`) en
+    monto_reservas y no suman a ingresos (el torneo se cobra entero aparte).
+    """
+    sin_torneo = f"COALESCE({r}.id_torneo, 0) = 0"
+    activa = f"{r}.estado_reserva != 'cancelada'"
+    return (
+        f"{r}.estado_reserva = 'pendiente'",
+        f"{r}.estado_reserva = 'confirmada'",
+        f"{r}.estado_reserva = 'cancelada'",
+        f"{r}.estado_reserva = 'completada'",
+        f"CASE WHEN {activa} THEN "
+        f"({_minutos(f'{r}.hora_fin')} - ({_minutos(f'{r}.hora_inicio')}) + 1440) % 1440 ELSE 0 END",
+        f"CASE WHEN NOT ({activa}) THEN 0 WHEN {sin_torneo} THEN {r}.monto_total "
+        f"ELSE COALESCE({parte_torneo}, 0) END",
+        f"CASE WHEN {r}.estado_reserva IN ('confirmada', 'completada') AND {sin_torneo} "
+        f"THEN {r}.monto_total ELSE 0 END",
+        "0",
+    )
+
+
+def _aporte_torneo(t):
+    return ("0",) * 6 + (f"CASE WHEN {t}.estado != 'cancelado' THEN {t}.precio_total ELSE 0 END", "0")
+
+
+def _aporte_pago(p):
+    return ("0",) * 7 + (f"{p}.monto",)
+
+
+def _fecha_pago(p):
+    return f"substr({p}.fecha_pago, 1, 10)"
+
+
+def _cancha_pago(p):
+    return f"COALESCE((SELECT id_cancha FROM reserva WHERE id_reserva = {p}.id_reserva), 0)"
+
+
+def _sumar_resumen(fecha, id_cancha, valores, signo='+', origen="WHERE 1"):
+    """
+    Sentencia que suma (o resta) `valores` a la fila (fecha, id_cancha),
+    creándola si no existe. `origen` permite tomar varias filas de un
+    SELECT agrupado (debe tener WHERE para que el ON CONFLICT no se lea
+    como parte de un JOIN).
+    """
+    columnas = ", ".join(_COLUMNAS_RESUMEN)
+    suma = ", ".join(f"{signo}({v})" for v in valores)
+    actualizar = ", ".join(f"{c} = {c} + excluded.{c}" for c in _COLUMNAS_RESUMEN)
+    return (f"INSERT INTO resumen_diario (fecha, id_cancha, {columnas})\n"
+            f"    SELECT {fecha}, {id_cancha}, {suma} {origen}\n"
+            f"    ON CONFLICT (fecha, id_cancha) DO UPDATE SET {actualizar};")
+
+
+def _ajuste_parte_torneo(t, signo):
+    """Suma o resta la parte del torneo `t` en las reservas activas del torneo"""
+    valores = ("0",) * 5 + (f"COUNT(*) * ({_parte_torneo(t)})", "0", "0")
+    return _sumar_resumen(
+        "r.fecha_reserva", "r.id_cancha", valores, signo,
+        f"FROM reserva r WHERE r.id_torneo = {t}.id_torneo AND r.estado_reserva != 'cancelada' "
+        f"GROUP BY r.fecha_reserva, r.id_cancha")
+
+
+def _mover_cobrado(id_cancha, signo):
+    """Suma o resta los pagos de NEW.id_reserva en la cancha indicada"""
+    valores = ("0",) * 7 + ("SUM(p.monto)",)
+    return _sumar_resumen(
+        _fecha_pago('p'), id_cancha, valores, signo,
+        f"FROM pago p WHERE p.id_reserva = NEW.id_reserva GROUP BY {_fecha_pago('p')}")
+
+
+_COLUMNAS_RESERVA_RESUMEN = ("fecha_reserva, id_cancha, hora_inicio, hora_fin, "
+                             "estado_reserva, monto_total, id_torneo")
+_PARTE_TORNEO_DE = ("(SELECT " + _parte_torneo('t') + " FROM torneo t WHERE t.id_torneo = {r}.id_torneo)")
+
+
+def _aporte_reserva_trigger(r):
+    return _aporte_reserva(r, _PARTE_TORNEO_DE.format(r=r))
+
+
+_RESUMEN_DIARIO = f"""
+CREATE TABLE IF NOT EXISTS resumen_diario (
+    fecha TEXT NOT NULL,
+    id_cancha INTEGER NOT NULL,          -- 0: torneos y pagos sin reserva
+    pendientes INTEGER NOT NULL DEFAULT 0,
+    confirmadas INTEGER NOT NULL DEFAULT 0,
+    canceladas INTEGER NOT NULL DEFAULT 0,
+    completadas INTEGER NOT NULL DEFAULT 0,
+    minutos INTEGER NOT NULL DEFAULT 0,       -- Reservados (no cancelados)
+    monto_reservas REAL NOT NULL DEFAULT 0,   -- Reservas no canceladas, torneos prorrateados
+    ingresos REAL NOT NULL DEFAULT 0,         -- Reservas confirmadas/completadas sin torneo + torneos
+    cobrado REAL NOT NULL DEFAULT 0,          -- Pagos registrados en la fecha
+    PRIMARY KEY (fecha, id_cancha)
+) WITHOUT ROWID;
+
+CREATE TRIGGER trg_resumen_reserva_ins AFTER INSERT ON reserva
+BEGIN
+    {_sumar_resumen('NEW.fecha_reserva', 'NEW.id_cancha', _aporte_reserva_trigger('NEW'))}
+END;
+
+CREATE TRIGGER trg_resumen_reserva_upd AFTER UPDATE OF {_COLUMNAS_RESERVA_RESUMEN} ON reserva
+BEGIN
+    {_sumar_resumen('OLD.fecha_reserva', 'OLD.id_cancha', _aporte_reserva_trigger('OLD'), '-')}
+    {_sumar_resumen('NEW.fecha_reserva', 'NEW.id_cancha', _aporte_reserva_trigger('NEW'))}
+END;
+
+CREATE TRIGGER trg_resumen_reserva_cancha AFTER UPDATE OF id_cancha ON reserva
+WHEN OLD.id_cancha != NEW.id_cancha
+BEGIN
+    {_mover_cobrado('OLD.id_cancha', '-')}
+    {_mover_cobrado('NEW.id_cancha', '+')}
+END;
+
+CREATE TRIGGER trg_resumen_reserva_del AFTER DELETE ON reserva
+BEGIN
+    {_sumar_resumen('OLD.fecha_reserva', 'OLD.id_cancha', _aporte_reserva_trigger('OLD'), '-')}
+END;
+
+CREATE TRIGGER trg_resumen_torneo_ins AFTER INSERT ON torneo
+BEGIN
+    {_sumar_resumen('NEW.fecha', '0', _aporte_torneo('NEW'))}
+END;
+
+CREATE TRIGGER trg_resumen_torneo_upd AFTER UPDATE OF fecha, precio_total, cantidad_canchas, estado ON torneo
+BEGIN
+    {_sumar_resumen('OLD.fecha', '0', _aporte_torneo('OLD'), '-')}
+    {_sumar_resumen('NEW.fecha', '0', _aporte_torneo('NEW'))}
+    {_ajuste_parte_torneo('OLD', '-')}
+    {_ajuste_parte_torneo('NEW', '+')}
+END;
+
+CREATE TRIGGER trg_resumen_torneo_del AFTER DELETE ON torneo
+BEGIN
+    {_sumar_resumen('OLD.fecha', '0', _aporte_torneo('OLD'), '-')}
+    {_ajuste_parte_torneo('OLD', '-')}
+END;
+
+CREATE TRIGGER trg_resumen_pago_ins AFTER INSERT ON pago
+BEGIN
+    {_sumar_resumen(_fecha_pago('NEW'), _cancha_pago('NEW'), _aporte_pago('NEW'))}
+END;
+
+CREATE TRIGGER trg_resumen_pago_upd AFTER UPDATE OF id_reserva, monto, fecha_pago ON pago
+BEGIN
+    {_sumar_resumen(_fecha_pago('OLD'), _cancha_pago('OLD'), _aporte_pago('OLD'), '-')}
+    {_sumar_resumen(_fecha_pago('NEW'), _cancha_pago('NEW'), _aporte_pago('NEW'))}
+END;
+
+CREATE TRIGGER trg_resumen_pago_del AFTER DELETE ON pago
+BEGIN
+    {_sumar_resumen(_fecha_pago('OLD'), _cancha_pago('OLD'), _aporte_pago('OLD'), '-')}
+END;
+"""
+
+
+def reconstruir_resumen_diario(conn):
+    """
+    Recalcula resumen_diario desde reserva, torneo y pago.
+    No hace commit: corre dentro de la transacción del llamador.
+    """
+    columnas = ", ".join(_COLUMNAS_RESUMEN)
+    sumas = ", ".join(f"SUM({c})" for c in _COLUMNAS_RESUMEN)
+
+    def select(fecha, id_cancha, valores, origen):
+        alias = ", ".join(f"{v} AS {c}" for v, c in zip(valores, _COLUMNAS_RESUMEN))
+        return f"SELECT {fecha} AS fecha, {id_cancha} AS id_cancha, {alias} {origen}"
+
+    aportes = " UNION ALL ".join([
+        select("r.fecha_reserva", "r.id_cancha", _aporte_reserva('r', _parte_torneo('t')),
+               "FROM reserva r LEFT JOIN torneo t ON t.id_torneo = r.id_torneo"),
+        select("t.fecha", "0", _aporte_torneo('t'), "FROM torneo t"),
+        select(_fecha_pago('p'), "COALESCE(r.id_cancha, 0)", _aporte_pago('p'),
+               "FROM pago p LEFT JOIN reserva r ON r.id_reserva = p.id_reserva"),
+    ])
+    conn.execute("DELETE FROM resumen_diario")
+    conn.execute(f"""
+        INSERT INTO resumen_diario (fecha, id_cancha, {columnas})
+        SELECT fecha, id_cancha, {sumas} FROM ({aportes})
+        GROUP BY fecha, id_cancha
+    """)
+
+
+def _resumen_diario(conn):
+    """Crea resumen_diario con sus triggers y lo carga con los datos existentes"""
+    _ejecutar_script(conn, _RESUMEN_DIARIO)
+    reconstruir_resumen_diario(conn)
+
+
+# Total pagado por reserva y por torneo, mantenido por PagoDAO.insertar en
+# la misma transacción que el pago. El índice parcial recorre solo las
+# reservas con saldo pendiente.
+_MONTO_PAGADO = """
+ALTER TABLE reserva ADD COLUMN monto_pagado REAL NOT NULL DEFAULT 0;
+ALTER TABLE torneo ADD COLUMN monto_pagado REAL NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_pago_torneo ON pago(id_torneo) WHERE id_torneo IS NOT NULL;
+
+UPDATE reserva
+SET monto_pagado = (SELECT SUM(p.monto) FROM pago p WHERE p.id_reserva = reserva.id_reserva)
+WHERE id_reserva IN (SELECT id_reserva FROM pago);
+
+UPDATE torneo
+SET monto_pagado = (SELECT SUM(p.monto) FROM pago p WHERE p.id_torneo = torneo.id_torneo)
+WHERE id_torneo IN (SELECT id_torneo FROM pago);
+
+CREATE INDEX IF NOT EXISTS idx_reserva_con_saldo ON reserva(fecha_reserva)
+WHERE monto_total > monto_pagado AND estado_reserva != 'cancelada';
+"""
+
+
+# Rechazo de solapamientos en la propia base: vale para cualquier escritor
+# (otro proceso, otra terminal, un script) y no solo para el que verifica
+# antes de insertar. Las modificaciones solo se controlan si cambian el
+# turno o reactivan una reserva cancelada, para no bloquear cambios de
+# estado sobre datos viejos que ya se solapaban.
+def _hay_solapamiento(r):
+    return f"""EXISTS (
+        SELECT 1 FROM reserva o
+        WHERE o.id_cancha = {r}.id_cancha
+          AND o.fecha_reserva = {r}.fecha_reserva
+          AND o.estado_reserva != 'cancelada'
+          AND o.inicio_min < {_minutos(f'{r}.hora_fin')}
+          AND o.fin_min > {_minutos(f'{r}.hora_inicio')}
+          AND o.id_reserva IS NOT {r}.id_reserva
+    )"""
+
+
+_SIN_SOLAPAMIENTOS = f"""
+CREATE TRIGGER trg_reserva_solapamiento_ins BEFORE INSERT ON reserva
+WHEN NEW.estado_reserva != 'cancelada'
+BEGIN
+    SELECT RAISE(ABORT, 'Horario ocupado: la cancha ya está reservada en ese horario')
+    WHERE {_hay_solapamiento('NEW')};
+END;
+
+CREATE TRIGGER trg_reserva_solapamiento_upd
+BEFORE UPDATE OF id_cancha, fecha_reserva, hora_inicio, hora_fin, estado_reserva ON reserva
+WHEN NEW.estado_reserva != 'cancelada'
+ AND (OLD.estado_reserva = 'cancelada'
+      OR NEW.id_cancha IS NOT OLD.id_cancha
+      OR NEW.fecha_reserva IS NOT OLD.fecha_reserva
+      OR NEW.hora_inicio IS NOT OLD.hora_inicio
+      OR NEW.hora_fin IS NOT OLD.hora_fin)
+BEGIN
+    SELECT RAISE(ABORT, 'Horario ocupado: la cancha ya está reservada en ese horario')
+    WHERE {_hay_solapamiento('NEW')};
+END;
+"""
+
+
+# (número, descripción, migración). La migración puede ser un script SQL
+# o una función que recibe la conexión.
+MIGRACIONES = [
+    (1, "Esquema inicial", _esquema_inicial),
+    (2, "Columnas agregadas después del esquema inicial", _columnas_agregadas),
+    (3, "Horarios de reserva en minutos e índice de disponibilidad", _MINUTOS_RESERVA),
+    (4, "Índice del listado de reservas por estado",
+     "CREATE INDEX IF NOT EXISTS idx_reserva_estado_fecha "
+     "ON reserva(estado_reserva, fecha_reserva, hora_inicio);"),
+    (5, "Índices para la paginación por keyset", _INDICES_PAGINACION),
+    (6, "Resumen diario por cancha para reportes", _resumen_diario),
+    # Parcial: la mayoría de las reservas no pertenecen a un torneo
+    (7, "Índice de reservas por torneo",
+     "CREATE INDEX IF NOT EXISTS idx_reserva_torneo "
+     "ON reserva(id_torneo) WHERE id_torneo IS NOT NULL;"),
+    (8, "Total pagado por reserva y por torneo", _MONTO_PAGADO),
+    (9, "Triggers que rechazan reservas solapadas", _SIN_SOLAPAMIENTOS),
+]
+
+VERSION_ACTUAL = MIGRACIONES[-1][0]
+
+
+def obtener_version(conn) -> int:
+    """Retorna la versión de esquema registrada en la base"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migraciones(conn) -> int:
+    """
+    Aplica las migraciones pendientes en una sola transacción.
+
+    Returns:
+        int: Cantidad de migraciones aplicadas (0 si el esquema ya estaba al día)
+    """
+    if obtener_version(conn) >= VERSION_ACTUAL:
+        return 0
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Releer dentro del bloqueo: otro proceso pudo haber migrado primero
+        version = obtener_version(conn)
+        pendientes = [m for m in MIGRACIONES if m[0] > version]
+
+        for numero, descripcion, migracion in pendientes:
+            if callable(migracion):
+                migracion(conn)
+            else:
+                _ejecutar_script(conn, migracion)
+
+        conn.execute(f"PRAGMA user_version = {VERSION_ACTUAL}")
+        conn.commit()
+        return len(pendientes)
+    except Exception:
+        conn.rollback()
+        raise
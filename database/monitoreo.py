@@ -0,0 +1,234 @@
+"""
+Instrumentación de las consultas a la base de datos.
+
+Toda conexión del pool usa CursorMonitoreado, así que cada sentencia que
+ejecutan los DAO (por cursor, conn.execute, execute_query o execute_update)
+queda registrada en `monitor_consultas`, agrupada por su texto SQL:
+cantidad de ejecuciones, errores, tiempo total y máximo, y filas devueltas
+(o afectadas, en escrituras). El tiempo de una consulta incluye el de leer
+sus filas con fetchone/fetchmany/fetchall.
+
+Las ejecuciones que superan DB_UMBRAL_LENTA_MS van además al registro de
+consultas lentas, con sus parámetros y su EXPLAIN QUERY PLAN. Una misma
+sentencia repetida cientos de veces con distintos ids en el ranking por
+cantidad es la marca de un patrón N+1.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from config import DB_MONITOREO, DB_UMBRAL_LENTA_MS, DB_MAX_CONSULTAS_LENTAS
+
+_ESPACIOS = re.compile(r"\s+")
+# Sentencias a las que se les puede pedir el plan (no PRAGMA, BEGIN, etc.)
+_CON_PLAN = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class EstadisticaSentencia:
+    """Acumulado de una sentencia SQL"""
+
+    __slots__ = ('ejecuciones', 'errores', 'segundos', 'maximo', 'filas')
+
+    def __init__(self):
+        self.ejecuciones = 0
+        self.errores = 0
+        self.segundos = 0.0
+        self.maximo = 0.0
+        self.filas = 0
+
+    def to_dict(self):
+        return {
+            'ejecuciones': self.ejecuciones,
+            'errores': self.errores,
+            'total_ms': round(self.segundos * 1000, 3),
+            'promedio_ms': round(self.segundos * 1000 / self.ejecuciones, 3) if self.ejecuciones else 0.0,
+            'max_ms': round(self.maximo * 1000, 3),
+            'filas': self.filas
+        }
+
+
+class MonitorConsultas:
+    """Estadísticas por sentencia y registro de consultas lentas del proceso"""
+
+    def __init__(self, umbral_ms=DB_UMBRAL_LENTA_MS, max_lentas=DB_MAX_CONSULTAS_LENTAS,
+                 activo=DB_MONITOREO):
+        self.activo = activo
+        self.umbral = umbral_ms / 1000
+        self._sentencias = {}  # SQL normalizado -> EstadisticaSentencia
+        self._lentas = deque(maxlen=max_lentas)
+        self._lock = threading.Lock()
+        self._desde = datetime.now()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def normalizar(sql):
+        """Texto de la sentencia en una línea (agrupa la misma consulta escrita con otro formato)"""
+        return _ESPACIOS.sub(" ", sql).strip()
+
+    def registrar(self, sql, segundos, acumulado, filas=0, nueva=True, error=False):
+        """
+        Suma una ejecución (nueva=True) o las filas leídas después
+        (nueva=False, misma ejecución). `segundos` es el tiempo de este
+        tramo y `acumulado` el de la ejecución completa hasta ahora.
+        """
+        with self._lock:
+            estadistica = self._sentencias.get(sql)
+            if estadistica is None:
+                estadistica = self._sentencias[sql] = EstadisticaSentencia()
+            if nueva:
+                estadistica.ejecuciones += 1
+            if error:
+                estadistica.errores += 1
+            estadistica.segundos += segundos
+            estadistica.filas += filas
+            if acumulado > estadistica.maximo:
+                estadistica.maximo = acumulado
+
+    def registrar_lenta(self, conn, sql, params, segundos, filas, explicar=True):
+        """Guarda una ejecución lenta con su plan (si se puede obtener)"""
+        plan = None
+        if explicar and sql[:7].upper().startswith(_CON_PLAN):
+            try:
+                # Cursor sin instrumentar: el EXPLAIN no debe contarse
+                filas_plan = sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+                plan = [fila[-1] for fila in filas_plan]
+            except sqlite3.Error as e:
+                plan = [f"(sin plan: {e})"]
+        with self._lock:
+            self._lentas.append({
+                'momento': datetime.now().isoformat(timespec='seconds'),
+                'hilo': threading.current_thread().name,
+                'sql': sql,
+                'parametros': _serializable(params),
+                'ms': round(segundos * 1000, 3),
+                'filas': filas,
+                'plan': plan
+            })
+
+    def snapshot(self, orden='total_ms', limite=None):
+        """
+        Estado actual: sentencias ordenadas de mayor a menor según `orden`
+        ('total_ms', 'ejecuciones', 'max_ms', 'filas'...) y consultas lentas
+        (la más reciente al final)
+        """
+        with self._lock:
+            sentencias = [dict(sql=sql, **e.to_dict()) for sql, e in self._sentencias.items()]
+            lentas = list(self._lentas)
+        sentencias.sort(key=lambda s: s[orden], reverse=True)
+        return {
+            'desde': self._desde.isoformat(timespec='seconds'),
+            'hasta': datetime.now().isoformat(timespec='seconds'),
+            'umbral_lenta_ms': round(self.umbral * 1000, 3),
+            'sentencias': sentencias[:limite] if limite else sentencias,
+            'lentas': lentas
+        }
+
+    def volcar(self, ruta, **opciones):
+        """Escribe el snapshot en un archivo JSON"""
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(**opciones), f, indent=2, ensure_ascii=False)
+
+    def reiniciar(self):
+        """Descarta todo lo registrado"""
+        with self._lock:
+            self._sentencias.clear()
+            self._lentas.clear()
+            self._desde = datetime.now()
+
+
+def _serializable(params):
+    """Parámetros aptos para JSON (fechas, horas, etc. como texto)"""
+    if isinstance(params, dict):
+        return {k: _serializable(v) for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [_serializable(v) for v in params]
+    if params is None or isinstance(params, (int, float, str)):
+        return params
+    return str(params)
+
+
+monitor_consultas = MonitorConsultas()
+
+
+class CursorMonitoreado(sqlite3.Cursor):
+    """
+    Cursor que mide cada ejecución y las lecturas de sus filas. El tiempo
+    de las lecturas se suma a la última sentencia ejecutada.
+    """
+
+    _sql = None        # Sentencia en curso (normalizada)
+    _params = ()
+    _muchas = False    # La sentencia en curso es un executemany
+    _segundos = 0.0    # Tiempo acumulado de la ejecución en curso
+    _lenta = False     # Ya se registró como lenta
+
+    def execute(self, sql, params=()):
+        if not monitor_consultas.activo:
+            return super().execute(sql, params)
+        self._muchas = False
+        return self._medir(super().execute, sql, params, params)
+
+    def executemany(self, sql, secuencia):
+        if not monitor_consultas.activo:
+            return super().executemany(sql, secuencia)
+        if not isinstance(secuencia, (list, tuple)):
+            secuencia = list(secuencia)
+        self._muchas = True
+        resumen = [f"({len(secuencia)} filas)"]
+        return self._medir(super().executemany, sql, secuencia, resumen)
+
+    def _medir(self, ejecutar, sql, params, params_registro):
+        self._sql = monitor_consultas.normalizar(sql)
+        self._params = params_registro
+        self._lenta = False
+        inicio = time.perf_counter()
+        try:
+            ejecutar(sql, params)
+        except Exception:
+            self._segundos = time.perf_counter() - inicio
+            monitor_consultas.registrar(self._sql, self._segundos, self._segundos, error=True)
+            self._sql = None
+            raise
+        self._segundos = time.perf_counter() - inicio
+        # Las escrituras no devuelven filas: se cuentan las afectadas
+        filas = self.rowcount if self.description is None and self.rowcount > 0 else 0
+        monitor_consultas.registrar(self._sql, self._segundos, self._segundos, filas)
+        self._revisar_lenta(filas)
+        return self
+
+    def _leido(self, inicio, filas):
+        if self._sql is None:
+            return
+        transcurrido = time.perf_counter() - inicio
+        self._segundos += transcurrido
+        monitor_consultas.registrar(self._sql, transcurrido, self._segundos, filas, nueva=False)
+        self._revisar_lenta(filas)
+
+    def _revisar_lenta(self, filas):
+        if not self._lenta and self._segundos >= monitor_consultas.umbral:
+            self._lenta = True
+            monitor_consultas.registrar_lenta(self.connection, self._sql, self._params, self._segundos,
+                                              filas, explicar=not self._muchas)
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = super().fetchone()
+        self._leido(inicio, 1 if fila is not None else 0)
+        return fila
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        filas = super().fetchmany(self.arraysize if size is None else size)
+        self._leido(inicio, len(filas))
+        return filas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = super().fetchall()
+        self._leido(inicio, len(filas))
+        return filas
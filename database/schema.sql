@@ -1,4 +1,6 @@
 -- Esquema de Base de Datos Actualizado (Versión Final con soporte Torneos y Reglas de Negocio)
+-- Corresponde a la migración 1. Los cambios posteriores se agregan como
+-- migraciones nuevas en database/migraciones.py (no editar este archivo).
 
 CREATE TABLE IF NOT EXISTS cliente (
     id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -36,7 +36,8 @@ def main():
         print("4. Gestión de Pagos")
         print("5. Gestión de Torneos")
         print("6. Reportes")
-        print("7. Salir")
+        print("7. Estadísticas de consultas")
+        print("8. Salir")
         print("=" * 60)
         
         opcion = input("\nSeleccione una opción: ").strip()
@@ -54,6 +55,8 @@ def main():
         elif opcion == "6":
             menu_reportes()
         elif opcion == "7":
+            menu_monitoreo()
+        elif opcion == "8":
             print("\n¡Hasta luego!")
             break
         else:
@@ -189,7 +192,8 @@ def menu_reservas():
         print("3. Ver reservas de hoy")
         print("4. Confirmar reserva")
         print("5. Cancelar reserva")
-        print("6. Volver")
+        print("6. Buscar horarios libres")
+        print("7. Volver")
         print("-" * 60)
         
         opcion = input("\nSeleccione una opción: ").strip()
@@ -250,6 +254,31 @@ def menu_reservas():
             print(f"\n{'✓' if exito else '✗'} {mensaje}")
         
         elif opcion == "6":
+            print("\n--- HORARIOS LIBRES ---")
+            desde_str = input("Desde (YYYY-MM-DD): ")
+            hasta_str = input("Hasta (YYYY-MM-DD): ")
+            duracion_str = input("Duración mínima en minutos [60]: ").strip()
+            deporte = input("Deporte (vacío = todos): ").strip() or None
+            
+            from utils.helpers import parsear_fecha
+            desde = parsear_fecha(desde_str, "%Y-%m-%d")
+            hasta = parsear_fecha(hasta_str, "%Y-%m-%d")
+            
+            if desde and hasta and (not duracion_str or duracion_str.isdigit()):
+                huecos = ReservaService.buscar_horarios_libres(
+                    desde, hasta, int(duracion_str or 60), deporte
+                )
+                print(f"\n{'Fecha':<12} {'Cancha':<20} {'Deporte':<15} {'Horario':<14} {'Minutos':<8}")
+                print("-" * 72)
+                for h in huecos:
+                    horario = f"{h['hora_inicio']:%H:%M}-{h['hora_fin']:%H:%M}"
+                    print(f"{h['fecha']!s:<12} {h['cancha']:<20} {h['tipo_deporte']:<15} {horario:<14} {h['minutos']:<8}")
+                if not huecos:
+                    print("No hay horarios libres para esos criterios.")
+            else:
+                print("\n✗ Datos inválidos.")
+        
+        elif opcion == "7":
             break
         else:
             print("\n✗ Opción inválida.")
@@ -276,10 +305,101 @@ def menu_torneos():
 def menu_reportes():
     """Menú de reportes"""
     from business.reportes_service import ReportesService
+    from dao.reportes_dao import ReportesDAO
+    from datetime import date
     
-    print("\n--- REPORTES ---")
-    print("(Funcionalidad básica - extender según necesidad)")
-    input("\nPresione Enter para continuar...")
+    while True:
+        print("\n" + "-" * 60)
+        print("REPORTES")
+        print("-" * 60)
+        print("1. Ingresos mensuales del año")
+        print("2. Reconstruir resumen diario")
+        print("3. Volver")
+        print("-" * 60)
+        
+        opcion = input("\nSeleccione una opción: ").strip()
+        
+        if opcion == "1":
+            anio_str = input(f"Año [{date.today().year}]: ").strip()
+            anio = int(anio_str) if anio_str.isdigit() else date.today().year
+            ingresos = ReportesService.reporte_ingresos_mensuales(anio)
+            print(f"\n{'Mes':<6} {'Ingresos':>14}")
+            print("-" * 21)
+            for mes, monto in ingresos.items():
+                print(f"{mes:<6} {monto:>14.2f}")
+            print("-" * 21)
+            print(f"{'Total':<6} {sum(ingresos.values()):>14.2f}")
+        
+        elif opcion == "2":
+            # Los triggers lo mantienen al día; esto lo recalcula desde cero
+            if ReportesDAO.reconstruir_resumen_diario():
+                print("\n✓ Resumen diario reconstruido")
+            else:
+                print("\n✗ No se pudo reconstruir el resumen diario")
+        
+        elif opcion == "3":
+            break
+        
+        else:
+            print("\n✗ Opción inválida")
+
+
+
+def menu_monitoreo():
+    """Estadísticas de las consultas ejecutadas desde que arrancó el programa"""
+    from database.monitoreo import monitor_consultas
+    
+    while True:
+        print("\n" + "-" * 60)
+        print("ESTADÍSTICAS DE CONSULTAS")
+        print("-" * 60)
+        print("1. Sentencias con más tiempo total")
+        print("2. Sentencias más ejecutadas (posibles N+1)")
+        print("3. Consultas lentas")
+        print("4. Guardar snapshot en JSON")
+        print("5. Reiniciar estadísticas")
+        print("6. Volver")
+        print("-" * 60)
+        
+        opcion = input("\nSeleccione una opción: ").strip()
+        
+        if opcion in ("1", "2"):
+            orden = 'total_ms' if opcion == "1" else 'ejecuciones'
+            sentencias = monitor_consultas.snapshot(orden=orden, limite=15)['sentencias']
+            print(f"\n{'Ejec.':>7} {'Total ms':>10} {'Máx ms':>9} {'Filas':>8}  Sentencia")
+            print("-" * 90)
+            for s in sentencias:
+                print(f"{s['ejecuciones']:>7} {s['total_ms']:>10.1f} {s['max_ms']:>9.1f} "
+                      f"{s['filas']:>8}  {s['sql'][:50]}")
+        
+        elif opcion == "3":
+            snapshot = monitor_consultas.snapshot()
+            lentas = snapshot['lentas']
+            print(f"\n{len(lentas)} consultas de más de {snapshot['umbral_lenta_ms']} ms")
+            for lenta in lentas[-10:]:
+                print(f"\n[{lenta['momento']}] {lenta['ms']:.1f} ms, {lenta['filas']} filas ({lenta['hilo']})")
+                print(f"   {lenta['sql'][:200]}")
+                print(f"   Parámetros: {lenta['parametros']}")
+                for paso in lenta['plan'] or []:
+                    print(f"   Plan: {paso}")
+        
+        elif opcion == "4":
+            ruta = input("Archivo [monitoreo_consultas.json]: ").strip() or "monitoreo_consultas.json"
+            try:
+                monitor_consultas.volcar(ruta)
+                print(f"\n✓ Snapshot guardado en {ruta}")
+            except OSError as e:
+                print(f"\n✗ No se pudo guardar: {e}")
+        
+        elif opcion == "5":
+            monitor_consultas.reiniciar()
+            print("\n✓ Estadísticas reiniciadas")
+        
+        elif opcion == "6":
+            break
+        
+        else:
+            print("\n✗ Opción inválida")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+"""
+Campos de fecha y hora de los modelos.
+
+Las fechas y horas llegan de la base como texto ISO ('AAAA-MM-DD',
+'HH:MM[:SS]', 'AAAA-MM-DD HH:MM:SS[.ffffff]'). Un campo Diferido guarda el
+valor tal como llega y lo convierte a date/time/datetime recién la primera
+vez que se lee; la conversión queda guardada en el objeto. Así un listado
+grande no paga la conversión (ni la memoria) de los campos que nadie mira.
+
+Fechas y horas se repiten mucho (pocas fechas por año, pocas horas por día),
+por eso sus conversiones se cachean: los objetos de un mismo día o turno
+comparten el mismo date/time, que es inmutable.
+"""
+
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Callable, Optional
+
+
+@lru_cache(maxsize=8192)
+def a_fecha(valor) -> Optional[date]:
+    """'AAAA-MM-DD' -> date (None si el valor falta o no es una fecha)"""
+    if not isinstance(valor, str):
+        return valor
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def a_hora(valor) -> Optional[time]:
+    """'HH:MM' o 'HH:MM:SS' -> time (None si el valor falta o no es una hora)"""
+    if not isinstance(valor, str):
+        return valor
+    try:
+        return time.fromisoformat(valor)
+    except ValueError:
+        return None
+
+
+def a_fecha_hora(valor) -> Optional[datetime]:
+    """'AAAA-MM-DD HH:MM:SS[.ffffff]' -> datetime (None si falta o no es válida)"""
+    if not isinstance(valor, str):
+        return valor
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        return None
+
+
+class Diferido:
+    """
+    Campo que convierte su valor al leerlo, si quedó guardado como texto.
+
+    Se declara en una clase con __slots__ que tenga un slot '_<nombre>',
+    donde vive el valor (texto sin convertir o ya convertido). Si el texto
+    no se puede convertir se usa `defecto()` o None.
+    """
+
+    __slots__ = ('slot', 'convertir', 'defecto')
+
+    def __init__(self, convertir: Callable, defecto: Optional[Callable] = None):
+        self.slot = None
+        self.convertir = convertir
+        self.defecto = defecto
+
+    def __set_name__(self, duenio, nombre):
+        self.slot = duenio.__dict__['_' + nombre]
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        valor = self.slot.__get__(obj, tipo)
+        if valor.__class__ is str:
+            valor = self.convertir(valor)
+            if valor is None and self.defecto is not None:
+                valor = self.defecto()
+            self.slot.__set__(obj, valor)
+        return valor
+
+    def __set__(self, obj, valor):
+        self.slot.__set__(obj, valor)
@@ -4,6 +4,10 @@ Actualizado con atributos extendidos.
 """
 
 class Cancha:
+    __slots__ = ('id_cancha', 'nombre', 'tipo_deporte', 'tipo_superficie', 'techada',
+                 'iluminacion', 'capacidad_jugadores', 'precio_hora_dia', 'precio_hora_noche',
+                 'estado')
+
     def __init__(self, id_cancha=None, nombre="", tipo_deporte="", 
                  tipo_superficie="Sintético", techada=False, iluminacion=False, 
                  capacidad_jugadores=5, precio_hora_dia=0.0, precio_hora_noche=0.0, 
@@ -3,6 +3,7 @@ Modelo Cliente - Representa un cliente del sistema
 """
 
 from datetime import date
+from models.campos import Diferido, a_fecha
 
 
 class Cliente:
@@ -10,6 +11,12 @@ class Cliente:
     Clase que representa un cliente del complejo deportivo.
     Corresponde a la tabla 'cliente' en la base de datos.
     """
+
+    __slots__ = ('id_cliente', 'dni', 'nombre', 'apellido', 'email', 'telefono',
+                 '_fecha_registro', 'estado')
+
+    # Puede llegar como texto 'AAAA-MM-DD' (from_dict); se convierte al leerla
+    fecha_registro = Diferido(a_fecha, date.today)
     
     def __init__(self, id_cliente=None, dni='', nombre='', apellido='', 
                  email='', telefono='', fecha_registro=None, estado='activo'):
@@ -23,7 +30,7 @@ class Cliente:
             apellido (str): Apellido del cliente
             email (str): Email del cliente
             telefono (str): Teléfono de contacto
-            fecha_registro (date): Fecha de registro en el sistema
+            fecha_registro (date o str): Fecha de registro en el sistema
             estado (str): Estado del cliente ('activo' o 'inactivo')
         """
         self.id_cliente = id_cliente
@@ -1,8 +1,14 @@
 """Modelo Equipo"""
-from datetime import date, datetime
+from datetime import date
+from models.campos import Diferido, a_fecha
 
 class Equipo:
     """Clase que representa un equipo inscrito en un torneo"""
+
+    __slots__ = ('id_equipo', 'id_torneo', 'nombre_equipo', 'capitan', 'telefono_contacto',
+                 '_fecha_inscripcion')
+
+    fecha_inscripcion = Diferido(a_fecha, date.today)
     
     def __init__(self, id_equipo=None, id_torneo=None, nombre_equipo='',
                  capitan='', telefono_contacto='', fecha_inscripcion=None):
@@ -28,15 +34,11 @@ class Equipo:
     
     @staticmethod
     def from_dict(data):
-        fecha_inscripcion = data.get('fecha_inscripcion')
-        if isinstance(fecha_inscripcion, str):
-            fecha_inscripcion = datetime.strptime(fecha_inscripcion, '%Y-%m-%d').date()
-        
         return Equipo(
             id_equipo=data.get('id_equipo'),
             id_torneo=data.get('id_torneo'),
             nombre_equipo=data.get('nombre_equipo', ''),
             capitan=data.get('capitan', ''),
             telefono_contacto=data.get('telefono_contacto', ''),
-            fecha_inscripcion=fecha_inscripcion
+            fecha_inscripcion=data.get('fecha_inscripcion')
         )
\ No newline at end of file
@@ -3,8 +3,13 @@ Modelo Pago
 Actualizado: Soporta id_torneo y hace opcional id_reserva.
 """
 from datetime import date
+from models.campos import Diferido, a_fecha
 
 class Pago:
+    __slots__ = ('id_pago', 'id_reserva', 'id_torneo', 'monto', '_fecha_pago', 'metodo_pago')
+
+    fecha_pago = Diferido(a_fecha, date.today)
+
     def __init__(self, id_pago=None, id_reserva=None, id_torneo=None, 
                  monto=0.0, fecha_pago=None, metodo_pago="efectivo"):
         
@@ -1,8 +1,15 @@
 """Modelo Partido"""
-from datetime import date, time, datetime
+from models.campos import Diferido, a_fecha, a_hora
 
 class Partido:
     """Clase que representa un partido de torneo"""
+
+    __slots__ = ('id_partido', 'id_torneo', 'id_equipo_local', 'id_equipo_visitante',
+                 'id_reserva', '_fecha_partido', '_hora_inicio', 'resultado_local',
+                 'resultado_visitante', 'estado_partido')
+
+    fecha_partido = Diferido(a_fecha)
+    hora_inicio = Diferido(a_hora)
     
     def __init__(self, id_partido=None, id_torneo=None, id_equipo_local=None,
                  id_equipo_visitante=None, id_reserva=None, fecha_partido=None,
@@ -46,22 +53,15 @@ class Partido:
     
     @staticmethod
     def from_dict(data):
-        fecha_partido = data.get('fecha_partido')
-        if isinstance(fecha_partido, str):
-            fecha_partido = datetime.strptime(fecha_partido, '%Y-%m-%d').date()
-        
-        hora_inicio = data.get('hora_inicio')
-        if isinstance(hora_inicio, str):
-            hora_inicio = datetime.strptime(hora_inicio, '%H:%M:%S').time()
-        
+        # Fecha y hora quedan como texto: se convierten al leerlas
         return Partido(
             id_partido=data.get('id_partido'),
             id_torneo=data.get('id_torneo'),
             id_equipo_local=data.get('id_equipo_local'),
             id_equipo_visitante=data.get('id_equipo_visitante'),
             id_reserva=data.get('id_reserva'),
-            fecha_partido=fecha_partido,
-            hora_inicio=hora_inicio,
+            fecha_partido=data.get('fecha_partido'),
+            hora_inicio=data.get('hora_inicio'),
             resultado_local=data.get('resultado_local'),
             resultado_visitante=data.get('resultado_visitante'),
             estado_partido=data.get('estado_partido', 'programado')
@@ -3,8 +3,20 @@ Modelo Reserva
 Actualizado: Incluye id_torneo para vincular reservas automáticas.
 """
 from datetime import datetime
+from models.campos import Diferido, a_fecha, a_hora, a_fecha_hora
 
 class Reserva:
+    # Sin __dict__: un año de reservas en memoria ocupa bastante menos.
+    # Fechas y horas pueden llegar como texto y se convierten al leerlas.
+    __slots__ = ('id_reserva', 'id_cliente', 'id_cancha', '_fecha_reserva', '_hora_inicio',
+                 '_hora_fin', 'usa_iluminacion', 'estado_reserva', 'monto_total',
+                 '_fecha_creacion', 'observaciones', 'id_torneo')
+
+    fecha_reserva = Diferido(a_fecha)
+    hora_inicio = Diferido(a_hora)
+    hora_fin = Diferido(a_hora)
+    fecha_creacion = Diferido(a_fecha_hora, datetime.now)
+
     def __init__(self, id_reserva=None, id_cliente=0, id_cancha=0, fecha_reserva=None, 
                  hora_inicio=None, hora_fin=None, usa_iluminacion=False, 
                  estado_reserva="pendiente", monto_total=0.0, fecha_creacion=None, 
@@ -2,8 +2,16 @@
 Modelo Torneo
 Actualizado: Incluye id_cliente (Organizador) y estructura de reserva masiva.
 """
+from models.campos import Diferido, a_fecha, a_hora
 
 class Torneo:
+    __slots__ = ('id_torneo', 'nombre', 'deporte', '_fecha', '_hora_inicio', '_hora_fin',
+                 'cantidad_canchas', 'precio_total', 'estado', 'id_cliente')
+
+    fecha = Diferido(a_fecha)
+    hora_inicio = Diferido(a_hora)
+    hora_fin = Diferido(a_hora)
+
     def __init__(self, id_torneo=None, nombre="", deporte="", fecha=None, 
                  hora_inicio=None, hora_fin=None, cantidad_canchas=0, 
                  precio_total=0.0, estado="confirmado", id_cliente=None):
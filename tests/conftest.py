@@ -0,0 +1,27 @@
+"""
+Fixtures compartidas de las pruebas
+"""
+
+import pytest
+
+
+@pytest.fixture
+def base_en_proceso(tmp_path, monkeypatch):
+    """
+    Base nueva y vacía para los servicios y DAO de este proceso: el pool
+    del singleton se cierra y se vuelve a crear sobre un archivo temporal.
+    """
+    from database import db_connection
+    from dao.disponibilidad import motor_disponibilidad
+
+    def cerrar_pool():
+        instancia = db_connection.DatabaseConnection._instance
+        if instancia is not None:
+            instancia.close()
+        motor_disponibilidad.invalidar()
+
+    ruta = str(tmp_path / "reservas.db")
+    cerrar_pool()
+    monkeypatch.setattr(db_connection, "DB_PATH", ruta)
+    yield ruta
+    cerrar_pool()
@@ -0,0 +1,37 @@
+"""
+Pruebas de clientes
+"""
+
+import sqlite3
+import threading
+
+from business.cliente_service import ClienteService
+from database.db_connection import get_db_connection
+
+
+def test_dni_duplicado_no_deja_la_conexion_en_transaccion(base_en_proceso):
+    exito, _, _ = ClienteService.crear_cliente("Ana", "Gómez", "30111222", "", "")
+    assert exito
+    exito, msg, _ = ClienteService.crear_cliente("Otra", "Persona", "30111222", "", "")
+    assert not exito and "DNI" in msg
+    assert not get_db_connection().in_transaction
+
+    # Otra conexión puede escribir enseguida (sin esperar el busy_timeout)
+    conn = sqlite3.connect(base_en_proceso, timeout=0.1)
+    try:
+        conn.execute("INSERT INTO cliente (nombre, apellido, dni) VALUES ('B', 'C', '40111222')")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_la_conexion_del_hilo_sigue_usable_tras_un_error(base_en_proceso):
+    ClienteService.crear_cliente("Ana", "Gómez", "30111222", "", "")
+    ClienteService.crear_cliente("Otra", "Persona", "30111222", "", "")
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(
+        ClienteService.crear_cliente("Luis", "Paz", "30999888", "", "")[0]))
+    hilo.start()
+    hilo.join()
+    assert resultado == [True]
+    assert ClienteService.crear_cliente("Eva", "Sol", "31000111", "", "")[0]
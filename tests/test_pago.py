@@ -0,0 +1,150 @@
+"""
+Pruebas de pagos
+El total pagado que se guarda en cada reserva y torneo (monto_pagado) debe
+coincidir siempre con la suma de sus pagos, también con pagos simultáneos.
+"""
+
+import sqlite3
+import threading
+import time as reloj
+from datetime import date, time, timedelta
+
+import pytest
+
+FECHA = date.today() + timedelta(days=7)
+HILOS = 6
+
+
+def _en_paralelo(funcion, argumentos):
+    """Ejecuta funcion(*args) en un hilo por cada juego de argumentos, todos a la vez"""
+    from database.db_connection import release_db_connection
+
+    resultados = [None] * len(argumentos)
+    inicio = threading.Barrier(len(argumentos))
+
+    def hilo(i):
+        inicio.wait()
+        try:
+            resultados[i] = funcion(*argumentos[i])
+        finally:
+            release_db_connection()
+
+    hilos = [threading.Thread(target=hilo, args=(i,)) for i in range(len(argumentos))]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return resultados
+
+
+def _verificar_totales(ruta):
+    """monto_pagado contra SUM(pago.monto) y saldos pendientes contra la base"""
+    from business.pago_service import PagoService
+
+    conn = sqlite3.connect(ruta)
+    try:
+        for tabla in ("reserva", "torneo"):
+            for id_, guardado, sumado in conn.execute(
+                    f"SELECT t.id_{tabla}, t.monto_pagado, "
+                    f"(SELECT COALESCE(SUM(p.monto), 0) FROM pago p WHERE p.id_{tabla} = t.id_{tabla}) "
+                    f"FROM {tabla} t"):
+                assert guardado == pytest.approx(sumado), (tabla, id_)
+        esperados = {
+            id_reserva: saldo for id_reserva, saldo in conn.execute(
+                "SELECT r.id_reserva, r.monto_total - COALESCE(SUM(p.monto), 0) AS saldo "
+                "FROM reserva r LEFT JOIN pago p ON p.id_reserva = r.id_reserva "
+                "WHERE r.estado_reserva != 'cancelada' GROUP BY r.id_reserva HAVING saldo > 0.1")
+        }
+    finally:
+        conn.close()
+    saldos = {s['id_reserva']: s['saldo'] for s in PagoService.obtener_saldos_pendientes()}
+    assert saldos == pytest.approx(esperados)
+    return saldos
+
+
+def test_pagos_parciales_y_simultaneos(base_en_proceso, monkeypatch):
+    from business.cancha_service import CanchaService
+    from business.cliente_service import ClienteService
+    from business.pago_service import PagoService
+    from business.reserva_service import ReservaService
+    from business.torneo_service import TorneoService
+
+    _, _, cliente = ClienteService.crear_cliente("Ana", "Gómez", "30111222", "", "")
+    _, _, cancha = CanchaService.crear_cancha("Cancha 1", "Fútbol 5", "Sintético", False, True,
+                                              10, 1000.0, 1500.0)
+    reservas = []
+    for hora in (10, 12, 14, 16):
+        _, _, reserva = ReservaService.crear_reserva(cliente.id_cliente, cancha.id_cancha, FECHA,
+                                                     time(hora, 0), time(hora + 1, 0), False, "")
+        reservas.append(reserva)
+    parcial, completa, simultanea, cancelada = reservas
+    total = parcial.monto_total
+    assert total > 0
+
+    assert PagoService.registrar_pago(parcial.id_reserva, total * 0.3, "efectivo")[0]
+    assert PagoService.registrar_pago(parcial.id_reserva, total * 0.3, "tarjeta")[0]
+    assert PagoService.registrar_pago(completa.id_reserva, total * 0.5, "efectivo")[0]
+    assert PagoService.registrar_pago(completa.id_reserva, total * 0.5, "efectivo")[0]
+    assert PagoService.registrar_pago(cancelada.id_reserva, total * 0.5, "efectivo")[0]
+    assert ReservaService.cancelar_reserva(cancelada.id_reserva)[0]
+    saldos = _verificar_totales(base_en_proceso)
+    assert set(saldos) == {parcial.id_reserva, simultanea.id_reserva}
+    assert saldos[parcial.id_reserva] == pytest.approx(total * 0.4)
+
+    # Entre leer lo pagado y grabar el pago pasa un rato: sin la transacción
+    # los pagos simultáneos verían todos la misma deuda
+    leer_pagado = PagoService.obtener_monto_pagado
+
+    def leer_pagado_lento(id_reserva):
+        pagado = leer_pagado(id_reserva)
+        reloj.sleep(0.02)
+        return pagado
+
+    monkeypatch.setattr(PagoService, "obtener_monto_pagado", staticmethod(leer_pagado_lento))
+
+    # Dos pagos simultáneos que juntos superan la deuda: entra uno solo
+    resultados = _en_paralelo(PagoService.registrar_pago,
+                              [(simultanea.id_reserva, total * 0.6, "efectivo")] * 2)
+    assert sorted(r[0] for r in resultados) == [False, True]
+    assert PagoService.obtener_monto_pagado(simultanea.id_reserva) == pytest.approx(total * 0.6)
+
+    # El saldo restante, pagado varias veces a la vez, se cobra una sola vez
+    resultados = _en_paralelo(PagoService.registrar_pago,
+                              [(parcial.id_reserva, total * 0.4, "efectivo")] * HILOS)
+    assert sum(r[0] for r in resultados) == 1
+    saldos = _verificar_totales(base_en_proceso)
+    assert set(saldos) == {simultanea.id_reserva}
+    assert saldos[simultanea.id_reserva] == pytest.approx(total * 0.4)
+
+    # Pagos de torneo simultáneos que caben en la deuda: entran todos
+    _, _, torneo = TorneoService.crear_torneo(cliente.id_cliente, "Copa", "Fútbol 5", FECHA,
+                                              time(18, 0), time(20, 0), 1, 6000.0)
+    resultados = _en_paralelo(PagoService.registrar_pago_torneo,
+                              [(torneo.id_torneo, 1000.0, "efectivo")] * HILOS)
+    assert all(r[0] for r in resultados)
+    assert PagoService.obtener_monto_pagado_torneo(torneo.id_torneo) == pytest.approx(6000.0)
+    _verificar_totales(base_en_proceso)
+
+
+def test_monto_pagado_con_altas_simultaneas_en_el_dao(base_en_proceso):
+    from business.cancha_service import CanchaService
+    from business.cliente_service import ClienteService
+    from business.reserva_service import ReservaService
+    from dao.pago_dao import PagoDAO
+    from models.pago import Pago
+
+    _, _, cliente = ClienteService.crear_cliente("Ana", "Gómez", "30111222", "", "")
+    _, _, cancha = CanchaService.crear_cancha("Cancha 1", "Fútbol 5", "Sintético", False, True,
+                                              10, 1000.0, 1500.0)
+    _, _, reserva = ReservaService.crear_reserva(cliente.id_cliente, cancha.id_cancha, FECHA,
+                                                 time(10, 0), time(11, 0), False, "")
+
+    # Sin el control de deuda del servicio: cada alta suma su monto al total
+    def pagar(monto):
+        return PagoDAO.insertar(Pago(id_reserva=reserva.id_reserva, monto=monto,
+                                     metodo_pago="efectivo"))
+
+    for _ in range(5):
+        assert all(_en_paralelo(pagar, [(1.25,)] * HILOS))
+    assert PagoDAO.total_por_reserva(reserva.id_reserva) == pytest.approx(5 * HILOS * 1.25)
+    _verificar_totales(base_en_proceso)
@@ -0,0 +1,267 @@
+"""
+Pruebas de reportes
+"""
+
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+from datetime import date, time, timedelta
+
+from database.db_connection import get_db_connection
+
+FECHA = date.today() + timedelta(days=7)
+
+
+def _cargar(reservas):
+    """Clientes, una cancha y las reservas (cliente, fecha, hora_inicio, monto, estado) en orden de id"""
+    conn = get_db_connection()
+    for dni in ("1", "2", "3", "4"):
+        conn.execute("INSERT INTO cliente (nombre, apellido, dni) VALUES (?, 'Test', ?)", (f"C{dni}", dni))
+    conn.execute("INSERT INTO cancha (nombre, tipo_deporte, precio_hora_dia, precio_hora_noche) "
+                 "VALUES ('Cancha 1', 'Fútbol 5', 1000, 1500)")
+    for id_cliente, fecha, hora, monto, estado in reservas:
+        conn.execute(
+            "INSERT INTO reserva (id_cliente, id_cancha, fecha_reserva, hora_inicio, hora_fin, "
+            "monto_total, estado_reserva) VALUES (?, 1, ?, ?, ?, ?, ?)",
+            (id_cliente, fecha.isoformat(), f"{hora:02d}:00:00", f"{hora + 1:02d}:00:00", monto, estado)
+        )
+    conn.commit()
+
+
+def test_totales_por_cliente_desempata_como_el_reporte_original(base_en_proceso):
+    from business.reportes_service import ReportesService, cache_reportes
+
+    dia_2 = FECHA + timedelta(days=1)
+    _cargar([
+        (1, FECHA, 16, 1000.0, 'confirmada'),   # C1: primera reserva el día 1 (id 1)
+        (2, FECHA, 10, 1000.0, 'confirmada'),   # C2: mismo día, más temprano pero id 2
+        (3, FECHA, 8, 1000.0, 'cancelada'),     # C3: la cancelada no cuenta...
+        (3, dia_2, 9, 1000.0, 'pendiente'),     # ...su primera reserva es del día 2
+        (4, dia_2, 12, 500.0, 'confirmada'),    # C4: más reservas y el mayor monto
+        (4, dia_2, 14, 1500.0, 'confirmada'),
+    ])
+    cache_reportes.limpiar()
+
+    reporte = ReportesService.reporte_reservas_por_cliente()
+
+    assert [fila['cliente'] for fila in reporte] == ["C4 Test", "C1 Test", "C2 Test", "C3 Test"]
+    assert [fila['monto'] for fila in reporte] == [2000.0, 1000.0, 1000.0, 1000.0]
+
+
+def _en_hilo_nuevo(funcion):
+    """Resultado de `funcion` ejecutada en un hilo que todavía no usó la base"""
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(funcion()))
+    hilo.start()
+    hilo.join()
+    return resultado[0]
+
+
+def test_cache_de_reportes_se_invalida_con_escrituras_de_otro_proceso(base_en_proceso):
+    from business.reportes_service import ReportesService, cache_reportes
+
+    _cargar([(1, FECHA, 10, 1000.0, 'confirmada')])
+    cache_reportes.limpiar()
+    inicial = ReportesService.estadisticas_cache()
+
+    def nombres():
+        return [fila['cliente'] for fila in ReportesService.reporte_reservas_por_cliente()]
+
+    assert nombres() == ["C1 Test"]
+    assert nombres() == ["C1 Test"]
+    stats = ReportesService.estadisticas_cache()
+    assert stats['fallos'] - inicial['fallos'] == 1
+    assert stats['aciertos'] - inicial['aciertos'] == 1
+
+    # Otro proceso modifica la base sin pasar por este pool
+    subprocess.run([sys.executable, "-c",
+                    "import sqlite3, sys; c = sqlite3.connect(sys.argv[1]); "
+                    "c.execute(\"UPDATE cliente SET nombre = 'ZZZ' WHERE id_cliente = 1\"); c.commit()",
+                    base_en_proceso], check=True)
+
+    # Un hilo nuevo (como los de EjecutorTareas) y el hilo original lo ven
+    assert _en_hilo_nuevo(nombres) == ["ZZZ Test"]
+    assert nombres() == ["ZZZ Test"]
+    stats = ReportesService.estadisticas_cache()
+    assert stats['invalidaciones'] - inicial['invalidaciones'] >= 1
+
+    # Sin cambios nuevos, el hilo original vuelve a acertar
+    aciertos = stats['aciertos']
+    assert nombres() == ["ZZZ Test"]
+    assert ReportesService.estadisticas_cache()['aciertos'] == aciertos + 1
+
+
+def test_cache_de_reportes_se_invalida_con_escrituras_propias(base_en_proceso):
+    from business.reportes_service import ReportesService, cache_reportes
+    from business.reserva_service import ReservaService
+
+    _cargar([(1, FECHA, 10, 1000.0, 'pendiente')])
+    cache_reportes.limpiar()
+    assert len(ReportesService.reporte_reservas_por_cliente()) == 1
+    invalidaciones = ReportesService.estadisticas_cache()['invalidaciones']
+
+    assert ReservaService.cancelar_reserva(1)[0]
+    assert ReportesService.reporte_reservas_por_cliente() == []
+    assert ReportesService.estadisticas_cache()['invalidaciones'] == invalidaciones + 1
+
+
+def _cargar_canchas(nombres, reservas):
+    """Un cliente, canchas con `nombres` y reservas (id_cancha, fecha, hora_inicio, estado) en orden de id"""
+    conn = get_db_connection()
+    conn.execute("INSERT INTO cliente (nombre, apellido, dni) VALUES ('C1', 'Test', '1')")
+    for nombre in nombres:
+        conn.execute("INSERT INTO cancha (nombre, tipo_deporte, precio_hora_dia, precio_hora_noche) "
+                     "VALUES (?, 'Fútbol 5', 1000, 1500)", (nombre,))
+    for id_cancha, fecha, hora, estado in reservas:
+        conn.execute(
+            "INSERT INTO reserva (id_cliente, id_cancha, fecha_reserva, hora_inicio, hora_fin, "
+            "monto_total, estado_reserva) VALUES (1, ?, ?, ?, ?, 1000, ?)",
+            (id_cancha, fecha.isoformat(), f"{hora:02d}:00:00", f"{hora + 1:02d}:00:00", estado)
+        )
+    conn.commit()
+
+
+def test_ranking_de_canchas_desempata_como_el_reporte_original(base_en_proceso):
+    from business.reportes_service import ReportesService, cache_reportes
+
+    anio = date.today().year + 1
+    _cargar_canchas(["Uno", "Dos", "Tres", "Cuatro"], [
+        (2, date(anio, 10, 20), 10, 'cancelada'),   # Un día con solo canceladas no cuenta
+        (2, date(anio, 10, 22), 10, 'confirmada'),
+        (1, date(anio, 10, 21), 10, 'pendiente'),
+        # Mismo primer día: decide la reserva de menor id, no el id de la cancha
+        (4, date(anio, 10, 23), 18, 'confirmada'),
+        (3, date(anio, 10, 23), 9, 'confirmada'),
+    ])
+    cache_reportes.limpiar()
+
+    ranking = ReportesService.reporte_ranking_canchas_mensual(anio, 10)
+
+    assert [fila['nombre'] for fila in ranking] == ["Uno", "Dos", "Cuatro", "Tres"]
+    assert all(fila['reservas'] == 1 for fila in ranking)
+
+
+def _operaciones_al_azar(semilla, cantidad):
+    """Altas, cambios de estado, pagos, torneos y bajas al azar a través de los servicios"""
+    from business.cancha_service import CanchaService
+    from business.cliente_service import ClienteService
+    from business.pago_service import PagoService
+    from business.reserva_service import ReservaService
+    from business.torneo_service import TorneoService
+    from dao.reserva_dao import ReservaDAO
+
+    azar = random.Random(semilla)
+    for i in range(3):
+        ClienteService.crear_cliente(f"Cliente{i}", "Test", f"3000000{i}", "", "")
+    for nombre, deporte in (("Uno", "Fútbol 5"), ("Dos", "Fútbol 5"), ("Tres", "Pádel")):
+        CanchaService.crear_cancha(nombre, deporte, "Sintético", False, True, 10, 1000.0, 1500.0)
+    conn = get_db_connection()
+
+    def alguna(tabla, columna):
+        ids = [fila[0] for fila in conn.execute(f"SELECT {columna} FROM {tabla}").fetchall()]
+        return azar.choice(ids) if ids else None
+
+    def fecha_hora():
+        hora = azar.randint(8, 20)
+        return (FECHA + timedelta(days=azar.randint(0, 40)), time(hora, azar.choice((0, 30))),
+                time(hora + azar.randint(1, 2), 0))
+
+    for n in range(cantidad):
+        operacion = azar.choice(("reservar", "reservar", "confirmar", "cancelar", "completar",
+                                 "pagar", "torneo", "pagar_torneo", "eliminar_torneo", "eliminar"))
+        id_reserva = alguna("reserva", "id_reserva")
+        id_torneo = alguna("torneo", "id_torneo")
+        if operacion == "reservar":
+            fecha, inicio, fin = fecha_hora()
+            ReservaService.crear_reserva(azar.randint(1, 3), azar.randint(1, 3), fecha, inicio, fin,
+                                         azar.random() < 0.3, "")
+        elif operacion == "confirmar" and id_reserva:
+            ReservaService.confirmar_reserva(id_reserva)
+        elif operacion == "cancelar" and id_reserva:
+            ReservaService.cancelar_reserva(id_reserva)
+        elif operacion == "completar" and id_reserva:
+            ReservaDAO.cambiar_estado(id_reserva, 'completada')
+        elif operacion == "pagar" and id_reserva:
+            PagoService.registrar_pago(id_reserva, azar.choice((500.0, 1000.0, 250.0)), "efectivo")
+        elif operacion == "torneo":
+            fecha, inicio, fin = fecha_hora()
+            TorneoService.crear_torneo(azar.randint(1, 3), f"Copa {n}", azar.choice(("Fútbol 5", "Pádel")),
+                                       fecha, inicio, fin, azar.randint(1, 2), azar.choice((3000.0, 5000.0)))
+        elif operacion == "pagar_torneo" and id_torneo:
+            PagoService.registrar_pago_torneo(id_torneo, 1000.0, "transferencia")
+        elif operacion == "eliminar_torneo" and id_torneo:
+            TorneoService.eliminar_torneo(id_torneo)
+        elif operacion == "eliminar" and id_reserva:
+            ReservaService.eliminar_fisicamente(id_reserva)
+
+
+def _resumen(conn):
+    """Filas no nulas de resumen_diario por (fecha, cancha), con los montos redondeados"""
+    filas = {}
+    for fila in conn.execute("SELECT * FROM resumen_diario").fetchall():
+        valores = tuple(round(v, 6) for v in fila[2:])
+        if any(valores):
+            filas[(fila[0], fila[1])] = valores
+    return filas
+
+
+def test_resumen_diario_coincide_con_una_reconstruccion(base_en_proceso):
+    from database.migraciones import reconstruir_resumen_diario
+
+    _operaciones_al_azar(semilla=7, cantidad=300)
+
+    conn = sqlite3.connect(base_en_proceso)
+    try:
+        mantenido = _resumen(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        reconstruir_resumen_diario(conn)
+        reconstruido = _resumen(conn)
+        conn.rollback()
+    finally:
+        conn.close()
+    assert len(mantenido) > 10
+    assert mantenido == reconstruido
+
+
+def test_reportes_mensuales_coinciden_con_las_tablas(base_en_proceso):
+    from business.reportes_service import ReportesService, cache_reportes
+
+    _operaciones_al_azar(semilla=11, cantidad=200)
+    cache_reportes.limpiar()
+    conn = get_db_connection()
+    reservas = conn.execute("SELECT * FROM reserva").fetchall()
+    torneos = {t['id_torneo']: t for t in conn.execute("SELECT * FROM torneo").fetchall()}
+    meses = sorted({(int(r['fecha_reserva'][:4]), int(r['fecha_reserva'][5:7])) for r in reservas})
+    assert meses
+
+    for anio, mes in meses:
+        del_mes = [r for r in reservas if r['fecha_reserva'].startswith(f"{anio}-{mes:02d}")]
+        conteo = {'pendiente': 0, 'confirmada': 0, 'cancelada': 0, 'completada': 0}
+        for r in del_mes:
+            conteo[r['estado_reserva']] += 1
+        assert ReportesService.reporte_estado_reservas_mensual(anio, mes) == conteo
+
+        # Como el reporte original: canchas en el orden de su primera reserva
+        # no cancelada (por fecha e id), ordenadas de forma estable por cantidad
+        por_cancha = {}
+        for r in sorted(del_mes, key=lambda r: (r['fecha_reserva'], r['id_reserva'])):
+            if r['estado_reserva'] != 'cancelada':
+                por_cancha[r['id_cancha']] = por_cancha.get(r['id_cancha'], 0) + 1
+        nombres = {f['id_cancha']: f['nombre'] for f in conn.execute("SELECT * FROM cancha").fetchall()}
+        esperado = sorted(((nombres[c], n) for c, n in por_cancha.items()), key=lambda x: x[1], reverse=True)
+        ranking = ReportesService.reporte_ranking_canchas_mensual(anio, mes)
+        assert [(f['nombre'], f['reservas']) for f in ranking] == esperado[:6]
+
+    for anio in sorted({a for a, _ in meses}):
+        esperado = {m: 0.0 for m in range(1, 13)}
+        for r in reservas:
+            if (r['fecha_reserva'].startswith(str(anio)) and not r['id_torneo']
+                    and r['estado_reserva'] in ('confirmada', 'completada')):
+                esperado[int(r['fecha_reserva'][5:7])] += r['monto_total']
+        for t in torneos.values():
+            if t['estado'] != 'cancelado' and t['fecha'].startswith(str(anio)):
+                esperado[int(t['fecha'][5:7])] += t['precio_total']
+        obtenido = ReportesService.reporte_ingresos_mensuales(anio)
+        assert {m: round(v, 6) for m, v in obtenido.items()} == {m: round(v, 6) for m, v in esperado.items()}
@@ -0,0 +1,472 @@
+"""
+Pruebas de concurrencia de reservas
+Varios procesos, con varios hilos cada uno, intentan reservar los mismos
+turnos sobre un único archivo de base de datos: no debe quedar ningún turno
+reservado dos veces.
+
+También se compara el motor de disponibilidad y la búsqueda de huecos con
+lo que dice la base directamente.
+"""
+
+import multiprocessing
+import random
+import sqlite3
+import threading
+from datetime import date, time, timedelta
+
+import pytest
+
+from database.migraciones import aplicar_migraciones
+
+PROCESOS = 4
+HILOS_POR_PROCESO = 6
+INTENTOS_POR_HILO = 15
+CANCHAS = 2
+FECHA = date.today() + timedelta(days=7)
+# Turnos de 1 hora que se solapan entre sí (10:00-11:00 con 10:30-11:30, etc.)
+TURNOS = [(time(h, m), time(h + 1, m)) for h in range(10, 14) for m in (0, 30)]
+
+
+def _reservar(semilla):
+    """Trabajo de cada proceso: sus hilos piden turnos al azar"""
+    from business.reserva_service import ReservaService
+    from database.db_connection import release_db_connection
+
+    exitos = []
+    inicio = threading.Barrier(HILOS_POR_PROCESO)
+
+    def hilo(n):
+        azar = random.Random(semilla * 100 + n)
+        inicio.wait()
+        try:
+            for _ in range(INTENTOS_POR_HILO):
+                hora_inicio, hora_fin = azar.choice(TURNOS)
+                exito, _, reserva = ReservaService.crear_reserva(
+                    1, azar.randint(1, CANCHAS), FECHA, hora_inicio, hora_fin, False, "stress"
+                )
+                if exito:
+                    exitos.append(reserva.id_reserva)
+        finally:
+            release_db_connection()
+
+    hilos = [threading.Thread(target=hilo, args=(n,)) for n in range(HILOS_POR_PROCESO)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return exitos
+
+
+@pytest.fixture
+def base_temporal(tmp_path, monkeypatch):
+    """Base nueva con un cliente y las canchas; los procesos hijos la usan vía RESERVAS_DB_PATH"""
+    ruta = str(tmp_path / "stress.db")
+    conn = sqlite3.connect(ruta)
+    conn.row_factory = sqlite3.Row
+    aplicar_migraciones(conn)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("INSERT INTO cliente (nombre, apellido, dni) VALUES ('Stress', 'Test', '99999999')")
+    for i in range(CANCHAS):
+        conn.execute(
+            "INSERT INTO cancha (nombre, tipo_deporte, precio_hora_dia, precio_hora_noche) "
+            "VALUES (?, 'Fútbol 5', 1000, 1500)", (f"Cancha {i + 1}",)
+        )
+    conn.commit()
+    conn.close()
+    monkeypatch.setenv("RESERVAS_DB_PATH", ruta)
+    return ruta
+
+
+def _solapamientos(conn):
+    return conn.execute("""
+        SELECT COUNT(*) FROM reserva a
+        JOIN reserva b ON b.id_cancha = a.id_cancha
+                      AND b.fecha_reserva = a.fecha_reserva
+                      AND b.id_reserva > a.id_reserva
+                      AND b.inicio_min < a.fin_min
+                      AND b.fin_min > a.inicio_min
+        WHERE a.estado_reserva != 'cancelada' AND b.estado_reserva != 'cancelada'
+    """).fetchone()[0]
+
+
+def test_sin_reservas_dobles_con_hilos_y_procesos(base_temporal):
+    contexto = multiprocessing.get_context("spawn")
+    with contexto.Pool(PROCESOS) as pool:
+        resultados = pool.map(_reservar, range(PROCESOS))
+    exitos = [id_reserva for ids in resultados for id_reserva in ids]
+
+    conn = sqlite3.connect(base_temporal)
+    try:
+        assert _solapamientos(conn) == 0
+        # Cada alta informada como exitosa está en la base, y nada más
+        guardadas = {row[0] for row in conn.execute("SELECT id_reserva FROM reserva")}
+        assert sorted(exitos) == sorted(guardadas)
+        assert len(exitos) > 0
+    finally:
+        conn.close()
+
+
+def test_trigger_rechaza_solapamiento_de_otro_escritor(base_temporal):
+    conn = sqlite3.connect(base_temporal)
+    insertar = ("INSERT INTO reserva (id_cliente, id_cancha, fecha_reserva, hora_inicio, "
+                "hora_fin, monto_total) VALUES (1, 1, ?, ?, ?, 0)")
+    try:
+        conn.execute(insertar, (FECHA.isoformat(), "10:00:00", "11:00:00"))
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(insertar, (FECHA.isoformat(), "10:30:00", "11:30:00"))
+        # Turnos contiguos no se solapan
+        conn.execute(insertar, (FECHA.isoformat(), "11:00:00", "12:00:00"))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_eliminar_reserva_pagada_se_rechaza(base_en_proceso):
+    from business.cancha_service import CanchaService
+    from business.cliente_service import ClienteService
+    from business.pago_service import PagoService
+    from business.reserva_service import ReservaService
+    from business.torneo_service import TorneoService
+    from dao.reserva_dao import ReservaDAO
+    from database.db_connection import get_db_connection
+
+    _, _, cliente = ClienteService.crear_cliente("Ana", "Gómez", "30111222", "", "")
+    _, _, cancha = CanchaService.crear_cancha("Cancha 1", "Fútbol 5", "Sintético", False, True,
+                                              10, 1000.0, 1500.0)
+    _, _, pagada = ReservaService.crear_reserva(cliente.id_cliente, cancha.id_cancha, FECHA,
+                                                time(10, 0), time(11, 0), False, "")
+    _, _, sin_pagar = ReservaService.crear_reserva(cliente.id_cliente, cancha.id_cancha, FECHA,
+                                                   time(12, 0), time(13, 0), False, "")
+    assert PagoService.registrar_pago(pagada.id_reserva, 100.0, "efectivo")[0]
+
+    exito, msg = ReservaService.eliminar_fisicamente(pagada.id_reserva)
+    assert not exito and "pagos" in msg
+    assert ReservaDAO.obtener_por_id(pagada.id_reserva) is not None
+    assert not get_db_connection().in_transaction
+
+    # El rechazo no deja la conexión del hilo sin poder escribir
+    assert ReservaService.eliminar_fisicamente(sin_pagar.id_reserva)[0]
+    assert ReservaDAO.obtener_por_id(sin_pagar.id_reserva) is None
+    assert PagoService.registrar_pago(pagada.id_reserva, 100.0, "efectivo")[0]
+    exito, msg, _ = TorneoService.crear_torneo(cliente.id_cliente, "Copa", "Fútbol 5", FECHA,
+                                               time(15, 0), time(17, 0), 1, 5000.0)
+    assert exito, msg
+
+
+def test_transaccion_descarta_una_transaccion_implicita_abandonada(base_en_proceso):
+    from business.cancha_service import CanchaService
+    from business.cliente_service import ClienteService
+    from business.torneo_service import TorneoService
+    from database.db_connection import get_db_connection
+
+    _, _, cliente = ClienteService.crear_cliente("Ana", "Gómez", "30111222", "", "")
+    CanchaService.crear_cancha("Cancha 1", "Fútbol 5", "Sintético", False, True, 10, 1000.0, 1500.0)
+    conn = get_db_connection()
+    # Una escritura que falla fuera de los DAO deja abierta la transacción implícita
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO cliente (nombre, apellido, dni) VALUES ('X', 'Y', '30111222')")
+    assert conn.in_transaction
+
+    exito, msg, _ = TorneoService.crear_torneo(cliente.id_cliente, "Copa", "Fútbol 5", FECHA,
+                                               time(15, 0), time(17, 0), 1, 5000.0)
+    assert exito, msg
+    assert not conn.in_transaction
+
+
+# --- Motor de disponibilidad ---
+
+SOLAPADAS = """
+    SELECT COUNT(*) FROM reserva
+    WHERE id_cancha = ? AND fecha_reserva = ? AND estado_reserva != 'cancelada'
+      AND inicio_min < ? AND fin_min > ? AND id_reserva IS NOT ?
+"""
+
+
+def _hora(minutos):
+    return time(minutos // 60, minutos % 60)
+
+
+def _crear_canchas(cantidad, tipo_deporte="Fútbol 5", desde=1):
+    """Crea un cliente y `cantidad` canchas; retorna (id_cliente, ids de las canchas)"""
+    from business.cancha_service import CanchaService
+    from business.cliente_service import ClienteService
+
+    _, _, cliente = ClienteService.crear_cliente("Ana", "Gómez", f"3011122{desde}", "", "")
+    ids = []
+    for n in range(desde, desde + cantidad):
+        _, _, cancha = CanchaService.crear_cancha(f"Cancha {n}", tipo_deporte, "Sintético", False,
+                                                  True, 10, 1000.0, 1500.0)
+        ids.append(cancha.id_cancha)
+    return cliente.id_cliente, ids
+
+
+def _insertar_ajeno(ruta, filas):
+    """
+    Inserta reservas (id_cancha, fecha, inicio_min, fin_min, estado) con otra
+    conexión, como otro proceso. Retorna los ids que el trigger aceptó.
+    """
+    conn = sqlite3.connect(ruta)
+    ids = []
+    try:
+        for id_cancha, fecha, inicio, fin, estado in filas:
+            try:
+                cursor = conn.execute(
+                    "INSERT INTO reserva (id_cliente, id_cancha, fecha_reserva, hora_inicio, "
+                    "hora_fin, estado_reserva, monto_total) "
+                    "VALUES ((SELECT MIN(id_cliente) FROM cliente), ?, ?, ?, ?, ?, 0)",
+                    (id_cancha, fecha.isoformat(), _hora(inicio).isoformat(),
+                     _hora(fin).isoformat(), estado))
+                ids.append(cursor.lastrowid)
+            except sqlite3.IntegrityError:
+                pass  # Se solapa con otra reserva activa
+        conn.commit()
+    finally:
+        conn.close()
+    return ids
+
+
+def test_motor_coincide_con_la_consulta_de_solapamiento(base_en_proceso):
+    from dao.disponibilidad import motor_disponibilidad
+
+    _, canchas = _crear_canchas(3)
+    azar = random.Random(5)
+    filas = []
+    for _ in range(120):
+        inicio = azar.randrange(8 * 60, 23 * 60, 15)
+        fin = min(inicio + azar.choice((15, 30, 60, 90, 120, 180)), 23 * 60)
+        filas.append((azar.choice(canchas), FECHA, inicio, fin,
+                      azar.choice(("pendiente", "confirmada", "completada", "cancelada"))))
+    ids = _insertar_ajeno(base_en_proceso, filas)
+    assert len(ids) > 30
+
+    conn = sqlite3.connect(base_en_proceso)
+    try:
+        for _ in range(3000):
+            id_cancha = azar.choice(canchas)
+            inicio = azar.randrange(8 * 60, 23 * 60, 15)
+            fin = min(inicio + azar.choice((15, 30, 45, 60, 120, 240)), 23 * 60)
+            excluir = azar.choice([None, None] + ids)
+            ocupada = conn.execute(SOLAPADAS, (id_cancha, FECHA.isoformat(), fin, inicio,
+                                               excluir)).fetchone()[0]
+            assert motor_disponibilidad.esta_libre(id_cancha, FECHA, _hora(inicio), _hora(fin),
+                                                   excluir) == (ocupada == 0)
+
+            libres = [c for c in canchas if conn.execute(
+                SOLAPADAS, (c, FECHA.isoformat(), fin, inicio, None)).fetchone()[0] == 0]
+            assert motor_disponibilidad.canchas_libres(canchas, FECHA, _hora(inicio),
+                                                       _hora(fin)) == libres
+    finally:
+        conn.close()
+
+
+def test_agenda_con_turnos_anidados_y_exclusion():
+    from dao.disponibilidad import AgendaCancha
+
+    # Un turno largo que contiene a otro: el máximo de los fines viene del largo
+    agenda = AgendaCancha()
+    agenda.agregar(600, 900, 1)
+    agenda.agregar(660, 720, 2)
+    assert agenda.hay_conflicto(800, 850)
+    assert not agenda.hay_conflicto(800, 850, excluir=1)
+    assert agenda.hay_conflicto(700, 850, excluir=1)
+    assert agenda.hay_conflicto(800, 850, excluir=2)
+    # Intervalos que solo se tocan no chocan
+    assert not agenda.hay_conflicto(900, 960)
+    assert not agenda.hay_conflicto(540, 600)
+    assert agenda.quitar(1) and not agenda.hay_conflicto(800, 850)
+    assert not agenda.quitar(1)
+
+
+def test_turnos_contiguos_y_al_cierre(base_en_proceso):
+    from dao.disponibilidad import motor_disponibilidad
+
+    _, (cancha,) = _crear_canchas(1)
+    id_tarde, = _insertar_ajeno(base_en_proceso, [(cancha, FECHA, 22 * 60, 23 * 60, "pendiente")])
+
+    assert motor_disponibilidad.esta_libre(cancha, FECHA, time(21, 0), time(22, 0))
+    assert not motor_disponibilidad.esta_libre(cancha, FECHA, time(22, 59), time(23, 0))
+    assert not motor_disponibilidad.esta_libre(cancha, FECHA, time(21, 0), time(23, 0))
+    # La propia reserva no se cuenta al modificarla
+    assert motor_disponibilidad.esta_libre(cancha, FECHA, time(21, 0), time(23, 0), id_tarde)
+    assert motor_disponibilidad.turnos_ocupados([cancha], [FECHA]) == {
+        (FECHA.isoformat(), cancha): [(22 * 60, 23 * 60)]}
+
+
+def test_motor_ve_escrituras_ajenas_y_descarta_bloques_revertidos(base_en_proceso):
+    from dao.disponibilidad import motor_disponibilidad
+    from dao.reserva_dao import ReservaDAO
+    from database.db_connection import transaccion
+    from models.reserva import Reserva
+
+    cliente, (cancha,) = _crear_canchas(1)
+    assert motor_disponibilidad.esta_libre(cancha, FECHA, time(10, 0), time(11, 0))
+
+    # Otra conexión confirma una reserva: el día ya cargado queda viejo
+    id_ajena, = _insertar_ajeno(base_en_proceso, [(cancha, FECHA, 10 * 60, 11 * 60, "pendiente")])
+    assert not motor_disponibilidad.esta_libre(cancha, FECHA, time(10, 30), time(11, 30))
+
+    # ...y la cancela
+    conn = sqlite3.connect(base_en_proceso)
+    try:
+        conn.execute("UPDATE reserva SET estado_reserva = 'cancelada' WHERE id_reserva = ?",
+                     (id_ajena,))
+        conn.commit()
+    finally:
+        conn.close()
+    assert motor_disponibilidad.esta_libre(cancha, FECHA, time(10, 30), time(11, 30))
+
+    # Un alta propia dentro de un bloque revertido no debe seguir ocupando el turno
+    with pytest.raises(RuntimeError):
+        with transaccion():
+            reserva = Reserva(id_cliente=cliente, id_cancha=cancha, fecha_reserva=FECHA,
+                              hora_inicio=time(12, 0), hora_fin=time(13, 0), monto_total=0.0)
+            assert ReservaDAO.insertar(reserva)
+            assert not motor_disponibilidad.esta_libre(cancha, FECHA, time(12, 0), time(13, 0))
+            raise RuntimeError("se revierte")
+    assert motor_disponibilidad.esta_libre(cancha, FECHA, time(12, 0), time(13, 0))
+
+
+# --- Búsqueda de huecos ---
+
+def _huecos(huecos):
+    return [(h['cancha'], h['hora_inicio'].strftime("%H:%M"), h['hora_fin'].strftime("%H:%M"),
+             h['minutos']) for h in huecos]
+
+
+def test_huecos_de_un_dia_armado_a_mano(base_en_proceso):
+    from business.reserva_service import ReservaService
+
+    _, (a, b) = _crear_canchas(2)
+    _, (c,) = _crear_canchas(1, "Pádel", desde=3)
+    _insertar_ajeno(base_en_proceso, [
+        (a, FECHA, 8 * 60, 9 * 60, "confirmada"),
+        (a, FECHA, 9 * 60, 10 * 60 + 30, "pendiente"),     # contigua a la anterior
+        (a, FECHA, 12 * 60, 13 * 60, "completada"),
+        (a, FECHA, 16 * 60, 18 * 60, "cancelada"),         # no ocupa
+        (a, FECHA, 22 * 60, 23 * 60, "pendiente"),         # termina al cierre
+        (b, FECHA, 20 * 60, 22 * 60 + 30, "pendiente"),
+        (b, FECHA, 23 * 60 + 15, 23 * 60 + 45, "pendiente"),  # después del cierre
+        (c, FECHA, 22 * 60 + 30, 23 * 60 + 30, "pendiente"),  # pasa el cierre
+        (a, FECHA + timedelta(days=1), 8 * 60, 23 * 60, "pendiente"),
+    ])
+
+    huecos = ReservaService.buscar_horarios_libres(FECHA, FECHA)
+    assert {h['fecha'] for h in huecos} == {FECHA}
+    assert _huecos(huecos) == [
+        ("Cancha 1", "10:30", "12:00", 90),
+        ("Cancha 1", "13:00", "22:00", 540),
+        ("Cancha 2", "08:00", "20:00", 720),
+        ("Cancha 3", "08:00", "22:30", 870),
+    ]
+
+    # El resto antes del cierre aparece si alcanza la duración pedida
+    assert ("Cancha 2", "22:30", "23:00", 30) in _huecos(
+        ReservaService.buscar_horarios_libres(FECHA, FECHA, duracion_minima=30))
+    assert _huecos(ReservaService.buscar_horarios_libres(FECHA, FECHA, duracion_minima=100)) == [
+        ("Cancha 1", "13:00", "22:00", 540),
+        ("Cancha 2", "08:00", "20:00", 720),
+        ("Cancha 3", "08:00", "22:30", 870),
+    ]
+    assert _huecos(ReservaService.buscar_horarios_libres(FECHA, FECHA, tipo_deporte="Pádel")) == [
+        ("Cancha 3", "08:00", "22:30", 870),
+    ]
+    assert ReservaService.buscar_horarios_libres(FECHA, FECHA, tipo_deporte="Tenis") == []
+
+    # Un día ocupado de punta a punta en una cancha no deja huecos en ella
+    siguiente = ReservaService.buscar_horarios_libres(FECHA + timedelta(days=1),
+                                                      FECHA + timedelta(days=1))
+    assert [h['cancha'] for h in siguiente] == ["Cancha 2", "Cancha 3"]
+
+
+def test_huecos_de_hoy_no_empiezan_en_el_pasado(base_en_proceso):
+    from datetime import datetime
+    from business.reserva_service import ReservaService
+
+    _crear_canchas(2)
+
+    def minuto_siguiente(momento):
+        return momento.hour * 60 + momento.minute + (1 if momento.second or momento.microsecond else 0)
+
+    hoy = date.today()
+    antes = max(8 * 60, minuto_siguiente(datetime.now()))
+    huecos = ReservaService.buscar_horarios_libres(hoy - timedelta(days=1), hoy)
+    despues = max(8 * 60, minuto_siguiente(datetime.now()))
+
+    # El día de ayer no se busca y el de hoy arranca en el minuto siguiente al actual
+    for hueco in huecos:
+        assert hueco['fecha'] == hoy
+        inicio = hueco['hora_inicio'].hour * 60 + hueco['hora_inicio'].minute
+        assert antes <= inicio <= despues
+        assert hueco['hora_fin'] == time(23, 0)
+        assert hueco['minutos'] == 23 * 60 - inicio >= 60
+    if 23 * 60 - despues >= 60:
+        assert len(huecos) == 2
+
+
+# --- Listado paginado ---
+
+def _paginar(limite, **filtros):
+    """Recorre el listado hacia adelante y luego de vuelta hacia atrás"""
+    from dao.reserva_dao import ReservaDAO
+
+    adelante = [ReservaDAO.obtener_pagina(limite=limite, **filtros)]
+    while len(adelante[-1]) == limite:
+        adelante.append(ReservaDAO.obtener_pagina(ReservaDAO.clave_pagina(adelante[-1][-1]),
+                                                  limite=limite, **filtros))
+    if not adelante[-1] and len(adelante) > 1:
+        adelante.pop()  # El total era múltiplo del límite
+    atras = [adelante[-1]]
+    while len(atras) < len(adelante):
+        atras.append(ReservaDAO.obtener_pagina(ReservaDAO.clave_pagina(atras[-1][0]),
+                                               hacia_atras=True, limite=limite, **filtros))
+    return adelante, atras
+
+
+def test_paginas_con_claves_repetidas(base_en_proceso):
+    from dao.reserva_dao import ReservaDAO
+
+    _, canchas = _crear_canchas(6)
+    azar = random.Random(11)
+    fechas = [FECHA - timedelta(days=30), FECHA, FECHA + timedelta(days=1)]
+    # Muchas reservas con la misma fecha y hora (en distintas canchas, o
+    # canceladas en la misma): solo id_reserva desempata
+    filas = [(cancha, fecha, hora * 60, hora * 60 + 60,
+              azar.choice(("pendiente", "confirmada", "cancelada", "cancelada")))
+             for fecha in fechas for hora in (10, 18) for cancha in canchas for _ in range(3)]
+    ids = _insertar_ajeno(base_en_proceso, filas)
+    assert len(ids) > 2 * len(fechas) * len(canchas)
+
+    conn = sqlite3.connect(base_en_proceso)
+    try:
+        esperado = [row[0] for row in conn.execute(
+            "SELECT id_reserva FROM reserva ORDER BY fecha_reserva DESC, hora_inicio DESC, "
+            "id_reserva DESC")]
+        canceladas = [row[0] for row in conn.execute(
+            "SELECT id_reserva FROM reserva WHERE estado_reserva = 'cancelada' "
+            "ORDER BY fecha_reserva DESC, hora_inicio DESC, id_reserva DESC")]
+    finally:
+        conn.close()
+
+    for limite in (1, 7, len(esperado), len(esperado) + 5):
+        adelante, atras = _paginar(limite)
+        # Cada fila aparece una sola vez y en el orden del listado
+        assert [f['id_reserva'] for pagina in adelante for f in pagina] == esperado
+        # Volviendo hacia atrás se obtienen exactamente las mismas páginas
+        assert atras == adelante[::-1]
+
+    adelante, atras = _paginar(4, estado="cancelada")
+    assert [f['id_reserva'] for pagina in adelante for f in pagina] == canceladas
+    assert atras == adelante[::-1]
+
+    adelante, _ = _paginar(5, fecha_desde=FECHA, fecha_hasta=FECHA)
+    assert {f['fecha_reserva'] for pagina in adelante for f in pagina} == {FECHA.isoformat()}
+
+    # Una reserva nueva al principio del listado no corre las páginas siguientes
+    primera = ReservaDAO.obtener_pagina(limite=7)
+    siguiente = ReservaDAO.obtener_pagina(ReservaDAO.clave_pagina(primera[-1]), limite=7)
+    _insertar_ajeno(base_en_proceso, [(canchas[0], FECHA + timedelta(days=5), 600, 660,
+                                       "pendiente")])
+    assert ReservaDAO.obtener_pagina(ReservaDAO.clave_pagina(primera[-1]), limite=7) == siguiente
+    assert ReservaDAO.obtener_pagina(ReservaDAO.clave_pagina(primera[0]), hacia_atras=True,
+                                     limite=7)[0]['fecha_reserva'] == (
+        FECHA + timedelta(days=5)).isoformat()
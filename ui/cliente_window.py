@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from business.cliente_service import ClienteService
 from dao.cliente_dao import ClienteDAO
+from ui.lista_paginada import ListaPaginada
 
 
 class ClienteWindow:
@@ -25,7 +26,7 @@ class ClienteWindow:
         self.window.configure(bg=self.BG_COLOR)
         
         # Variables
-        self.clientes = []
+        self.termino = None
         self.cliente_seleccionado = None
         
         self.crear_widgets()
@@ -116,6 +117,15 @@ class ClienteWindow:
         
         self.tree.tag_configure('activo', background=self.CARD_BG)
         self.tree.tag_configure('inactivo', background='#3a3a4e', foreground='#808080')
+        
+        # Solo se mantienen en la tabla las páginas cercanas a lo visible
+        self.lista = ListaPaginada(
+            self.tree, scrollbar,
+            cargar_pagina=lambda cursor, atras, limite: ClienteDAO.obtener_pagina(
+                cursor, atras, limite, self.termino),
+            clave=ClienteDAO.clave_pagina,
+            a_fila=lambda c: ((c.id_cliente, c.nombre, c.apellido, c.dni, c.telefono, c.email, c.estado), (c.estado,))
+        )
 
     def cargar_clientes(self):
         try:
@@ -124,11 +134,8 @@ class ClienteWindow:
         except:
             pass
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.clientes = ClienteService.obtener_todos()
-        for c in self.clientes:
-            self.tree.insert('', tk.END, values=(c.id_cliente, c.nombre, c.apellido, c.dni, c.telefono, c.email, c.estado), tags=(c.estado,))
+        self.termino = None
+        self.lista.recargar()
         self.entry_buscar.delete(0, tk.END)
 
     def buscar_cliente(self):
@@ -137,12 +144,8 @@ class ClienteWindow:
             self.cargar_clientes()
             return
         
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        resultados = ClienteService.buscar_clientes(termino)
-        for c in resultados:
-            self.tree.insert('', tk.END, values=(c.id_cliente, c.nombre, c.apellido, c.dni, c.telefono, c.email, c.estado), tags=(c.estado,))
+        self.termino = termino
+        self.lista.recargar()
 
     def on_select(self, event):
         selection = self.tree.selection()
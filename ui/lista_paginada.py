@@ -0,0 +1,140 @@
+"""
+Lista paginada para Treeview.
+
+Muestra en el Treeview solo una ventana deslizante de páginas obtenidas por
+keyset desde el DAO. Al acercarse al final del scroll se trae la página
+siguiente y, si la ventana supera el máximo, se descarta la primera (y al
+revés al subir). Así la memoria y el tiempo de dibujo no dependen del
+tamaño del historial.
+"""
+
+import tkinter as tk
+
+
+class ListaPaginada:
+    """Ventana deslizante de páginas sobre un Treeview"""
+
+    UMBRAL = 0.15  # Fracción del scroll desde el borde que dispara la carga
+
+    def __init__(self, tree, scrollbar, cargar_pagina, clave, a_fila,
+                 tamano_pagina=100, max_paginas=3):
+        """
+        Args:
+            tree: Treeview donde se muestran las filas
+            scrollbar: Scrollbar vertical asociada al Treeview
+            cargar_pagina: Función (cursor, hacia_atras, limite) -> lista de filas
+            clave: Función fila -> cursor keyset de esa fila
+            a_fila: Función fila -> (values, tags) para el Treeview
+            tamano_pagina: Filas por página
+            max_paginas: Páginas que se mantienen en el Treeview a la vez
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.cargar_pagina = cargar_pagina
+        self.clave = clave
+        self.a_fila = a_fila
+        self.tamano_pagina = tamano_pagina
+        self.max_paginas = max_paginas
+
+        self.paginas = []  # Listas de ids de items del Treeview, en orden
+        self.claves = {}   # id de item -> cursor keyset de su fila
+        self.hay_anteriores = False
+        self.hay_siguientes = False
+        self._pendiente = None
+
+        self.tree.configure(yscrollcommand=self._al_desplazar)
+
+    def recargar(self, primera_pagina=None):
+        """
+        Descarta todo y muestra la primera página. Si se pasa `primera_pagina`
+        (ej: obtenida en segundo plano) se usa en lugar de consultarla.
+        """
+        self.limpiar()
+        self.hay_siguientes = True
+        self._cargar_siguiente(primera_pagina)
+        self.tree.yview_moveto(0)
+
+    def limpiar(self):
+        """Vacía la tabla"""
+        self.tree.delete(*self.tree.get_children())
+        self.paginas = []
+        self.claves = {}
+        self.hay_anteriores = False
+        self.hay_siguientes = False
+
+    def _insertar(self, filas, al_inicio):
+        items = []
+        for fila in filas:
+            values, tags = self.a_fila(fila)
+            item = self.tree.insert('', 0 if al_inicio else tk.END, values=values, tags=tags)
+            self.claves[item] = self.clave(fila)
+            items.append(item)
+        if al_inicio:
+            items.reverse()
+        return items
+
+    def _descartar(self, items):
+        self.tree.delete(*items)
+        for item in items:
+            self.claves.pop(item, None)
+
+    def _cargar_siguiente(self, filas=None):
+        if not self.hay_siguientes:
+            return
+        if filas is None:
+            cursor = self.claves[self.paginas[-1][-1]] if self.paginas else None
+            filas = self.cargar_pagina(cursor, False, self.tamano_pagina)
+        self.hay_siguientes = len(filas) == self.tamano_pagina
+        if not filas:
+            return
+
+        ancla = self._primer_visible()
+        self.paginas.append(self._insertar(filas, al_inicio=False))
+        if len(self.paginas) > self.max_paginas:
+            self._descartar(self.paginas.pop(0))
+            self.hay_anteriores = True
+        self._restaurar(ancla)
+
+    def _cargar_anterior(self):
+        if not self.hay_anteriores or not self.paginas:
+            return
+        cursor = self.claves[self.paginas[0][0]]
+        filas = self.cargar_pagina(cursor, True, self.tamano_pagina)
+        self.hay_anteriores = len(filas) == self.tamano_pagina
+        if not filas:
+            return
+
+        ancla = self._primer_visible()
+        # insert(index=0) invierte el orden: se insertan de la última a la primera
+        self.paginas.insert(0, self._insertar(reversed(filas), al_inicio=True))
+        if len(self.paginas) > self.max_paginas:
+            self._descartar(self.paginas.pop())
+            self.hay_siguientes = True
+        self._restaurar(ancla)
+
+    def _primer_visible(self):
+        items = self.tree.get_children()
+        if not items:
+            return None
+        primero, _ = self.tree.yview()
+        return items[min(int(primero * len(items)), len(items) - 1)]
+
+    def _restaurar(self, ancla):
+        """Mantiene en pantalla la fila que el usuario estaba viendo"""
+        if ancla and self.tree.exists(ancla):
+            total = len(self.tree.get_children())
+            self.tree.yview_moveto(self.tree.index(ancla) / total)
+
+    def _al_desplazar(self, primero, ultimo):
+        self.scrollbar.set(primero, ultimo)
+        # La carga modifica el scroll: se difiere para no reentrar
+        if self._pendiente is None:
+            self._pendiente = self.tree.after_idle(self._verificar_bordes)
+
+    def _verificar_bordes(self):
+        self._pendiente = None
+        primero, ultimo = self.tree.yview()
+        if ultimo >= 1 - self.UMBRAL and self.hay_siguientes:
+            self._cargar_siguiente()
+        elif primero <= self.UMBRAL and self.hay_anteriores:
+            self._cargar_anterior()
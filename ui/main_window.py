@@ -1,7 +1,7 @@
 """
 Ventana Principal del Sistema - Diseño Moderno
 VERSIÓN OPTIMIZADA: Estilo Dark Theme con diseño moderno
-ACTUALIZADO: Limpieza automática de reservas vencidas al inicio.
+ACTUALIZADO: Limpieza automática de reservas vencidas en segundo plano.
 """
 
 import tkinter as tk
@@ -11,7 +11,10 @@ from datetime import date
 from dao.cliente_dao import ClienteDAO
 from dao.cancha_dao import CanchaDAO
 from dao.reserva_dao import ReservaDAO
+from database.db_connection import obtener_generacion_datos
 from business.reserva_service import ReservaService  # Importar el servicio
+from ui.tareas import EjecutorTareas
+from config import INTERVALO_LIMPIEZA_MS
 
 
 class MainWindow:
@@ -45,8 +48,11 @@ class MainWindow:
         self.root = tk.Tk()
         self.root.title("Sistema de Reservas - Canchas Deportivas")
         
-        # Variable para controlar el loop de actualización
+        # Variables para controlar el loop de actualización
         self.after_id = None
+        self.ultima_marca = None  # Marca de datos y fecha del último refresco
+        self.limpieza_id = None
+        self.tareas = EjecutorTareas(self.root, max_hilos=1)
         
         # CONFIGURACIÓN PARA PANTALLA COMPLETA/MAXIMIZADA
         try:
@@ -64,29 +70,36 @@ class MainWindow:
         # Configurar cierre limpio
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        # --- EJECUTAR LIMPIEZA AUTOMÁTICA DE RESERVAS ---
-        self.ejecutar_limpieza_reservas()
-        
         self.crear_menu()
         self.crear_dashboard()
         self._actualizar_dashboard_periodicamente()
+        
+        # --- LIMPIEZA AUTOMÁTICA DE RESERVAS (periódica, sin bloquear el inicio) ---
+        self.ejecutar_limpieza_reservas()
     
     def ejecutar_limpieza_reservas(self):
-        """Cancela reservas pendientes que estén dentro de las 24hs"""
-        try:
-            canceladas = ReservaService.cancelar_pendientes_vencidas()
-            if canceladas > 0:
-                print(f"Sistema: Se han cancelado {canceladas} reservas pendientes por regla de 24hs.")
-        except Exception as e:
-            print(f"Error en limpieza automática: {e}")
+        """Cancela en segundo plano las reservas pendientes que estén dentro de las 24hs"""
+        self.tareas.enviar('limpieza', ReservaService.cancelar_pendientes_vencidas,
+                           self._limpieza_terminada, self._limpieza_fallida)
+        self.limpieza_id = self.root.after(INTERVALO_LIMPIEZA_MS, self.ejecutar_limpieza_reservas)
+
+    def _limpieza_terminada(self, canceladas):
+        # El dashboard se refresca solo al detectar el cambio en la base
+        if canceladas > 0:
+            print(f"Sistema: Se han cancelado {canceladas} reservas pendientes por regla de 24hs.")
+
+    def _limpieza_fallida(self, error):
+        print(f"Error en limpieza automática: {error}")
 
     def on_close(self):
         """Maneja el cierre de la aplicación cancelando procesos pendientes."""
-        if self.after_id:
-            try:
-                self.root.after_cancel(self.after_id)
-            except:
-                pass
+        for pendiente in (self.after_id, self.limpieza_id):
+            if pendiente:
+                try:
+                    self.root.after_cancel(pendiente)
+                except:
+                    pass
+        self.tareas.cerrar()
         self.root.destroy()
 
     def crear_menu(self):
@@ -153,33 +166,24 @@ class MainWindow:
             stats_frame.grid_columnconfigure(i, weight=1)
         
         # Obtener datos
-        total_clientes = ClienteDAO.contar_total()
-        total_canchas = CanchaDAO.contar_total()
-        
-        # CÁLCULO DE RESERVAS DEL MES ACTUAL
-        hoy = date.today()
-        ultimo_dia = calendar.monthrange(hoy.year, hoy.month)[1]
-        fecha_inicio = date(hoy.year, hoy.month, 1)
-        fecha_fin = date(hoy.year, hoy.month, ultimo_dia)
-        reservas_mes = len(ReservaDAO.obtener_por_rango_fechas(fecha_inicio, fecha_fin))
-        
-        reservas_hoy = len(ReservaDAO.obtener_por_fecha(date.today()))
+        self.ultima_marca = (obtener_generacion_datos(), date.today())
+        valores = self.obtener_valores_dashboard()
         
         # Crear tarjetas de estadísticas
         self.crear_stat_card_moderna(
-            stats_frame, "👤", "Clientes", total_clientes, 
+            stats_frame, "👤", "Clientes", valores["Clientes"], 
             self.CARD_COLORS['clientes'], 0, self.abrir_clientes
         )
         self.crear_stat_card_moderna(
-            stats_frame, "⚽", "Canchas", total_canchas, 
+            stats_frame, "⚽", "Canchas", valores["Canchas"], 
             self.CARD_COLORS['canchas'], 1, self.abrir_canchas
         )
         self.crear_stat_card_moderna(
-            stats_frame, "📅", "Reservas del Mes", reservas_mes, 
+            stats_frame, "📅", "Reservas del Mes", valores["Reservas del Mes"], 
             self.CARD_COLORS['reservas'], 2, self.abrir_reservas_mes
         )
         self.crear_stat_card_moderna(
-            stats_frame, "📆", "Reservas de hoy", reservas_hoy, 
+            stats_frame, "📆", "Reservas de hoy", valores["Reservas de hoy"], 
             self.CARD_COLORS['hoy'], 3, self.abrir_reservas_hoy
         )
         
@@ -288,26 +292,24 @@ class MainWindow:
         b = min(255, b + 20)
         return f'#{r:02x}{g:02x}{b:02x}'
 
-    def actualizar_dashboard(self):
-        """Actualiza los valores del dashboard"""
-        total_clientes = ClienteDAO.contar_total()
-        total_canchas = CanchaDAO.contar_total()
-        
+    def obtener_valores_dashboard(self):
+        """Consulta los contadores del dashboard con COUNT(*)"""
         hoy = date.today()
         ultimo_dia = calendar.monthrange(hoy.year, hoy.month)[1]
         fecha_inicio = date(hoy.year, hoy.month, 1)
         fecha_fin = date(hoy.year, hoy.month, ultimo_dia)
-        reservas_mes = len(ReservaDAO.obtener_por_rango_fechas(fecha_inicio, fecha_fin))
         
-        reservas_hoy = len(ReservaDAO.obtener_por_fecha(date.today()))
-
-        valores = {
-            "Clientes": total_clientes,
-            "Canchas": total_canchas,
-            "Reservas del Mes": reservas_mes,
-            "Reservas de hoy": reservas_hoy,
+        return {
+            "Clientes": ClienteDAO.contar_total(),
+            "Canchas": CanchaDAO.contar_total(),
+            "Reservas del Mes": ReservaDAO.contar_por_rango_fechas(fecha_inicio, fecha_fin),
+            "Reservas de hoy": ReservaDAO.contar_por_fecha(hoy),
         }
 
+    def actualizar_dashboard(self):
+        """Actualiza los valores del dashboard"""
+        valores = self.obtener_valores_dashboard()
+
         if hasattr(self, "stat_labels"):
             for titulo, valor in valores.items():
                 lbl = self.stat_labels.get(titulo)
@@ -315,9 +317,19 @@ class MainWindow:
                     lbl.config(text=str(valor))
 
     def _actualizar_dashboard_periodicamente(self):
-        """Actualiza el dashboard cada 5 segundos"""
-        self.actualizar_dashboard()
-        self.after_id = self.root.after(5000, self._actualizar_dashboard_periodicamente)
+        """
+        Cada 2 segundos verifica si la base cambió (o cambió el día) y solo
+        entonces vuelve a consultar los contadores. Sin cambios, el costo es
+        una lectura de PRAGMA data_version.
+        """
+        try:
+            marca = (obtener_generacion_datos(), date.today())
+            if marca != self.ultima_marca:
+                self.ultima_marca = marca
+                self.actualizar_dashboard()
+        except Exception as e:
+            print(f"Error al actualizar el dashboard: {e}")
+        self.after_id = self.root.after(2000, self._actualizar_dashboard_periodicamente)
     
     def abrir_reservas_mes(self):
         from ui.reserva_window import ReservaWindow
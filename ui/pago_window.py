@@ -12,7 +12,9 @@ from business.reserva_service import ReservaService
 from business.cliente_service import ClienteService
 from dao.reserva_dao import ReservaDAO
 from dao.torneo_dao import TorneoDAO 
+from dao.pago_dao import PagoDAO
 from utils.helpers import formatear_monto, formatear_fecha
+from ui.lista_paginada import ListaPaginada
 
 
 class PagoWindow:
@@ -114,6 +116,19 @@ class PagoWindow:
         self.tree.column('Monto', width=100, anchor='e')
         self.tree.column('Fecha', width=100, anchor='center')
         
+        # Solo se mantienen en la tabla las páginas cercanas a lo visible
+        self.filtros = {}
+        self.lista = ListaPaginada(
+            self.tree, scrollbar,
+            cargar_pagina=lambda cursor, atras, limite: PagoDAO.obtener_pagina(
+                cursor, atras, limite, **self.filtros),
+            clave=PagoDAO.clave_pagina,
+            a_fila=lambda p: ((
+                p['id_pago'], p['referencia'], p['cliente'], formatear_monto(p['monto']),
+                p['fecha_pago'], p['metodo_pago']
+            ), ())
+        )
+        
         self.toggle_fechas()
 
     def toggle_fechas(self):
@@ -135,11 +150,6 @@ class PagoWindow:
         except:
             pass
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        todos_pagos = PagoService.obtener_todos()
-        
         usar_fechas = self.var_usar_fecha.get()
         try:
             f_desde = self.date_desde.get_date()
@@ -147,31 +157,12 @@ class PagoWindow:
         except:
             f_desde = date.today()
             f_hasta = date.today()
-            
-        for p in todos_pagos:
-            if usar_fechas:
-                if not (f_desde <= p.fecha_pago <= f_hasta):
-                    continue
-            
-            referencia = "N/A"
-            cliente_nombre = "N/A"
-            
-            if p.id_reserva:
-                referencia = f"Res #{p.id_reserva}"
-                reserva = ReservaDAO.obtener_por_id(p.id_reserva)
-                if reserva:
-                    cliente = ClienteService.obtener_cliente(reserva.id_cliente)
-                    if cliente: cliente_nombre = f"{cliente.nombre} {cliente.apellido}"
-            elif p.id_torneo:
-                referencia = f"Tor #{p.id_torneo}"
-                torneo = TorneoDAO.obtener_por_id(p.id_torneo)
-                if torneo and torneo.id_cliente:
-                    cliente = ClienteService.obtener_cliente(torneo.id_cliente)
-                    if cliente: cliente_nombre = f"{cliente.nombre} {cliente.apellido}"
-            
-            self.tree.insert('', tk.END, values=(
-                p.id_pago, referencia, cliente_nombre, formatear_monto(p.monto), p.fecha_pago, p.metodo_pago
-            ))
+        
+        self.filtros = {
+            'fecha_desde': f_desde if usar_fechas else None,
+            'fecha_hasta': f_hasta if usar_fechas else None
+        }
+        self.lista.recargar()
 
 
 class NuevoPagoDialog:
@@ -10,6 +10,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from business.reportes_service import ReportesService
 from utils.helpers import formatear_monto
+from ui.tareas import EjecutorTareas, cursor_de_espera
 
 class ReportesWindow:
     """Ventana principal de reportes unificados"""
@@ -53,6 +54,9 @@ class ReportesWindow:
         self.anio_actual = date.today().year
         self.mes_actual = date.today().month
         
+        # Los reportes se calculan en segundo plano para no congelar la ventana
+        self.tareas = EjecutorTareas(self.window, al_cambiar_ocupado=cursor_de_espera(self.window))
+        
         self.crear_widgets()
         
         self.window.lift()
@@ -61,8 +65,18 @@ class ReportesWindow:
         self.window.protocol("WM_DELETE_WINDOW", self.cerrar_ventana)
 
     def cerrar_ventana(self):
+        self.tareas.cerrar()
         plt.close('all')
         self.window.destroy()
+
+    def mostrar_cargando(self, frame):
+        """Reemplaza el contenido del frame por un indicador de carga"""
+        for widget in frame.winfo_children(): widget.destroy()
+        tk.Label(frame, text="⏳ Cargando...", bg=self.CARD_BG, fg=self.SUBTITLE_COLOR, font=('Segoe UI', 12)).pack(expand=True)
+
+    def mostrar_error(self, frame, error):
+        for widget in frame.winfo_children(): widget.destroy()
+        tk.Label(frame, text=f"Error al cargar el reporte: {error}", bg=self.CARD_BG, fg='#e74c3c', font=('Segoe UI', 12)).pack(expand=True)
     
     def crear_widgets(self):
         tk.Label(self.window, text="📊 Reportes y Estadísticas", font=('Segoe UI', 20, 'bold'), bg=self.BG_COLOR, fg=self.TEXT_COLOR).pack(pady=20)
@@ -109,53 +123,61 @@ class ReportesWindow:
         self.cargar_grafico_estado()
 
     def cargar_grafico_estado(self):
-        for widget in self.frame_graf_estado.winfo_children(): widget.destroy()
-        
         try:
             anio = int(self.spin_anio_estado.get())
             mes = int(self.cmb_mes_estado.get())
-            datos = ReportesService.reporte_estado_reservas_mensual(anio, mes)
-            
-            val_confirmadas = datos.get('confirmada', 0) + datos.get('completada', 0)
-            val_pendientes = datos.get('pendiente', 0)
-            val_canceladas = datos.get('cancelada', 0)
-            total_reservas = val_confirmadas + val_pendientes + val_canceladas
-            
-            self.lbl_total_reservas.config(text=f"Cantidad de Reservas: {total_reservas}")
+        except ValueError:
+            messagebox.showerror("Error", "Año inválido")
+            return
+        
+        self.mostrar_cargando(self.frame_graf_estado)
+        self.tareas.enviar(
+            'estado',
+            lambda: ReportesService.reporte_estado_reservas_mensual(anio, mes),
+            lambda datos: self.mostrar_grafico_estado(datos, anio, mes),
+            lambda e: self.mostrar_error(self.frame_graf_estado, e)
+        )
 
-            if total_reservas == 0:
-                tk.Label(self.frame_graf_estado, text="Sin datos para este período", bg=self.CARD_BG, fg=self.TEXT_COLOR, font=('Segoe UI', 12)).pack(expand=True)
-                return
+    def mostrar_grafico_estado(self, datos, anio, mes):
+        for widget in self.frame_graf_estado.winfo_children(): widget.destroy()
+        
+        val_confirmadas = datos.get('confirmada', 0) + datos.get('completada', 0)
+        val_pendientes = datos.get('pendiente', 0)
+        val_canceladas = datos.get('cancelada', 0)
+        total_reservas = val_confirmadas + val_pendientes + val_canceladas
 
-            sizes = []
-            labels = []
-            colors = []
-            
-            if val_confirmadas > 0:
-                sizes.append(val_confirmadas)
-                labels.append('Confirmadas')
-                colors.append('#45796e')
-            if val_pendientes > 0:
-                sizes.append(val_pendientes)
-                labels.append('Pendientes')
-                colors.append('#8f6b4a')
-            if val_canceladas > 0:
-                sizes.append(val_canceladas)
-                labels.append('Canceladas')
-                colors.append('#a04a4a')
+        self.lbl_total_reservas.config(text=f"Cantidad de Reservas: {total_reservas}")
 
-            fig, ax = plt.subplots(figsize=(6, 5), facecolor=self.CARD_BG)
-            ax.set_facecolor(self.CARD_BG)
-            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90, textprops={'fontsize': 11, 'color': 'white'})
-            ax.axis('equal')
-            ax.set_title(f"Estado de Reservas - {mes}/{anio}", fontsize=14, fontweight='bold', pad=20, color='white')
-            
-            canvas = FigureCanvasTkAgg(fig, master=self.frame_graf_estado)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-        except ValueError:
-            messagebox.showerror("Error", "Año inválido")
+        if total_reservas == 0:
+            tk.Label(self.frame_graf_estado, text="Sin datos para este período", bg=self.CARD_BG, fg=self.TEXT_COLOR, font=('Segoe UI', 12)).pack(expand=True)
+            return
+
+        sizes = []
+        labels = []
+        colors = []
+
+        if val_confirmadas > 0:
+            sizes.append(val_confirmadas)
+            labels.append('Confirmadas')
+            colors.append('#45796e')
+        if val_pendientes > 0:
+            sizes.append(val_pendientes)
+            labels.append('Pendientes')
+            colors.append('#8f6b4a')
+        if val_canceladas > 0:
+            sizes.append(val_canceladas)
+            labels.append('Canceladas')
+            colors.append('#a04a4a')
+
+        fig, ax = plt.subplots(figsize=(6, 5), facecolor=self.CARD_BG)
+        ax.set_facecolor(self.CARD_BG)
+        ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90, textprops={'fontsize': 11, 'color': 'white'})
+        ax.axis('equal')
+        ax.set_title(f"Estado de Reservas - {mes}/{anio}", fontsize=14, fontweight='bold', pad=20, color='white')
+
+        canvas = FigureCanvasTkAgg(fig, master=self.frame_graf_estado)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     # 2. RANKING DE CANCHAS
     def crear_tab_ranking(self):
@@ -181,37 +203,44 @@ class ReportesWindow:
         self.cargar_grafico_ranking()
 
     def cargar_grafico_ranking(self):
-        for widget in self.frame_graf_ranking.winfo_children(): widget.destroy()
-        
         try:
             anio = int(self.spin_anio_ranking.get())
             mes = int(self.cmb_mes_ranking.get())
-            
-            datos = ReportesService.reporte_ranking_canchas_mensual(anio, mes)
-            
-            if not datos:
-                tk.Label(self.frame_graf_ranking, text="Sin reservas para este período", bg=self.CARD_BG, fg=self.TEXT_COLOR, font=('Segoe UI', 12)).pack(expand=True)
-                return
-                
-            nombres = [d['nombre'] for d in datos]
-            reservas = [d['reservas'] for d in datos]
-            
-            fig, ax = plt.subplots(figsize=(8, 5), facecolor=self.CARD_BG)
-            ax.set_facecolor(self.CARD_BG)
-            
-            # Dibujar barras
-            ax.bar(nombres, reservas, color='#7a5a7a', width=0.6)
-            
-            ax.set_ylabel('Cantidad de Reservas', fontsize=11, color='white')
-            ax.set_title(f"Top Canchas Más Utilizadas - {mes}/{anio}", fontsize=14, fontweight='bold', pad=20, color='white')
-            ax.tick_params(colors='white')
-            
-            canvas = FigureCanvasTkAgg(fig, master=self.frame_graf_ranking)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
         except ValueError:
             messagebox.showerror("Error", "Año inválido")
+            return
+        
+        self.mostrar_cargando(self.frame_graf_ranking)
+        self.tareas.enviar(
+            'ranking',
+            lambda: ReportesService.reporte_ranking_canchas_mensual(anio, mes),
+            lambda datos: self.mostrar_grafico_ranking(datos, anio, mes),
+            lambda e: self.mostrar_error(self.frame_graf_ranking, e)
+        )
+
+    def mostrar_grafico_ranking(self, datos, anio, mes):
+        for widget in self.frame_graf_ranking.winfo_children(): widget.destroy()
+        
+        if not datos:
+            tk.Label(self.frame_graf_ranking, text="Sin reservas para este período", bg=self.CARD_BG, fg=self.TEXT_COLOR, font=('Segoe UI', 12)).pack(expand=True)
+            return
+
+        nombres = [d['nombre'] for d in datos]
+        reservas = [d['reservas'] for d in datos]
+
+        fig, ax = plt.subplots(figsize=(8, 5), facecolor=self.CARD_BG)
+        ax.set_facecolor(self.CARD_BG)
+
+        # Dibujar barras
+        ax.bar(nombres, reservas, color='#7a5a7a', width=0.6)
+
+        ax.set_ylabel('Cantidad de Reservas', fontsize=11, color='white')
+        ax.set_title(f"Top Canchas Más Utilizadas - {mes}/{anio}", fontsize=14, fontweight='bold', pad=20, color='white')
+        ax.tick_params(colors='white')
+
+        canvas = FigureCanvasTkAgg(fig, master=self.frame_graf_ranking)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     # 3. INGRESOS
     def crear_tab_ingresos(self):
@@ -266,38 +295,46 @@ class ReportesWindow:
         self.cargar_ingresos()
 
     def cargar_ingresos(self):
-        for widget in self.frame_graf_ingresos.winfo_children(): widget.destroy()
-        for item in self.tree_ingresos.get_children(): self.tree_ingresos.delete(item)
-        
         try:
             anio = int(self.spin_anio_ingresos.get())
-            datos = ReportesService.reporte_ingresos_anual(anio)
-            
-            meses_nom = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
-            montos = []
-            total_anual = 0
-            
-            for mes_num in range(1, 13):
-                ingreso = datos.get(mes_num, 0)
-                montos.append(ingreso)
-                total_anual += ingreso
-                self.tree_ingresos.insert('', tk.END, values=(meses_nom[mes_num-1], formatear_monto(ingreso)))
-            
-            self.tree_ingresos.insert('', tk.END, values=("TOTAL ANUAL", formatear_monto(total_anual)), tags=('total',))
-            self.tree_ingresos.tag_configure('total', font=('Segoe UI', 10, 'bold'), background='#45796e')
-            
-            if total_anual == 0:
-                tk.Label(self.frame_graf_ingresos, text="Sin ingresos confirmados este año", bg=self.CARD_BG, fg=self.TEXT_COLOR, font=('Segoe UI', 12)).pack(expand=True)
-            else:
-                fig, ax = plt.subplots(figsize=(8, 4), facecolor=self.CARD_BG)
-                ax.set_facecolor(self.CARD_BG)
-                ax.bar(meses_nom, montos, color='#45796e')
-                ax.set_ylabel('Ingresos ($)', fontsize=11, color='white')
-                ax.set_title(f'Evolución de Ingresos - {anio}', fontsize=14, fontweight='bold', pad=15, color='white')
-                ax.tick_params(colors='white')
-                canvas = FigureCanvasTkAgg(fig, master=self.frame_graf_ingresos)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-                
         except ValueError:
-            messagebox.showerror("Error", "Año inválido")
\ No newline at end of file
+            messagebox.showerror("Error", "Año inválido")
+            return
+        
+        self.mostrar_cargando(self.frame_graf_ingresos)
+        self.tareas.enviar(
+            'ingresos',
+            lambda: ReportesService.reporte_ingresos_anual(anio),
+            lambda datos: self.mostrar_ingresos(datos, anio),
+            lambda e: self.mostrar_error(self.frame_graf_ingresos, e)
+        )
+
+    def mostrar_ingresos(self, datos, anio):
+        for widget in self.frame_graf_ingresos.winfo_children(): widget.destroy()
+        for item in self.tree_ingresos.get_children(): self.tree_ingresos.delete(item)
+        
+        meses_nom = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+        montos = []
+        total_anual = 0
+
+        for mes_num in range(1, 13):
+            ingreso = datos.get(mes_num, 0)
+            montos.append(ingreso)
+            total_anual += ingreso
+            self.tree_ingresos.insert('', tk.END, values=(meses_nom[mes_num-1], formatear_monto(ingreso)))
+
+        self.tree_ingresos.insert('', tk.END, values=("TOTAL ANUAL", formatear_monto(total_anual)), tags=('total',))
+        self.tree_ingresos.tag_configure('total', font=('Segoe UI', 10, 'bold'), background='#45796e')
+
+        if total_anual == 0:
+            tk.Label(self.frame_graf_ingresos, text="Sin ingresos confirmados este año", bg=self.CARD_BG, fg=self.TEXT_COLOR, font=('Segoe UI', 12)).pack(expand=True)
+        else:
+            fig, ax = plt.subplots(figsize=(8, 4), facecolor=self.CARD_BG)
+            ax.set_facecolor(self.CARD_BG)
+            ax.bar(meses_nom, montos, color='#45796e')
+            ax.set_ylabel('Ingresos ($)', fontsize=11, color='white')
+            ax.set_title(f'Evolución de Ingresos - {anio}', fontsize=14, fontweight='bold', pad=15, color='white')
+            ax.tick_params(colors='white')
+            canvas = FigureCanvasTkAgg(fig, master=self.frame_graf_ingresos)
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
\ No newline at end of file
@@ -12,9 +12,11 @@ from business.reserva_service import ReservaService
 from business.cliente_service import ClienteService
 from business.cancha_service import CanchaService
 from dao.reserva_dao import ReservaDAO
-from utils.helpers import formatear_fecha, formatear_hora, formatear_monto, parsear_hora
+from utils.helpers import formatear_monto, parsear_hora
 
 from ui.pago_window import NuevoPagoDialog
+from ui.lista_paginada import ListaPaginada
+from ui.tareas import EjecutorTareas, cursor_de_espera
 
 class ReservaWindow:
     """Ventana de gestión de reservas con filtros"""
@@ -34,6 +36,7 @@ class ReservaWindow:
         # Variables
         self.reservas = []
         self.reserva_seleccionada = None
+        self.tareas = EjecutorTareas(self.window, al_cambiar_ocupado=cursor_de_espera(self.window))
         
         # Crear interfaz
         self.crear_widgets()
@@ -169,6 +172,24 @@ class ReservaWindow:
         self.tree.tag_configure('completada', background='#45796e')
         self.tree.tag_configure('cancelada', background='#a04a4a')
         
+        # Solo se mantienen en la tabla las páginas cercanas a lo visible
+        self.filtros = {}
+        self.lista = ListaPaginada(
+            self.tree, scrollbar,
+            cargar_pagina=lambda cursor, atras, limite: ReservaDAO.obtener_pagina(
+                cursor, atras, limite, **self.filtros),
+            clave=ReservaDAO.clave_pagina,
+            a_fila=lambda r: ((
+                r['id_reserva'],
+                r['cliente'],
+                r['cancha'],
+                r['fecha'],
+                r['horario'],
+                formatear_monto(r['monto_total']),
+                r['estado_reserva'].capitalize()
+            ), (r['estado_reserva'],))
+        )
+        
     def toggle_fechas(self):
         """Habilita o deshabilita los selectores de fecha"""
         state = 'normal' if self.var_usar_fecha.get() else 'disabled'
@@ -192,13 +213,6 @@ class ReservaWindow:
         except:
             pass
 
-        # Limpiar tabla
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Obtener TODAS las reservas
-        todas_reservas = ReservaDAO.obtener_todas()
-        
         # Obtener valores de filtros
         filtro_estado = self.cmb_estado.get().lower()
         usar_fechas = self.var_usar_fecha.get()
@@ -211,35 +225,22 @@ class ReservaWindow:
             fecha_desde = date.today()
             fecha_hasta = date.today()
 
-        for reserva in todas_reservas:
-            # 1. Filtro de Estado
-            if filtro_estado != "todas" and reserva.estado_reserva != filtro_estado:
-                continue
-            
-            # 2. Filtro de Fechas
-            if usar_fechas:
-                if not (fecha_desde <= reserva.fecha_reserva <= fecha_hasta):
-                    continue
-            
-            # Si pasa los filtros, procesar datos para mostrar
-            cliente = ClienteService.obtener_cliente(reserva.id_cliente)
-            cancha = CanchaService.obtener_cancha(reserva.id_cancha)
-            
-            nombre_cliente = cliente.get_nombre_completo() if cliente else "N/A"
-            nombre_cancha = cancha.nombre if cancha else "N/A"
-            
-            horario_str = f"{formatear_hora(reserva.hora_inicio)} - {formatear_hora(reserva.hora_fin)}"
-            
-            tag = reserva.estado_reserva
-            self.tree.insert('', tk.END, values=(
-                reserva.id_reserva,
-                nombre_cliente,
-                nombre_cancha,
-                formatear_fecha(reserva.fecha_reserva),
-                horario_str,
-                formatear_monto(reserva.monto_total),
-                reserva.estado_reserva.capitalize()
-            ), tags=(tag,))
+        # Los filtros se resuelven en SQL; la lista trae las páginas a medida que se desplaza
+        self.filtros = {
+            'estado': None if filtro_estado == "todas" else filtro_estado,
+            'fecha_desde': fecha_desde if usar_fechas else None,
+            'fecha_hasta': fecha_hasta if usar_fechas else None
+        }
+        # La primera página se consulta en segundo plano; si los filtros cambian
+        # antes de que llegue, se descarta
+        self.lista.limpiar()
+        filtros = dict(self.filtros)
+        self.tareas.enviar(
+            'listado',
+            lambda: ReservaDAO.obtener_pagina(None, False, self.lista.tamano_pagina, **filtros),
+            self.lista.recargar,
+            lambda e: messagebox.showerror("Error", f"No se pudieron cargar las reservas: {e}")
+        )
     
     def on_select(self, event):
         """Maneja la selección de una fila"""
@@ -451,7 +452,10 @@ class NuevaReservaDialog:
                     
                     if reserva_actualizada.estado_reserva != 'confirmada':
                         # ROLLBACK: Si cerró la ventana o no pagó todo, borramos la reserva
-                        ReservaService.eliminar_fisicamente(reserva.id_reserva)
+                        eliminada, _ = ReservaService.eliminar_fisicamente(reserva.id_reserva)
+                        if not eliminada:
+                            # Con un pago parcial registrado no se puede borrar: se cancela
+                            ReservaService.cancelar_reserva(reserva.id_reserva)
                         messagebox.showinfo("Cancelado", "La reserva se canceló por falta de pago inmediato.")
                         # No limpiamos formulario para que pueda intentar de nuevo
                     else:
@@ -0,0 +1,146 @@
+"""
+Ejecución de cargas de datos en segundo plano para las ventanas Tk.
+
+Tkinter no es seguro entre hilos: las consultas corren en un pool de hilos
+y sus resultados vuelven al hilo de la interfaz por una cola que se revisa
+con `after` solo mientras haya tareas en curso. Cada tarea tiene una clave
+(ej: 'estado', 'listado'); enviar otra con la misma clave deja obsoleta a la
+anterior, cuyo resultado se descarta aunque ya esté corriendo.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EjecutorTareas:
+    """Pool de hilos de fondo ligado a una ventana"""
+
+    INTERVALO_MS = 50  # Cada cuánto se revisan resultados mientras hay tareas
+
+    def __init__(self, ventana, max_hilos=2, al_cambiar_ocupado=None):
+        """
+        Args:
+            ventana: Toplevel/Tk dueño; al destruirse se cierra el ejecutor
+            max_hilos: Hilos de fondo (cada uno usa una conexión del pool)
+            al_cambiar_ocupado: Función opcional (bool) llamada al empezar o
+                terminar de haber tareas en curso (ej: cursor de espera)
+        """
+        self.ventana = ventana
+        self.al_cambiar_ocupado = al_cambiar_ocupado
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="ui-carga")
+        self._resultados = queue.Queue()
+        self._vigentes = {}  # clave -> (número de tarea, future, al_terminar, al_fallar)
+        self._contador = 0
+        self._lock = threading.Lock()
+        self._revision = None
+        self._cerrado = False
+
+        ventana.bind('<Destroy>', self._al_destruir, add='+')
+
+    def enviar(self, clave, funcion, al_terminar, al_fallar=None):
+        """
+        Ejecuta `funcion()` en segundo plano y luego llama a
+        `al_terminar(resultado)` (o `al_fallar(excepcion)`) en el hilo de Tk.
+        Reemplaza a la tarea pendiente con la misma clave.
+        """
+        if self._cerrado:
+            return
+        estaba_ocupado = bool(self._vigentes)
+        anterior = self._vigentes.pop(clave, None)
+        if anterior is not None:
+            anterior[1].cancel()
+
+        with self._lock:
+            self._contador += 1
+            numero = self._contador
+
+        def trabajo():
+            try:
+                self._resultados.put((clave, numero, True, funcion()))
+            except Exception as e:
+                self._resultados.put((clave, numero, False, e))
+
+        future = self._pool.submit(trabajo)
+        self._vigentes[clave] = (numero, future, al_terminar, al_fallar)
+        if not estaba_ocupado:
+            self._notificar_ocupado(True)
+        self._programar_revision()
+
+    def cancelar(self, clave):
+        """Descarta la tarea pendiente con esa clave (si aún no empezó, no se ejecuta)"""
+        tarea = self._vigentes.pop(clave, None)
+        if tarea is not None:
+            tarea[1].cancel()
+            if not self._vigentes:
+                self._notificar_ocupado(False)
+
+    def ocupado(self):
+        """Indica si hay tareas en curso"""
+        return bool(self._vigentes)
+
+    def cerrar(self):
+        """Descarta las tareas pendientes y libera los hilos"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._vigentes.clear()
+        if self._revision is not None:
+            try:
+                self.ventana.after_cancel(self._revision)
+            except Exception:
+                pass
+            self._revision = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _al_destruir(self, event):
+        if event.widget is self.ventana:
+            self.cerrar()
+
+    def _programar_revision(self):
+        if self._revision is None and not self._cerrado:
+            self._revision = self.ventana.after(self.INTERVALO_MS, self._revisar)
+
+    def _revisar(self):
+        """Entrega en el hilo de Tk los resultados de las tareas vigentes"""
+        self._revision = None
+        while True:
+            try:
+                clave, numero, ok, valor = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            tarea = self._vigentes.get(clave)
+            if tarea is None or tarea[0] != numero:
+                continue  # Cancelada o reemplazada por una más nueva
+            del self._vigentes[clave]
+            _, _, al_terminar, al_fallar = tarea
+            if not self._vigentes:
+                self._notificar_ocupado(False)
+
+            if ok:
+                al_terminar(valor)
+            elif al_fallar is not None:
+                al_fallar(valor)
+            else:
+                print(f"Error en carga de fondo '{clave}': {valor}")
+
+            if self._cerrado:
+                return
+
+        if self._vigentes:
+            self._programar_revision()
+
+    def _notificar_ocupado(self, ocupado):
+        if self.al_cambiar_ocupado is not None and not self._cerrado:
+            self.al_cambiar_ocupado(ocupado)
+
+
+def cursor_de_espera(ventana):
+    """Retorna un al_cambiar_ocupado que muestra el cursor de espera en la ventana"""
+    def cambiar(ocupado):
+        try:
+            ventana.configure(cursor='watch' if ocupado else '')
+        except Exception:
+            pass
+    return cambiar
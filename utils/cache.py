@@ -0,0 +1,79 @@
+"""
+Caché de resultados con invalidación por escritura.
+
+Guarda los resultados de funciones de consulta (ej: reportes) por función y
+argumentos, con descarte LRU. Cada acceso compara la generación de datos de
+la base (ver obtener_generacion_datos): si hubo cualquier commit con
+cambios, de este proceso o de otro, la caché se vacía entera.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from functools import wraps
+from database.db_connection import obtener_generacion_datos
+
+
+class CacheResultados:
+    """Caché LRU compartida por varias funciones"""
+
+    def __init__(self, max_entradas=128):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()  # (función, args, kwargs) -> resultado
+        self._generacion = None
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def memoizar(self, funcion):
+        """
+        Decorador. Los argumentos deben ser hashables; se retorna una copia
+        del resultado para que quien lo modifique no altere la caché.
+        """
+        nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = (nombre, args, tuple(sorted(kwargs.items())))
+            generacion = obtener_generacion_datos()
+            with self._lock:
+                if generacion != self._generacion:
+                    if self._entradas:
+                        self.invalidaciones += 1
+                    self._entradas.clear()
+                    self._generacion = generacion
+                if clave in self._entradas:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return copy.deepcopy(self._entradas[clave])
+                self.fallos += 1
+
+            resultado = funcion(*args, **kwargs)
+
+            with self._lock:
+                # Si los datos cambiaron mientras se calculaba, no se guarda
+                if self._generacion == generacion:
+                    self._entradas[clave] = resultado
+                    self._entradas.move_to_end(clave)
+                    while len(self._entradas) > self.max_entradas:
+                        self._entradas.popitem(last=False)
+            return copy.deepcopy(resultado)
+
+        return envoltura
+
+    def limpiar(self):
+        """Descarta todas las entradas"""
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self):
+        """Retorna aciertos, fallos, invalidaciones y entradas actuales"""
+        with self._lock:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'invalidaciones': self.invalidaciones,
+                'entradas': len(self._entradas),
+                'max_entradas': self.max_entradas
+            }